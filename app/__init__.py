@@ -2,14 +2,11 @@ from flask import Flask, redirect, url_for, session, render_template, current_ap
 from flask_login import LoginManager, current_user
 from app.extensions import login_manager
 import config
-from sqlalchemy import event
-from sqlalchemy.engine import Engine
+from app.database import report_database_profile
 import httpx
 import traceback
 import asyncio
-
-from app.database import SessionLocal
-from app.models import User
+from typing import Optional
 
 
 def create_app(config_class=config.Config):
@@ -17,29 +14,21 @@ def create_app(config_class=config.Config):
     app.config.from_object(config_class)
     app.config['SESSION_PERMANENT'] = True
 
-    # Enable WAL mode for SQLite to prevent "database is locked" errors
-    if 'sqlite' in app.config['SQLALCHEMY_DATABASE_URI']:
-        @event.listens_for(Engine, "connect")
-        def set_sqlite_pragma(dbapi_connection, connection_record):
-            cursor = dbapi_connection.cursor()
-            cursor.execute("PRAGMA journal_mode=WAL")
-            cursor.close()
+    # The SQLite connection profile is applied by app.database, once per connection
+    report_database_profile()
 
     # migrate.init_app(app, db) # TODO: Re-enable migrations
     login_manager.init_app(app)
 
+    from app.auth.identity import load_identity
+
     @login_manager.user_loader
     def load_user(user_id):
-        db_session = SessionLocal()
-        try:
-            return db_session.query(User).get(int(user_id))
-        finally:
-            db_session.close()
+        return load_identity(user_id)
 
     @app.before_request
     def before_request():
         session.permanent = True
-        g.db = SessionLocal()
 
     @app.teardown_appcontext
     def shutdown_session(exception=None):
@@ -74,6 +63,14 @@ def create_app(config_class=config.Config):
     def health_check():
         return 'OK'
 
+    from app.admin.routes import admin_required
+
+    @app.route('/health/api-pool')
+    @admin_required
+    def api_pool_stats():
+        from app.api_client import get_pool_stats
+        return get_pool_stats()
+
     @app.route('/')
     def index():
         if current_user.is_authenticated:
@@ -82,8 +79,8 @@ def create_app(config_class=config.Config):
 
     API_BASE_URL = "http://api:5001" # Define API_BASE_URL here or import from config
 
-    async def _make_api_request_for_error_handler(method: str, endpoint: str, json_data: dict = None):
-        headers = {}
+    async def _make_api_request_for_error_handler(method: str, endpoint: str, json_data: Optional[dict] = None):
+        headers: dict = {}
         # No JWT token for error reporting as it's an unauthenticated endpoint in FastAPI
         # if 'jwt_token' in session:
         #     headers["Authorization"] = f"Bearer {session['jwt_token']}"
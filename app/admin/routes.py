@@ -4,19 +4,21 @@ from flask_login import login_required, current_user
 from app.admin import bp
 from app.models import User, UserRole
 from app.api_client import make_api_request
-from pydantic import TypeAdapter
-from typing import List
-from app.schemas import UserSchema
+from app.auth.identity import load_identity
+from app.schemas import UserSchema, USER_LIST_ADAPTER
 from httpx import RequestError
+from config import Config
 
 
 def admin_required(f):
     @wraps(f)
     @login_required
     def decorated_function(*args, **kwargs):
-        if current_user.role != UserRole.ADMIN:
+        # The session's role may predate a demotion, so admin pages re-check it with the API
+        user = load_identity(str(current_user.id), max_age=Config.ADMIN_IDENTITY_MAX_AGE)
+        if user is None or user.role != UserRole.ADMIN:
             flash("You do not have permission to access this page.")
-            return redirect(url_for('main.index'))
+            return redirect(url_for('index'))
         return f(*args, **kwargs)
     return decorated_function
 
@@ -25,8 +27,7 @@ def admin_required(f):
 def users():
     try:
         response = make_api_request("GET", "/admin/users")
-        users_data = response.json()
-        all_users = TypeAdapter(List[UserSchema]).validate_python(users_data)
+        all_users = USER_LIST_ADAPTER.validate_json(response.content)
     except RequestError as e:
         flash(f"Could not load users: {e}", "danger")
         all_users = []
@@ -50,7 +51,7 @@ def set_role(user_id):
 
     try:
         response = make_api_request("POST", f"/admin/users/{user_id}/set_role", json_data={"new_role": new_role.name})
-        user_to_update = TypeAdapter(UserSchema).validate_python(response.json())
+        user_to_update = UserSchema.model_validate_json(response.content)
         flash(f"Successfully updated {user_to_update.username}'s role to {user_to_update.role.name}.", "success")
     except RequestError as e:
         flash(f"Could not set role: {e}", "danger")
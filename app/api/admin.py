@@ -2,6 +2,7 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from app.auth.dependencies import get_current_user, get_db
+from app.auth.principal_cache import principal_cache
 from app.models import User, UserRole
 from app.schemas import UserSchema
 from app.services.user_service import UserService # Assuming you have or will create a UserService for direct DB operations
@@ -22,7 +23,7 @@ def get_current_active_admin_user(current_user: User = Depends(get_current_user)
 @router.get("/users", response_model=List[UserSchema])
 def read_users(db: Session = Depends(get_db), current_admin_user: User = Depends(get_current_active_admin_user)):
     users = db.query(User).all()
-    return [UserSchema.model_validate(user) for user in users]
+    return users
 
 @router.post("/users/{user_id}/set_role", response_model=UserSchema)
 def set_user_role(
@@ -41,4 +42,5 @@ def set_user_role(
     user_to_update.role = new_role
     db.commit()
     db.refresh(user_to_update)
+    principal_cache.invalidate(user_to_update.id)
     return UserSchema.model_validate(user_to_update)
\ No newline at end of file
@@ -1,6 +1,7 @@
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app.auth.jwt import create_access_token
 from app.auth.dependencies import get_db, get_current_user
@@ -18,8 +19,8 @@ router = APIRouter(
 async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)
 ):
-    user = UserService.get_user_by_username(db, username=form_data.username)
-    if not user or not UserService.verify_password(form_data.password, user.password_hash):
+    user = await run_in_threadpool(UserService.get_user_by_username, db, username=form_data.username)
+    if not user or not await UserService.verify_password_async(form_data.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -32,14 +33,15 @@ async def login_for_access_token(
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.post("/register", response_model=UserSchema, status_code=status.HTTP_201_CREATED)
-def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
-    existing_user = UserService.get_user_by_username(db, username=user_data.username)
+async def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
+    existing_user = await run_in_threadpool(UserService.get_user_by_username, db, username=user_data.username)
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already registered",
         )
-    user = UserService.create_user(db, user_data=user_data)
+    password_hash = await UserService.get_password_hash_async(user_data.password)
+    user = await run_in_threadpool(UserService.create_user, db, user_data, password_hash)
     return user
 
 @router.get("/me", response_model=UserSchema)
@@ -1,11 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel
-from sqlalchemy.orm import Session
-from app.services.habit_service import HabitService
-from app.schemas import HabitSchema, HabitCreate
-from app.auth.dependencies import get_current_user, get_db
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.services.habit_service import AsyncHabitService, HABIT_GRID_MAX_DAYS, MAX_HABIT_LOG_BATCH
+from app.services.projection_service import ProjectionService, InvalidFieldsError
+from app.schemas import HabitSchema, HabitCreate, HabitDashboardItem, HabitGridSchema, HabitStatsSchema, HabitHeatmapSchema
+from app.auth.dependencies import get_current_user_async, get_async_db
 from app.models import User
-from typing import List
+from typing import Dict, List, Literal, Optional
 from datetime import date
 
 router = APIRouter(
@@ -19,19 +20,64 @@ class HabitLogBase(BaseModel):
     is_done: bool
     index: int = 0
 
+class HabitLogBatchRequest(BaseModel):
+    entries: List[HabitLogBase] = Field(..., min_length=1, max_length=MAX_HABIT_LOG_BATCH)
+
+class HabitLogBatchResult(BaseModel):
+    # Per-habit outcome: 'logged' or 'not_found' (missing or not owned)
+    results: Dict[int, str]
+
 @router.get("/", response_model=List[HabitSchema])
-def get_habits(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    habits = HabitService.get_habits_by_user(db, current_user.id)
-    return [HabitSchema.model_validate(h) for h in habits]
+async def get_habits(
+    fields: Optional[List[str]] = Query(None),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """fields=id&fields=name (or fields=id,name) returns only those columns."""
+    try:
+        fields = ProjectionService.resolve_fields(HabitSchema, fields)
+    except InvalidFieldsError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    habits = await AsyncHabitService.get_habits_by_user(db, current_user.id, fields=fields)
+    if fields:
+        return Response(ProjectionService.dump_json(habits), media_type="application/json")
+    return habits
 
 @router.post("/", response_model=HabitSchema)
-def create_habit(habit: HabitCreate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    new_habit = HabitService.create_habit(db, habit, current_user.id)
+async def create_habit(habit: HabitCreate, current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    new_habit = await AsyncHabitService.create_habit(db, habit, current_user.id)
     return HabitSchema.model_validate(new_habit)
 
+@router.get("/dashboard", response_model=List[HabitDashboardItem])
+async def get_habits_dashboard(
+    start_date: date,
+    end_date: date,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    if end_date < start_date:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="end_date must not be before start_date")
+    dashboard = await AsyncHabitService.get_habits_dashboard(db, current_user.id, start_date, end_date)
+    return dashboard
+
+@router.get("/stats", response_model=List[HabitStatsSchema])
+async def get_habits_stats(current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    """Streak and completion summary of all the user's habits, one stored row per habit."""
+    return await AsyncHabitService.get_user_habit_stats(db, current_user.id)
+
+@router.get("/heatmap", response_model=HabitHeatmapSchema)
+async def get_habits_heatmap(
+    year: int = Query(None, ge=1900, le=9999),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Per-day completion of all the user's habits over a year (default: the current one)."""
+    payload = await AsyncHabitService.get_heatmap(db, current_user.id, year or date.today().year)
+    return Response(payload, media_type="application/json")
+
 @router.get("/{habit_id}", response_model=HabitSchema)
-def get_habit(habit_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    habit = HabitService.get_habit(db, habit_id)
+async def get_habit(habit_id: int, current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    habit = await AsyncHabitService.get_habit(db, habit_id)
     if not habit:
         raise HTTPException(status_code=404, detail="Habit not found")
     if habit.user_id != current_user.id:
@@ -39,48 +85,103 @@ def get_habit(habit_id: int, current_user: User = Depends(get_current_user), db:
     return HabitSchema.model_validate(habit)
 
 @router.put("/{habit_id}", response_model=HabitSchema)
-def update_habit(habit_id: int, habit: HabitCreate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    existing_habit = HabitService.get_habit(db, habit_id)
+async def update_habit(habit_id: int, habit: HabitCreate, current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    existing_habit = await AsyncHabitService.get_habit(db, habit_id)
     if not existing_habit:
         raise HTTPException(status_code=404, detail="Habit not found")
     if existing_habit.user_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to update this habit")
-    updated_habit = HabitService.update_habit(db, habit_id, habit)
+    updated_habit = await AsyncHabitService.update_habit(db, habit_id, habit)
     return HabitSchema.model_validate(updated_habit)
 
 @router.delete("/{habit_id}", status_code=204)
-def delete_habit(habit_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    existing_habit = HabitService.get_habit(db, habit_id)
+async def delete_habit(habit_id: int, current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    existing_habit = await AsyncHabitService.get_habit(db, habit_id)
     if not existing_habit:
         raise HTTPException(status_code=404, detail="Habit not found")
     if existing_habit.user_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to delete this habit")
-    HabitService.delete_habit(db, habit_id)
+    await AsyncHabitService.delete_habit(db, habit_id)
     return
 
 @router.post("/log")
-def log_habit(log_data: HabitLogBase, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    habit = HabitService.get_habit(db, log_data.habit_id)
+async def log_habit(log_data: HabitLogBase, current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    habit = await AsyncHabitService.get_habit(db, log_data.habit_id)
     if not habit:
         raise HTTPException(status_code=404, detail="Habit not found")
     if habit.user_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to log this habit")
-    HabitService.log_habit(db, log_data.habit_id, log_data.date, log_data.is_done, log_data.index)
+    await AsyncHabitService.log_habit(db, log_data.habit_id, log_data.date, log_data.is_done, log_data.index)
     return {"success": True}
 
+@router.post("/log/batch", response_model=HabitLogBatchResult)
+async def log_habit_batch(
+    request: HabitLogBatchRequest,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Upserts many habit log entries in one transaction; later entries win for the same slot."""
+    entries = [(entry.habit_id, entry.date, entry.index, entry.is_done) for entry in request.entries]
+    matched = set(await AsyncHabitService.log_habit_batch(db, current_user.id, entries))
+    return HabitLogBatchResult(results={
+        habit_id: 'logged' if habit_id in matched else 'not_found'
+        for habit_id in dict.fromkeys(entry.habit_id for entry in request.entries)
+    })
+
 
 @router.get("/{habit_id}/dates-with-status", response_model=dict[date, bool | list[bool]])
-def get_habit_dates_with_status(
+async def get_habit_dates_with_status(
     habit_id: int,
     start_date: date,
     end_date: date,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    habit = HabitService.get_habit(db, habit_id)
+    habit = await AsyncHabitService.get_habit(db, habit_id)
     if not habit:
         raise HTTPException(status_code=404, detail="Habit not found")
     if habit.user_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to access this habit")
     
-    return HabitService.get_habit_dates_with_status(db, habit_id, start_date, end_date)
+    return await AsyncHabitService.get_habit_dates_with_status(db, habit_id, start_date, end_date)
+
+@router.get("/{habit_id}/grid", response_model=HabitGridSchema)
+async def get_habit_grid(
+    habit_id: int,
+    start_date: date,
+    end_date: date,
+    encoding: Literal['bitmap', 'rle'] = 'bitmap',
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Compact alternative to dates-with-status for long ranges, e.g. multi-year analytics."""
+    if end_date < start_date:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="end_date must not be before start_date")
+    if (end_date - start_date).days >= HABIT_GRID_MAX_DAYS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Range may not exceed {HABIT_GRID_MAX_DAYS} days")
+    habit = await AsyncHabitService.get_habit(db, habit_id)
+    if not habit:
+        raise HTTPException(status_code=404, detail="Habit not found")
+    if habit.user_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to access this habit")
+
+    grid = await AsyncHabitService.get_habit_grid(db, habit, start_date, end_date)
+    return HabitGridSchema(
+        habit_id=habit.id,
+        start_date=start_date,
+        end_date=end_date,
+        frequency=grid.frequency,
+        done=grid.done_count(),
+        encoding=encoding,
+        bitmap=grid.to_base64() if encoding == 'bitmap' else None,
+        runs=grid.to_runs() if encoding == 'rle' else None,
+    )
+
+@router.get("/{habit_id}/stats", response_model=HabitStatsSchema)
+async def get_habit_stats(habit_id: int, current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    habit = await AsyncHabitService.get_habit(db, habit_id)
+    if not habit:
+        raise HTTPException(status_code=404, detail="Habit not found")
+    if habit.user_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to access this habit")
+    return await AsyncHabitService.get_habit_stats(db, habit)
@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from app.services.movie_service import MovieService
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Body, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.services.movie_service import AsyncMovieService
 from app.schemas import MovieSchema, MovieCreate
-from app.auth.dependencies import get_current_user, get_db
-from app.models import User
-from typing import List
-from app.services.movie_service import MovieService
+from app.services.export_service import ExportService, EXPORT_FORMATS
+from app.services.import_service import ImportService
+from app.services.search_service import SearchService, DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT
+from app.services.projection_service import ProjectionService, InvalidFieldsError
+from app.auth.dependencies import get_current_user_async, get_async_db
+from app.models import User, Movie
+from typing import List, Any, Optional
 
 router = APIRouter(
     prefix="/movies",
@@ -13,18 +17,59 @@ router = APIRouter(
 )
 
 @router.get("/", response_model=List[MovieSchema])
-def get_movies(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    movies = MovieService.get_movies_by_user(db, current_user.id)
-    return [MovieSchema.model_validate(m) for m in movies]
+async def get_movies(
+    fields: Optional[List[str]] = Query(None),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """fields=id&fields=title (or fields=id,title) returns only those columns."""
+    try:
+        fields = ProjectionService.resolve_fields(MovieSchema, fields)
+    except InvalidFieldsError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    movies = await AsyncMovieService.get_movies_by_user(db, current_user.id, fields=fields)
+    if fields:
+        return Response(ProjectionService.dump_json(movies), media_type="application/json")
+    return movies
 
 @router.post("/", response_model=MovieSchema)
-def create_movie(movie: MovieCreate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    new_movie = MovieService.create_movie(db, movie, current_user.id)
+async def create_movie(movie: MovieCreate, current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    new_movie = await AsyncMovieService.create_movie(db, movie, current_user.id)
     return MovieSchema.model_validate(new_movie)
 
+@router.get("/export")
+async def export_movies(
+    fields: List[str] = Query(None),
+    format: str = Query('json', enum=list(EXPORT_FORMATS)),
+    current_user: User = Depends(get_current_user_async)
+):
+    """Streams the user's movies as a JSON array, NDJSON or CSV with flat memory use."""
+    allowed_fields = ExportService.exportable_fields(Movie)
+    fields = fields or allowed_fields
+    unknown = [field for field in fields if field not in allowed_fields]
+    if unknown:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=f"Unknown fields: {unknown}")
+
+    batches = ExportService.stream_rows([Movie], current_user.id, fields)
+    return StreamingResponse(
+        ExportService.encode(batches, fields, format),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f"attachment; filename=movies.{format}"},
+    )
+
+@router.get("/search", response_model=List[MovieSchema])
+async def search_movies(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_SEARCH_LIMIT),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    movies = await SearchService.search_async(db, [Movie], current_user.id, q, limit)
+    return movies
+
 @router.get("/{movie_id}", response_model=MovieSchema)
-def get_movie(movie_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    movie = MovieService.get_movie(db, movie_id)
+async def get_movie(movie_id: int, current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    movie = await AsyncMovieService.get_movie(db, movie_id)
     if not movie:
         raise HTTPException(status_code=404, detail="Movie not found")
     if movie.user_id != current_user.id:
@@ -32,37 +77,25 @@ def get_movie(movie_id: int, current_user: User = Depends(get_current_user), db:
     return MovieSchema.model_validate(movie)
 
 @router.put("/{movie_id}", response_model=MovieSchema)
-def update_movie(movie_id: int, movie: MovieCreate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    existing_movie = MovieService.get_movie(db, movie_id)
+async def update_movie(movie_id: int, movie: MovieCreate, current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    existing_movie = await AsyncMovieService.get_movie(db, movie_id)
     if not existing_movie:
         raise HTTPException(status_code=404, detail="Movie not found")
     if existing_movie.user_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to update this movie")
-    updated_movie = MovieService.update_movie(db, movie_id, movie)
+    updated_movie = await AsyncMovieService.update_movie(db, movie_id, movie)
     return MovieSchema.model_validate(updated_movie)
 
 @router.delete("/{movie_id}", status_code=204)
-def delete_movie(movie_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    existing_movie = MovieService.get_movie(db, movie_id)
+async def delete_movie(movie_id: int, current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    existing_movie = await AsyncMovieService.get_movie(db, movie_id)
     if not existing_movie:
         raise HTTPException(status_code=404, detail="Movie not found")
     if existing_movie.user_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to delete this movie")
-    MovieService.delete_movie(db, movie_id)
+    await AsyncMovieService.delete_movie(db, movie_id)
     return
 
-@router.get("/export", response_model=List[dict])
-def export_movies(fields: List[str] = Query(None), current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    movies = MovieService.get_movies_by_user(db, current_user.id)
-    movies_to_export = []
-    for movie in movies:
-        movie_dict = MovieSchema.model_validate(movie).model_dump(mode="json")
-        exported_movie = {field: movie_dict.get(field) for field in fields}
-        movies_to_export.append(exported_movie)
-    return movies_to_export
-
 @router.post("/import")
-def import_movies(movies_data: List[MovieCreate], current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    for movie_data in movies_data:
-        MovieService.create_movie(db, movie_data, current_user.id)
-    return {"message": "Movies imported successfully!"}
+async def import_movies(movies_data: List[Any] = Body(...), current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    return await ImportService.import_items_async(db, 'movies', movies_data, current_user.id)
@@ -1,17 +1,53 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Body
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Body, Response
+from fastapi.responses import StreamingResponse
 from pydantic import ValidationError
-from sqlalchemy.orm import Session
-from app.services.task_service import TaskService
-from app.schemas import TaskSchema, TaskCreate
-from app.auth.dependencies import get_current_user, get_db
-from app.models import User
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.services.task_service import (
+    AsyncTaskService,
+    InvalidCursorError,
+    TASK_SORT_KEYS,
+    DEFAULT_TASK_PAGE_SIZE,
+    MAX_TASK_PAGE_SIZE,
+    CALENDAR_MAX_RANGE_DAYS,
+)
+from app.schemas import (
+    TaskSchema,
+    TaskCreate,
+    TaskBulkRequest,
+    TaskBulkResult,
+    TaskOccurrenceSchema,
+    TaskOccurrenceComplete,
+)
+from app.services.export_service import ExportService, EXPORT_FORMATS
+from app.services.import_service import ImportService
+from app.services.archive_service import ArchiveService
+from app.services.search_service import SearchService, DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT
+from app.services.recurrence_service import RecurrenceService
+from app.services.projection_service import ProjectionService, InvalidFieldsError
+from app.auth.dependencies import get_current_user_async, get_async_db
+from app.models import User, Task, TaskArchive, TaskStatus, TaskType
 from typing import List, Optional, Dict, Any
+from datetime import datetime, timedelta, timezone
 
 router = APIRouter(
     prefix="/tasks",
     tags=["tasks"],
 )
 
+def _to_naive_utc(value: datetime) -> datetime:
+    # Task datetimes are stored as naive UTC, see TaskCreate
+    if value.tzinfo:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def _calendar_range(start: datetime, end: datetime):
+    start, end = _to_naive_utc(start), _to_naive_utc(end)
+    if end <= start:
+        raise HTTPException(status_code=422, detail="end must be after start")
+    if end - start > timedelta(days=CALENDAR_MAX_RANGE_DAYS):
+        raise HTTPException(status_code=422, detail=f"Range may not exceed {CALENDAR_MAX_RANGE_DAYS} days")
+    return start, end
+
 def _prepare_task_data(data: Dict[str, Any]) -> Dict[str, Any]:
     """Processes raw task data dictionary to conform to the TaskCreate schema."""
     processed_data = data.copy()
@@ -47,36 +83,160 @@ def _prepare_task_data(data: Dict[str, Any]) -> Dict[str, Any]:
 
 
 @router.get("/", response_model=List[TaskSchema])
-def get_tasks(type: Optional[str] = None, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    if type and type != 'all':
-        tasks = TaskService.get_tasks_by_user_and_type(db, current_user.id, type)
-    else:
-        tasks = TaskService.get_all_tasks_for_user(db, current_user.id)
-    return [TaskSchema.model_validate(t) for t in tasks]
+async def get_tasks(
+    response: Response,
+    type: Optional[List[str]] = Query(None),
+    task_status: Optional[List[TaskStatus]] = Query(None, alias="status"),
+    deadline_from: Optional[datetime] = None,
+    deadline_to: Optional[datetime] = None,
+    has_notification: Optional[bool] = None,
+    sort: str = Query('id', enum=list(TASK_SORT_KEYS)),
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_TASK_PAGE_SIZE, ge=1, le=MAX_TASK_PAGE_SIZE),
+    include_archived: bool = False,
+    fields: Optional[List[str]] = Query(None),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Returns one page of tasks; the next page's cursor is sent in the X-Next-Cursor header.
+
+    fields=id&fields=title (or fields=id,title) returns only those columns,
+    plus the sort key.
+    """
+    types = None
+    if type and 'all' not in type:
+        try:
+            types = [TaskType(t) for t in type]
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    try:
+        fields = ProjectionService.resolve_fields(TaskSchema, fields)
+    except InvalidFieldsError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    try:
+        tasks, next_cursor = await AsyncTaskService.list_tasks(
+            db, current_user.id,
+            types=types,
+            statuses=task_status,
+            deadline_from=deadline_from,
+            deadline_to=deadline_to,
+            has_notification=has_notification,
+            sort=sort,
+            cursor=cursor,
+            limit=limit,
+            include_archived=include_archived,
+            fields=fields,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if fields:
+        # Projected rows bypass response_model, which describes full tasks
+        headers = {'X-Next-Cursor': next_cursor} if next_cursor else None
+        return Response(ProjectionService.dump_json(tasks), media_type="application/json", headers=headers)
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    # ORM rows go straight to response_model: validated once, then written
+    # to JSON bytes by Pydantic (see benchmarks/serialization.py)
+    return tasks
 
 @router.post("/", response_model=TaskSchema)
-def create_task(
+async def create_task(
     task_data: Dict[str, Any] = Body(...), 
-    current_user: User = Depends(get_current_user), 
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async), 
+    db: AsyncSession = Depends(get_async_db)
 ):
     prepared_data = _prepare_task_data(task_data)
     try:
         task_create_obj = TaskCreate(**prepared_data)
     except ValidationError as e:
-        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=e.errors())
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=e.errors(include_url=False, include_context=False))
         
-    new_task = TaskService.create_task(db, task_create_obj, current_user.id)
+    new_task = await AsyncTaskService.create_task(db, task_create_obj, current_user.id)
     return TaskSchema.model_validate(new_task)
 
 @router.get("/calendar", response_model=List[TaskSchema])
-def get_calendar_tasks(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    tasks = TaskService.get_calendar_tasks(db, current_user.id)
-    return [TaskSchema.model_validate(t) for t in tasks]
+async def get_calendar_tasks(
+    start: datetime,
+    end: datetime,
+    include_archived: bool = False,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Returns the planned tasks overlapping [start, end); both bounds are required."""
+    start, end = _calendar_range(start, end)
+    tasks = await AsyncTaskService.get_calendar_tasks(db, current_user.id, start, end, include_archived=include_archived)
+    return tasks
+
+@router.get("/occurrences", response_model=List[TaskOccurrenceSchema])
+async def get_task_occurrences(
+    start: datetime,
+    end: datetime,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Expands the user's recurring tasks into their occurrences in [start, end)."""
+    start, end = _calendar_range(start, end)
+    occurrences = await AsyncTaskService.get_occurrences(db, current_user.id, start, end)
+    return occurrences
+
+@router.get("/export")
+async def export_tasks(
+    fields: List[str] = Query(None),
+    format: str = Query('json', enum=list(EXPORT_FORMATS)),
+    include_archived: bool = True,
+    current_user: User = Depends(get_current_user_async)
+):
+    """Streams the user's tasks as a JSON array, NDJSON or CSV with flat memory use."""
+    allowed_fields = ExportService.exportable_fields(Task)
+    fields = fields or allowed_fields
+    unknown = [field for field in fields if field not in allowed_fields]
+    if unknown:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=f"Unknown fields: {unknown}")
+
+    models = [Task, TaskArchive] if include_archived else [Task]
+    batches = ExportService.stream_rows(models, current_user.id, fields)
+    return StreamingResponse(
+        ExportService.encode(batches, fields, format),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f"attachment; filename=tasks.{format}"},
+    )
+
+@router.get("/search", response_model=List[TaskSchema])
+async def search_tasks(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_SEARCH_LIMIT),
+    include_archived: bool = True,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    models = [Task, TaskArchive] if include_archived else [Task]
+    tasks = await SearchService.search_async(db, models, current_user.id, q, limit)
+    return tasks
+
+@router.patch("/bulk", response_model=TaskBulkResult)
+async def bulk_update_tasks(
+    request: TaskBulkRequest,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    task_ids = list(dict.fromkeys(request.ids))
+    if request.action == 'delete':
+        outcome = 'deleted'
+        matched = await AsyncTaskService.bulk_delete_tasks(db, current_user.id, task_ids)
+    else:
+        changes = request.changes.model_dump(exclude_unset=True)
+        if not changes:
+            raise HTTPException(status_code=422, detail="No changes given")
+        outcome = 'updated'
+        matched = await AsyncTaskService.bulk_update_tasks(db, current_user.id, task_ids, changes)
+    matched_ids = set(matched)
+    return TaskBulkResult(results={
+        task_id: outcome if task_id in matched_ids else 'not_found' for task_id in task_ids
+    })
 
 @router.get("/{task_id}", response_model=TaskSchema)
-def get_task(task_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    task = TaskService.get_task(db, task_id)
+async def get_task(task_id: int, current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    task = await AsyncTaskService.get_task(db, task_id, include_archived=True)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     if task.user_id != current_user.id:
@@ -84,13 +244,13 @@ def get_task(task_id: int, current_user: User = Depends(get_current_user), db: S
     return TaskSchema.model_validate(task)
 
 @router.put("/{task_id}", response_model=TaskSchema)
-def update_task(
+async def update_task(
     task_id: int, 
     task_data: Dict[str, Any] = Body(...),
-    current_user: User = Depends(get_current_user), 
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async), 
+    db: AsyncSession = Depends(get_async_db)
 ):
-    existing_task = TaskService.get_task(db, task_id)
+    existing_task = await AsyncTaskService.get_task(db, task_id, include_archived=True)
     if not existing_task:
         raise HTTPException(status_code=404, detail="Task not found")
     if existing_task.user_id != current_user.id:
@@ -100,35 +260,43 @@ def update_task(
     try:
         task_update_obj = TaskCreate(**prepared_data)
     except ValidationError as e:
-        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=e.errors())
-        
-    updated_task = TaskService.update_task(db, task_id, task_update_obj)
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=e.errors(include_url=False, include_context=False))
+
+    if isinstance(existing_task, TaskArchive):
+        await ArchiveService.restore_task(db, task_id)
+    updated_task = await AsyncTaskService.update_task(db, task_id, task_update_obj)
     return TaskSchema.model_validate(updated_task)
 
+@router.post("/{task_id}/occurrences/complete", response_model=TaskSchema)
+async def complete_task_occurrence(
+    task_id: int,
+    request: TaskOccurrenceComplete,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    task = await AsyncTaskService.get_task(db, task_id, include_archived=True)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    if task.user_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to update this task")
+    if not task.recurrence or task.recurrence_start is None:
+        raise HTTPException(status_code=422, detail="Task does not recur")
+    if not RecurrenceService.is_occurrence(task.recurrence, task.recurrence_start, request.occurrence):
+        raise HTTPException(status_code=422, detail="Not an occurrence of this task")
+    task = await AsyncTaskService.complete_occurrence(db, task, request.occurrence)
+    return TaskSchema.model_validate(task)
+
 @router.delete("/{task_id}", status_code=204)
-def delete_task(task_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    existing_task = TaskService.get_task(db, task_id)
+async def delete_task(task_id: int, current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    existing_task = await AsyncTaskService.get_task(db, task_id, include_archived=True)
     if not existing_task:
         raise HTTPException(status_code=404, detail="Task not found")
     if existing_task.user_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to delete this task")
-    TaskService.delete_task(db, task_id)
+    await AsyncTaskService.delete_task(db, task_id)
     return
 
 
-@router.get("/export", response_model=List[dict])
-def export_tasks(fields: List[str] = Query(None), current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    tasks = TaskService.get_all_tasks_for_user(db, current_user.id)
-    tasks_to_export = []
-    for task in tasks:
-        task_dict = TaskSchema.model_validate(task).model_dump(mode="json")
-        exported_task = {field: task_dict.get(field) for field in fields}
-        tasks_to_export.append(exported_task)
-    return tasks_to_export
-
-
 @router.post("/import")
-def import_tasks(tasks_data: List[TaskCreate], current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    for task_data in tasks_data:
-        TaskService.create_task(db, task_data, current_user.id)
-    return {"message": "Tasks imported successfully!"}
\ No newline at end of file
+async def import_tasks(tasks_data: List[Any] = Body(...), current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    return await ImportService.import_items_async(db, 'tasks', tasks_data, current_user.id)
\ No newline at end of file
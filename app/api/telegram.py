@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from app.auth.dependencies import get_current_user, get_db
+from app.auth.principal_cache import principal_cache
 from app.models import User
 from app.schemas import UserTelegramUpdate, UserSchema, UserTelegramSendMessage
 from app.queue import redis_conn
@@ -32,6 +33,7 @@ def connect_telegram(
     user.telegram_username = username
     db.commit()
     db.refresh(user)
+    principal_cache.invalidate(user.id)
     redis_conn.delete(f"telegram_token:{token}") # Invalidate token after use
     return UserSchema.model_validate(user)
 
@@ -41,14 +43,17 @@ def disconnect_telegram(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    if not current_user.telegram_chat_id:
+    # current_user may be a detached principal from the cache, so load the row to modify it
+    user = db.query(User).filter(User.id == current_user.id).first()
+    if not user or not user.telegram_chat_id:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Telegram not connected.")
     
-    current_user.telegram_chat_id = None
-    current_user.telegram_username = None
+    user.telegram_chat_id = None
+    user.telegram_username = None
     db.commit()
-    db.refresh(current_user)
-    return UserSchema.model_validate(current_user)
+    db.refresh(user)
+    principal_cache.invalidate(user.id)
+    return UserSchema.model_validate(user)
 
 @router.post("/send_error_report")
 async def send_error_report(
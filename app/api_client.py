@@ -1,7 +1,221 @@
 from flask import request
 import httpx
-from config import API_BASE_URL
-from typing import Optional
+import asyncio
+import concurrent.futures
+import logging
+import os
+import threading
+from config import (
+    API_BASE_URL,
+    API_TRANSPORT,
+    API_POOL_MAX_CONNECTIONS,
+    API_POOL_MAX_KEEPALIVE,
+    API_POOL_KEEPALIVE_EXPIRY,
+    API_CONNECT_TIMEOUT,
+    API_TIMEOUT,
+    API_HTTP2,
+)
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE")
+
+# One client per process. httpx.Client is thread-safe and its pool relies on
+# threading primitives, which gevent monkey-patches into cooperative ones, so
+# the same client can be shared by every greenlet of a gunicorn gevent worker.
+_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
+
+_stats_lock = threading.Lock()
+_pool_stats = {"requests": 0, "hits": 0, "misses": 0}
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class InProcessASGITransport(httpx.BaseTransport):
+    """Sync transport that dispatches requests straight into the FastAPI app.
+
+    Requests go through the same routing, dependencies and auth checks as over
+    the network, without the socket hop to the API container. Every request
+    runs on one event loop in a dedicated thread: the async engine's pooled
+    connections belong to the loop that opened them, so callers from any
+    thread or greenlet hand their request to that loop and wait for it.
+    """
+
+    def __init__(self, app, timeout: Optional[float] = None):
+        self._transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        self._timeout = timeout
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="api-asgi-loop", daemon=True)
+                thread.start()
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+    async def _handle(self, request: httpx.Request) -> httpx.Response:
+        response = await self._transport.handle_async_request(request)
+        content = await response.aread()
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            content=content,
+            extensions=response.extensions,
+        )
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        future = asyncio.run_coroutine_threadsafe(self._handle(request), self._get_loop())
+        try:
+            return future.result(self._timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise httpx.ReadTimeout(f"In-process API request timed out after {self._timeout}s", request=request)
+
+    def close(self):
+        """Stops the loop thread; the next request starts a new one."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None or thread is None:
+            return
+        if thread.is_alive():
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+        # After a fork the loop thread is gone but the loop still counts as
+        # running, so it can only be dropped
+        if not loop.is_running():
+            loop.close()
+
+
+def _build_asgi_client() -> httpx.Client:
+    from main import app as api_app
+    return httpx.Client(
+        base_url="http://api",
+        transport=InProcessASGITransport(api_app, timeout=API_TIMEOUT),
+        timeout=httpx.Timeout(API_TIMEOUT, connect=API_CONNECT_TIMEOUT),
+    )
+
+
+def _build_http_client() -> httpx.Client:
+    http2 = API_HTTP2
+    if http2 and not _http2_available():
+        logger.warning("API_HTTP2 is enabled but the 'h2' package is not installed; falling back to HTTP/1.1.")
+        http2 = False
+
+    return httpx.Client(
+        base_url=API_BASE_URL,
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=API_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=API_POOL_MAX_KEEPALIVE,
+            keepalive_expiry=API_POOL_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(API_TIMEOUT, connect=API_CONNECT_TIMEOUT),
+    )
+
+
+_TRANSPORTS = {
+    "http": _build_http_client,
+    "asgi": _build_asgi_client,
+}
+
+
+def _build_client() -> httpx.Client:
+    try:
+        builder = _TRANSPORTS[API_TRANSPORT]
+    except KeyError:
+        raise ValueError(f"Unknown API_TRANSPORT: {API_TRANSPORT}. Available: {list(_TRANSPORTS)}")
+    return builder()
+
+
+def get_http_client() -> httpx.Client:
+    """Returns the process-wide pooled client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = _build_client()
+    return _client
+
+
+def close_http_client():
+    """Closes the pooled client; the next request will open a fresh one."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+def _reset_after_fork():
+    # Sockets inherited from the parent must never be shared with a child.
+    global _client, _client_lock, _stats_lock
+    if _client is not None and isinstance(_client._transport, InProcessASGITransport):
+        # Nothing of it goes over a socket, and its loop thread did not survive the fork
+        _client._transport.close()
+    _client = None
+    _client_lock = threading.Lock()
+    _stats_lock = threading.Lock()
+    for key in _pool_stats:
+        _pool_stats[key] = 0
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_pool_stats() -> dict:
+    """Returns pool hit/miss counters for this process."""
+    with _stats_lock:
+        stats: Dict[str, Any] = dict(_pool_stats)
+    stats["transport"] = API_TRANSPORT
+    stats["hit_ratio"] = stats["hits"] / stats["requests"] if stats["requests"] else None
+    return stats
+
+
+class _ConnectionTracer:
+    """httpcore trace hook that records whether a request opened a new connection."""
+
+    def __init__(self):
+        self.opened_connection = False
+
+    def __call__(self, event_name: str, info: dict):
+        if event_name == "connection.connect_tcp.started":
+            self.opened_connection = True
+
+
+def _record(tracer: _ConnectionTracer):
+    with _stats_lock:
+        _pool_stats["requests"] += 1
+        if tracer.opened_connection:
+            _pool_stats["misses"] += 1
+        else:
+            _pool_stats["hits"] += 1
+
+
+def _auth_headers(token: Optional[str] = None) -> dict:
+    headers = {}
+    auth_token = token
+    # If no token is provided as an argument, try to get it from the cookie
+    if not auth_token and request and hasattr(request, 'cookies'):
+        auth_token = request.cookies.get('access_token')
+
+    if auth_token:
+        headers['Authorization'] = f'Bearer {auth_token}'
+    return headers
+
 
 def make_api_request(
     method: str,
@@ -13,29 +227,51 @@ def make_api_request(
 ):
     if json_data and form_data:
         raise ValueError("Cannot provide both json_data and form_data.")
+    if method not in SUPPORTED_METHODS:
+        raise ValueError(f"Unsupported HTTP method: {method}")
 
-    headers = {}
-    auth_token = token
-    # If no token is provided as an argument, try to get it from the cookie
-    if not auth_token and request and hasattr(request, 'cookies'):
-        auth_token = request.cookies.get('access_token')
+    tracer = _ConnectionTracer()
+    response = get_http_client().request(
+        method,
+        endpoint,
+        json=json_data,
+        data=form_data,
+        headers=_auth_headers(token),
+        params=params,
+        extensions={"trace": tracer},
+    )
+    if API_TRANSPORT == "http":
+        _record(tracer)
 
-    if auth_token:
-        headers['Authorization'] = f'Bearer {auth_token}'
+    response.raise_for_status()
+    return response
 
-    url = f"{API_BASE_URL}{endpoint}"
-
-    with httpx.Client() as client:
-        if method == "GET":
-            response = client.get(url, headers=headers, params=params)
-        elif method == "POST":
-            response = client.post(url, json=json_data, data=form_data, headers=headers, params=params)
-        elif method == "PUT":
-            response = client.put(url, json=json_data, data=form_data, headers=headers, params=params)
-        elif method == "DELETE":
-            response = client.delete(url, headers=headers, params=params)
-        else:
-            raise ValueError(f"Unsupported HTTP method: {method}")
 
+def stream_api_request(
+    method: str,
+    endpoint: str,
+    params: Optional[dict] = None,
+    token: Optional[str] = None
+) -> httpx.Response:
+    """Sends a request and returns the response with its body not yet read.
+
+    The caller must iterate the body (e.g. ``response.iter_bytes()``) and close
+    the response. Errors are raised before any of the body is consumed.
+    """
+    if method not in SUPPORTED_METHODS:
+        raise ValueError(f"Unsupported HTTP method: {method}")
+
+    client = get_http_client()
+    tracer = _ConnectionTracer()
+    api_request = client.build_request(
+        method, endpoint, params=params, headers=_auth_headers(token), extensions={"trace": tracer}
+    )
+    response = client.send(api_request, stream=True)
+    if API_TRANSPORT == "http":
+        _record(tracer)
+
+    if response.is_error:
+        response.read()
+        response.close()
         response.raise_for_status()
-        return response
\ No newline at end of file
+    return response
@@ -1,31 +1,65 @@
-from typing import Generator
+from typing import Generator, Optional, Tuple
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.services.user_service import UserService
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.auth.jwt import decode_access_token
+from app.auth.principal_cache import principal_cache
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
 
-def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
-):
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def _decode_token(token: str) -> Tuple[str, Optional[int]]:
     payload = decode_access_token(token)
     if payload is None:
-        raise credentials_exception
+        raise _credentials_exception()
     username: Optional[str] = payload.get("sub")
     if username is None:
-        raise credentials_exception
-    user = UserService.get_user_by_username(db, username=username)
+        raise _credentials_exception()
+    return username, payload.get("user_id")
+
+
+def get_current_user(
+    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
+):
+    username, user_id = _decode_token(token)
+    if user_id is not None:
+        principal = principal_cache.get(user_id)
+        if principal is not None:
+            return principal_cache.to_user(principal)
+        user = UserService.get_user_by_id(db, user_id)
+    else:
+        user = UserService.get_user_by_username(db, username=username)
+    if user is None:
+        raise _credentials_exception()
+    principal_cache.set(user)
+    return user
+
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)
+):
+    username, user_id = _decode_token(token)
+    if user_id is not None:
+        principal = principal_cache.get(user_id)
+        if principal is not None:
+            return principal_cache.to_user(principal)
+        user = await UserService.get_user_by_id_async(db, user_id)
+    else:
+        user = await UserService.get_user_by_username_async(db, username=username)
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
+    principal_cache.set(user)
     return user
@@ -0,0 +1,69 @@
+import time
+from typing import Optional
+
+import httpx
+from flask import session, request
+
+from app.models import User, UserRole
+from config import Config
+
+SESSION_KEY = 'identity'
+
+
+def remember_identity(user_json: dict):
+    """Stores the principal returned by /auth/me in the signed session cookie, with when it was checked."""
+    session[SESSION_KEY] = {
+        'id': user_json['id'],
+        'username': user_json['username'],
+        'role': user_json['role'],
+        'checked_at': time.time(),
+    }
+
+
+def forget_identity():
+    session.pop(SESSION_KEY, None)
+
+
+def _user_from_identity(identity: dict) -> User:
+    # In-memory User for Flask-Login; it is never attached to a DB session.
+    return User(
+        id=identity['id'],
+        username=identity['username'],
+        role=UserRole[identity['role']]
+    )
+
+
+def _fetch_identity(user_id: str) -> Optional[User]:
+    """Re-reads the principal from the API with the JWT cookie; forgets the identity if it is gone."""
+    if not request.cookies.get('access_token'):
+        forget_identity()
+        return None
+
+    from app.api_client import make_api_request
+    try:
+        user_json = make_api_request("GET", "/auth/me").json()
+    except httpx.HTTPStatusError:
+        forget_identity()
+        return None
+    except httpx.RequestError:
+        return None
+    if str(user_json['id']) != user_id:
+        forget_identity()
+        return None
+    remember_identity(user_json)
+    return _user_from_identity(session[SESSION_KEY])
+
+
+def load_identity(user_id: str, max_age: Optional[float] = None) -> Optional[User]:
+    """Restores the current user without touching the database.
+
+    The signed session is used while its identity is younger than max_age
+    (IDENTITY_MAX_AGE by default). Past that, or when only the remember-me
+    cookie survived, the identity is re-fetched from the API using the JWT
+    cookie, so role changes and deleted users are picked up.
+    """
+    max_age = Config.IDENTITY_MAX_AGE if max_age is None else max_age
+    identity = session.get(SESSION_KEY)
+    if identity and str(identity.get('id')) == user_id and time.time() - identity.get('checked_at', 0) < max_age:
+        return _user_from_identity(identity)
+    return _fetch_identity(user_id)
@@ -0,0 +1,112 @@
+import json
+import logging
+from typing import Optional
+
+from app.cache import LRUCache
+from app.models import User, UserRole
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "principal:"
+
+
+class PrincipalCache:
+    """Caches the authenticated principal by user id so token checks skip the database."""
+
+    def __init__(self, backend: str, ttl: int, local_ttl: int, max_size: int):
+        if backend not in ('memory', 'redis'):
+            raise ValueError(f"Unknown principal cache backend: {backend}")
+        self.backend = backend
+        self.ttl = ttl
+        # With Redis behind it the LRU only absorbs bursts, so invalidations
+        # made by other processes become visible after local_ttl at most.
+        self._local = LRUCache(max_size, local_ttl if backend == 'redis' else ttl)
+
+    @staticmethod
+    def _redis():
+        from app.queue import redis_conn
+        return redis_conn
+
+    @staticmethod
+    def _to_principal(user: User) -> dict:
+        return {
+            "id": user.id,
+            "username": user.username,
+            "role": user.role.name if user.role else UserRole.USER.name,
+            "telegram_chat_id": user.telegram_chat_id,
+            "telegram_username": user.telegram_username,
+        }
+
+    @staticmethod
+    def to_user(principal: dict) -> User:
+        """Builds a detached User from a cached principal."""
+        return User(
+            id=principal["id"],
+            username=principal["username"],
+            role=UserRole[principal["role"]],
+            telegram_chat_id=principal["telegram_chat_id"],
+            telegram_username=principal["telegram_username"],
+        )
+
+    def get(self, user_id: int) -> Optional[dict]:
+        principal = self._local.get(user_id)
+        if principal is not None or self.backend != 'redis':
+            return principal
+        try:
+            raw = self._redis().get(f"{REDIS_KEY_PREFIX}{user_id}")
+        except Exception as e:
+            logger.warning(f"Principal cache read from Redis failed: {e}")
+            return None
+        if raw is None:
+            return None
+        principal = json.loads(raw)
+        self._local.set(user_id, principal)
+        return principal
+
+    def set(self, user: User):
+        principal = self._to_principal(user)
+        self._local.set(user.id, principal)
+        if self.backend == 'redis':
+            try:
+                self._redis().set(f"{REDIS_KEY_PREFIX}{user.id}", json.dumps(principal), ex=self.ttl)
+            except Exception as e:
+                logger.warning(f"Principal cache write to Redis failed: {e}")
+
+    def invalidate(self, user_id: int):
+        self._local.delete(user_id)
+        if self.backend == 'redis':
+            try:
+                self._redis().delete(f"{REDIS_KEY_PREFIX}{user_id}")
+            except Exception as e:
+                logger.warning(f"Principal cache invalidation in Redis failed: {e}")
+
+    def invalidate_remote(self, user_id: int):
+        """Invalidation from outside the API process (CLI, Telegram bot).
+
+        Only the redis backend reaches the API's cache; with the memory one the
+        API keeps the old principal until its entry expires.
+        """
+        if self.backend != 'redis':
+            logger.warning(
+                f"Principal cache backend is 'memory': the API keeps serving the old principal of user "
+                f"{user_id} for up to {self.ttl}s. Set PRINCIPAL_CACHE_BACKEND=redis to share invalidations."
+            )
+        self.invalidate(user_id)
+
+    def report_backend(self, workers: int):
+        """Warns at API startup when per-process caches cannot see each other's invalidations."""
+        if self.backend != 'redis' and workers > 1:
+            logger.warning(
+                f"Principal cache backend is 'memory' with {workers} API workers: a role or password change "
+                f"handled by one worker reaches the others only after up to {self.ttl}s. "
+                f"Set PRINCIPAL_CACHE_BACKEND=redis to share invalidations."
+            )
+
+
+principal_cache = PrincipalCache(
+    backend=Config.PRINCIPAL_CACHE_BACKEND,
+    ttl=Config.PRINCIPAL_CACHE_TTL,
+    local_ttl=Config.PRINCIPAL_CACHE_LOCAL_TTL,
+    max_size=Config.PRINCIPAL_CACHE_MAX_SIZE,
+)
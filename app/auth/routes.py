@@ -9,6 +9,9 @@ from app.queue import redis_conn
 import httpx
 from app.api_client import make_api_request
 from app.auth.jwt import decode_access_token
+from app.auth.identity import remember_identity, forget_identity
+from app.extensions import get_request_db
+from app.services.user_service import UserService
 
 @bp.route('/telegram/connect', methods=['POST'])
 @login_required
@@ -79,6 +82,7 @@ def login():
                 role=UserRole[user_json['role']]
             )
 
+            remember_identity(user_json)
             login_user(user, remember=True)
             
             resp = make_response(redirect(url_for('index')))
@@ -97,6 +101,7 @@ def login():
 @bp.route('/logout')
 def logout():
     logout_user()
+    forget_identity()
     resp = make_response(redirect(url_for('index')))
     resp.delete_cookie('access_token')
     return resp
@@ -104,8 +109,9 @@ def logout():
 @bp.route('/profile')
 @login_required
 def profile():
-    g.db.refresh(current_user)
-    return render_template('auth/profile.html', user=current_user)
+    # One of the few views that reads the DB directly: the session is opened lazily here
+    user = UserService.get_user_by_id(get_request_db(), current_user.id)
+    return render_template('auth/profile.html', user=user)
 
 @bp.route('/trigger-error')
 @login_required
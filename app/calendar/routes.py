@@ -1,29 +1,52 @@
-from flask import render_template, url_for, flash
+from flask import render_template, url_for, request, jsonify
 from flask_login import login_required
 from app.calendar import bp
-from app.schemas import TaskSchema
-from pydantic import TypeAdapter
+from app.schemas import TASK_LIST_ADAPTER, TASK_OCCURRENCE_LIST_ADAPTER
 import httpx
-from typing import List
 from app.api_client import make_api_request
 
 @bp.route('/calendar')
 @login_required
 def calendar():
+    return render_template('calendar/calendar.html')
+
+@bp.route('/calendar/events')
+@login_required
+def calendar_events():
+    """JSON event source for FullCalendar; only the requested range is loaded."""
+    params = {
+        'start': request.args.get('start'),
+        'end': request.args.get('end'),
+        'include_archived': 'true',
+    }
     try:
-        response = make_api_request("GET", "/tasks/calendar")
-        tasks_data = response.json()
-        tasks = TypeAdapter(List[TaskSchema]).validate_python(tasks_data)
-    except (httpx.RequestError, httpx.HTTPStatusError) as e:
-        flash(f"Error loading calendar data: {e}", "danger")
-        tasks = []
-    
+        response = make_api_request("GET", "/tasks/calendar", params=params)
+        tasks = TASK_LIST_ADAPTER.validate_json(response.content)
+        response = make_api_request("GET", "/tasks/occurrences", params={'start': params['start'], 'end': params['end']})
+        occurrences = TASK_OCCURRENCE_LIST_ADAPTER.validate_json(response.content)
+    except httpx.HTTPStatusError as e:
+        return jsonify({'error': e.response.text}), e.response.status_code
+    except httpx.RequestError as e:
+        return jsonify({'error': str(e)}), 502
+
     events = []
     for task in tasks:
+        if task.recurrence:
+            # Shown once per occurrence below instead
+            continue
         events.append({
+            'id': task.id,
             'title': task.title,
             'start': task.planned_start.isoformat(),
             'end': task.planned_end.isoformat() if task.planned_end else None,
             'url': url_for('tasks.edit_task', task_id=task.id)
         })
-    return render_template('calendar/calendar.html', events=events)
+    for occurrence in occurrences:
+        events.append({
+            'id': f"{occurrence.task_id}:{occurrence.occurrence.isoformat()}",
+            'title': occurrence.title,
+            'start': occurrence.occurrence.isoformat(),
+            'classNames': ['occurrence-done'] if occurrence.done else [],
+            'url': url_for('tasks.edit_task', task_id=occurrence.task_id)
+        })
+    return jsonify(events)
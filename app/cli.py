@@ -1,6 +1,8 @@
 import click
 from app.database import SessionLocal
 from app.models import User, UserRole
+from app.services.habit_stats_service import HabitStatsService
+from app.auth.principal_cache import principal_cache
 
 def register_commands(app):
     @app.cli.group()
@@ -28,6 +30,7 @@ def register_commands(app):
 
             user.role = new_role
             db_session.commit()
+            principal_cache.invalidate_remote(user.id)
             click.echo(f"User '{username}' role set to '{new_role.name}'.")
         finally:
             db_session.close()
@@ -45,6 +48,30 @@ def register_commands(app):
 
             user.role = UserRole.USER
             db_session.commit()
+            principal_cache.invalidate_remote(user.id)
             click.echo(f"User '{username}' role reset to '{UserRole.USER.name}'.")
         finally:
             db_session.close()
+
+    @app.cli.group('habit-stats')
+    def habit_stats():
+        """Manage the habit_stats aggregates."""
+        pass
+
+    @habit_stats.command('rebuild')
+    @click.option('--username', default=None, help="Only rebuild this user's habits.")
+    def rebuild_habit_stats(username):
+        """Recompute streak/completion aggregates from the habit logs."""
+        db_session = SessionLocal()
+        try:
+            user_id = None
+            if username:
+                user = db_session.query(User).filter_by(username=username).first()
+                if not user:
+                    click.echo(f"Error: User '{username}' not found.")
+                    return
+                user_id = user.id
+            count = HabitStatsService.rebuild_all(db_session, user_id)
+            click.echo(f"Rebuilt stats for {count} habits.")
+        finally:
+            db_session.close()
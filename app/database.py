@@ -1,24 +1,50 @@
+import logging
+from typing import Any, Dict
 from sqlalchemy import create_engine, event
-from sqlalchemy.engine import Engine
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from config import Config
 
-engine_args = {}
-if 'sqlite' in Config.SQLALCHEMY_DATABASE_URI:
+logger = logging.getLogger(__name__)
+
+IS_SQLITE = Config.SQLALCHEMY_DATABASE_URI.startswith('sqlite')
+IS_SQLITE_MEMORY = IS_SQLITE and ':memory:' in Config.SQLALCHEMY_DATABASE_URI
+
+SQLITE_PRAGMAS = (
+    ('journal_mode', Config.SQLITE_JOURNAL_MODE),
+    ('synchronous', Config.SQLITE_SYNCHRONOUS),
+    ('busy_timeout', Config.SQLITE_BUSY_TIMEOUT_MS),
+    ('cache_size', Config.SQLITE_CACHE_SIZE),
+    ('mmap_size', Config.SQLITE_MMAP_SIZE),
+    ('temp_store', Config.SQLITE_TEMP_STORE),
+    ('foreign_keys', 'ON' if Config.SQLITE_FOREIGN_KEYS else 'OFF'),
+)
+
+engine_args: Dict[str, Any] = {}
+if IS_SQLITE:
     engine_args['connect_args'] = {"check_same_thread": False}
+if not IS_SQLITE_MEMORY:
+    engine_args.update(
+        pool_size=Config.DB_POOL_SIZE,
+        max_overflow=Config.DB_MAX_OVERFLOW,
+        pool_timeout=Config.DB_POOL_TIMEOUT,
+    )
 
 engine = create_engine(
     Config.SQLALCHEMY_DATABASE_URI,
     **engine_args
 )
 
-@event.listens_for(Engine, "connect")
-def set_sqlite_pragma(dbapi_connection, connection_record):
-    if 'sqlite' in Config.SQLALCHEMY_DATABASE_URI:
-        cursor = dbapi_connection.cursor()
-        cursor.execute("PRAGMA journal_mode=WAL")
-        cursor.close()
+def apply_sqlite_profile(dbapi_connection, connection_record):
+    """Applies SQLITE_PRAGMAS to a freshly opened DBAPI connection."""
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PRAGMAS:
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+if IS_SQLITE:
+    event.listen(engine, "connect", apply_sqlite_profile)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -30,3 +56,62 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg',
+    'postgres': 'postgresql+asyncpg',
+}
+
+
+def get_async_database_uri(uri: str) -> str:
+    """Maps a sync database URI onto the matching async driver."""
+    scheme, sep, rest = uri.partition('://')
+    dialect = scheme.split('+', 1)[0]
+    if dialect not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database dialect: {dialect}")
+    return f"{ASYNC_DRIVERS[dialect]}{sep}{rest}"
+
+
+# Pooled connections belong to the event loop that opened them; see the
+# single-loop note next to DB_POOL_SIZE in config.py
+async_engine_args: Dict[str, Any] = {}
+if not IS_SQLITE_MEMORY:
+    async_engine_args.update(
+        pool_size=Config.DB_POOL_SIZE,
+        max_overflow=Config.DB_MAX_OVERFLOW,
+        pool_timeout=Config.DB_POOL_TIMEOUT,
+    )
+
+async_engine = create_async_engine(
+    get_async_database_uri(Config.SQLALCHEMY_DATABASE_URI),
+    **async_engine_args
+)
+
+if IS_SQLITE:
+    event.listen(async_engine.sync_engine, "connect", apply_sqlite_profile)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False, class_=AsyncSession
+)
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+
+def report_database_profile():
+    """Logs the effective connection profile; called once at process startup."""
+    pool = f"pool_size={engine.pool.size() if hasattr(engine.pool, 'size') else 'n/a'}"
+    if not IS_SQLITE:
+        logger.info(f"Database {engine.url.render_as_string(hide_password=True)} ({pool})")
+        return
+    with engine.connect() as connection:
+        effective = {
+            name: connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+            for name, _ in SQLITE_PRAGMAS
+        }
+    settings = ", ".join(f"{name}={value}" for name, value in effective.items())
+    logger.info(f"SQLite profile for {engine.url.database} ({pool}): {settings}")
@@ -1,4 +1,17 @@
+from flask import g
 from flask_login import LoginManager
 
+from app.database import SessionLocal
+
 login_manager = LoginManager()
 
+
+def get_request_db():
+    """Returns a DB session bound to the current request, opening it on first use.
+
+    Most views talk to the API only, so the session is created lazily and
+    closed in the app's teardown handler.
+    """
+    if 'db' not in g:
+        g.db = SessionLocal()
+    return g.db
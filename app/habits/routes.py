@@ -1,51 +1,54 @@
 from flask import render_template, redirect, url_for, flash, request, jsonify, session
 from flask_login import login_required
 from app.habits import bp
-from app.schemas import HabitSchema
-from pydantic import ValidationError, TypeAdapter
+from app.schemas import HabitSchema, HabitHeatmapSchema, HABIT_DASHBOARD_ADAPTER, HABIT_STATS_LIST_ADAPTER
+from pydantic import ValidationError
 from datetime import date, timedelta, datetime
 import httpx
 import json
-from typing import List
 from app.api_client import make_api_request
 
 
+def heatmap_weeks(heatmap: HabitHeatmapSchema):
+    """The year's days as Monday-first week columns, padded with None outside the year."""
+    lead = [None] * heatmap.days[0].date.weekday() if heatmap.days else []
+    cells = lead + heatmap.days
+    cells += [None] * (-len(cells) % 7)
+    return [cells[i:i + 7] for i in range(0, len(cells), 7)]
+
 @bp.route('/habits')
 @login_required
 def habits():
-    try:
-        response = make_api_request("GET", "/habits/")
-        habits_data = response.json()
-        habits = TypeAdapter(List[HabitSchema]).validate_python(habits_data)
-    except (httpx.RequestError, httpx.HTTPStatusError) as e:
-        flash(f"Could not load habits: {e}", "danger")
-        habits = []
-        
-    habits.sort(key=lambda x: x.strategy_type)
-    
     today = date.today()
     start_date = today - timedelta(days=3)
     end_date = today + timedelta(days=3)
-    
-    habits_with_logs = []
-    for habit in habits:
-        try:
-            params = {"start_date": start_date.isoformat(), "end_date": end_date.isoformat()}
-            response = make_api_request("GET", f"/habits/{habit.id}/dates-with-status", params=params)
-            dates_with_status_raw = response.json()
-            # Convert string keys back to date objects
-            dates_with_status = {date.fromisoformat(k): v for k, v in dates_with_status_raw.items()}
-            
-            habits_with_logs.append({
-                "habit": habit,
-                "logs": dates_with_status
-            })
-        except (httpx.RequestError, httpx.HTTPStatusError) as e:
-            flash(f"Could not load logs for habit '{habit.name}': {e}", "warning")
-            habits_with_logs.append({"habit": habit, "logs": {}})
 
+    try:
+        params = {"start_date": start_date.isoformat(), "end_date": end_date.isoformat()}
+        response = make_api_request("GET", "/habits/dashboard", params=params)
+        dashboard = HABIT_DASHBOARD_ADAPTER.validate_json(response.content)
+        response = make_api_request("GET", "/habits/stats")
+        stats = {item.habit_id: item for item in HABIT_STATS_LIST_ADAPTER.validate_json(response.content)}
+    except (httpx.RequestError, httpx.HTTPStatusError) as e:
+        flash(f"Could not load habits: {e}", "danger")
+        dashboard, stats = [], {}
+
+    year = request.args.get('year', type=int) or today.year
+    try:
+        response = make_api_request("GET", "/habits/heatmap", params={"year": year})
+        heatmap = HabitHeatmapSchema.model_validate_json(response.content)
+    except (httpx.RequestError, httpx.HTTPStatusError) as e:
+        flash(f"Could not load the habit heatmap: {e}", "danger")
+        heatmap = None
+
+    dashboard.sort(key=lambda x: x.habit.strategy_type)
+    habits_with_logs = [
+        {"habit": item.habit, "logs": item.logs, "log_dates": set(item.log_dates), "stats": stats.get(item.habit.id)}
+        for item in dashboard
+    ]
 
-    return render_template('habits/habits_list.html', habits_with_logs=habits_with_logs, dates=[start_date + timedelta(days=i) for i in range(7)], today=today)
+    return render_template('habits/habits_list.html', habits_with_logs=habits_with_logs, dates=[start_date + timedelta(days=i) for i in range(7)], today=today,
+                           year=year, heatmap=heatmap, heatmap_weeks=heatmap_weeks(heatmap) if heatmap else [])
 
 @bp.route('/habit/<int:habit_id>/json')
 @login_required
@@ -159,4 +162,14 @@ def log_habit():
         make_api_request("POST", "/habits/log", json_data=log_data)
         return jsonify({'success': True})
     except (httpx.RequestError, httpx.HTTPStatusError, ValueError) as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/habits/log/batch', methods=['POST'])
+@login_required
+def log_habit_batch():
+    payload = request.get_json()
+    try:
+        response = make_api_request("POST", "/habits/log/batch", json_data=payload)
+        return jsonify(response.json()['results'])
+    except (httpx.RequestError, httpx.HTTPStatusError) as e:
         return jsonify({'error': str(e)}), 500
\ No newline at end of file
@@ -0,0 +1,76 @@
+import json
+import os
+import uuid
+
+import httpx
+from flask import flash, session
+from flask_login import current_user
+from rq.job import Job
+from rq.exceptions import NoSuchJobError
+
+from app.api_client import make_api_request
+from app.queue import q, redis_conn
+from config import Config
+
+
+def _upload_size(file):
+    file.stream.seek(0, os.SEEK_END)
+    size = file.stream.tell()
+    file.stream.seek(0)
+    return size
+
+
+def start_import(kind, file):
+    """Imports an uploaded JSON file of tasks or movies.
+
+    Small files go straight to the API's bulk import; larger ones are saved to
+    the shared data volume and imported by an RQ worker, whose progress the
+    list page polls through import_status().
+    """
+    if _upload_size(file) > Config.IMPORT_BACKGROUND_THRESHOLD:
+        os.makedirs(Config.IMPORT_UPLOAD_DIR, exist_ok=True)
+        path = os.path.join(Config.IMPORT_UPLOAD_DIR, f"{kind}-{uuid.uuid4().hex}.json")
+        file.save(path)
+        job = q.enqueue(
+            'app.tasks_rq.import_file', current_user.id, kind, path,
+            job_timeout=Config.IMPORT_JOB_TIMEOUT,
+            meta={'user_id': current_user.id, 'kind': kind},
+        )
+        session['import_job_id'] = job.id
+        flash(f'Import of {kind} started in the background.', 'info')
+        return
+
+    try:
+        items = json.load(file)
+        result = make_api_request("POST", f"/{kind}/import", json_data=items).json()
+        message = f"Imported {result['imported']} {kind}."
+        if result['failed']:
+            message += f" {result['failed']} invalid item(s) skipped."
+        flash(message, 'success')
+    except (json.JSONDecodeError, httpx.RequestError, httpx.HTTPStatusError) as e:
+        flash(f'Error importing {kind}: {e}', 'danger')
+
+
+def import_status(job_id):
+    """Returns the state of the current user's import job, or None if unknown."""
+    try:
+        job = Job.fetch(job_id, connection=redis_conn)
+    except NoSuchJobError:
+        return None
+    if job.meta.get('user_id') != current_user.id:
+        return None
+
+    state = {
+        'status': job.get_status().value,
+        'kind': job.meta.get('kind'),
+        'processed': job.meta.get('processed', 0),
+        'total': job.meta.get('total'),
+    }
+    if job.is_finished:
+        state['result'] = job.return_value()
+    elif job.is_failed:
+        state['error'] = 'Import failed. Check that the file is a JSON array.'
+    if job.is_finished or job.is_failed:
+        if session.get('import_job_id') == job_id:
+            session.pop('import_job_id')
+    return state
@@ -1,5 +1,4 @@
 from sqlalchemy import (
-    Column,
     Integer,
     String,
     Text,
@@ -8,10 +7,13 @@ from sqlalchemy import (
     ForeignKey,
     Boolean,
     JSON,
-    Date
+    Date,
+    Index,
+    text
 )
-from sqlalchemy.orm import relationship
-from datetime import datetime
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from datetime import date, datetime
+from typing import List, Optional
 import enum
 
 from app.database import Base
@@ -37,16 +39,16 @@ class UserRole(enum.Enum):
 
 class User(Base):
     __tablename__ = 'user'
-    id = Column(Integer, primary_key=True, index=True)
-    username = Column(String(64), index=True, unique=True)
-    password_hash = Column(String(128))
-    telegram_chat_id = Column(String(64), unique=True, nullable=True)
-    telegram_username = Column(String(64), nullable=True)
-    role = Column(SQLAlchemyEnum(UserRole), default=UserRole.USER, nullable=False)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    username: Mapped[Optional[str]] = mapped_column(String(64), index=True, unique=True, nullable=True)
+    password_hash: Mapped[Optional[str]] = mapped_column(String(128), nullable=True)
+    telegram_chat_id: Mapped[Optional[str]] = mapped_column(String(64), unique=True, nullable=True)
+    telegram_username: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    role: Mapped[UserRole] = mapped_column(SQLAlchemyEnum(UserRole), default=UserRole.USER, nullable=False)
 
-    tasks = relationship('Task', back_populates='author')
-    habits = relationship('Habit', back_populates='author')
-    movies = relationship('Movie', back_populates='author')
+    tasks: Mapped[List['Task']] = relationship('Task', back_populates='author')
+    habits: Mapped[List['Habit']] = relationship('Habit', back_populates='author')
+    movies: Mapped[List['Movie']] = relationship('Movie', back_populates='author')
 
     # Properties for Flask-Login compatibility
     @property
@@ -69,65 +71,167 @@ class User(Base):
 
 class Task(Base):
     __tablename__ = 'task'
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey('user.id'))
-    title = Column(String(140))
-    details = Column(Text, nullable=True)
-    status = Column(SQLAlchemyEnum(TaskStatus), default=TaskStatus.OPEN, nullable=False)
-    type = Column(SQLAlchemyEnum(TaskType), default=TaskType.INBOX, nullable=False)
-    deadline = Column(DateTime, nullable=True)
-    duration = Column(Integer, nullable=True)
-    planned_start = Column(DateTime, nullable=True)
-    planned_end = Column(DateTime, nullable=True)
-    suspend_due = Column(DateTime, nullable=True)
-    notify_at = Column(DateTime, nullable=True)
-    planned_start_notified = Column(Boolean, default=False, nullable=True)
-
-    author = relationship('User', back_populates='tasks')
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    user_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey('user.id'), nullable=True)
+    title: Mapped[Optional[str]] = mapped_column(String(140), nullable=True)
+    details: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    status: Mapped[TaskStatus] = mapped_column(SQLAlchemyEnum(TaskStatus), default=TaskStatus.OPEN, nullable=False)
+    type: Mapped[TaskType] = mapped_column(SQLAlchemyEnum(TaskType), default=TaskType.INBOX, nullable=False)
+    deadline: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    duration: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    planned_start: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    planned_end: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    suspend_due: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    notify_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    planned_start_notified: Mapped[Optional[bool]] = mapped_column(Boolean, default=False, nullable=True)
+    # Set by the archival job once the task is DONE/ARCHIVED, see ArchiveService
+    closed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    # RRULE value (e.g. 'FREQ=MONTHLY;BYMONTHDAY=1'), its anchor and the cached
+    # next pending occurrence, see RecurrenceService
+    recurrence: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    recurrence_start: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    next_occurrence: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+    author: Mapped['User'] = relationship('User', back_populates='tasks')
+
+    __table_args__ = (
+        Index('ix_task_user_id_type', 'user_id', 'type'),
+        Index('ix_task_user_id_id', 'user_id', 'id'),
+        Index('ix_task_user_id_deadline', 'user_id', 'deadline'),
+        Index('ix_task_suspend_due', 'suspend_due',
+              sqlite_where=text('suspend_due IS NOT NULL'),
+              postgresql_where=text('suspend_due IS NOT NULL')),
+        Index('ix_task_notify_at', 'notify_at',
+              sqlite_where=text('notify_at IS NOT NULL'),
+              postgresql_where=text('notify_at IS NOT NULL')),
+        Index('ix_task_planned_start_notified', 'planned_start', 'planned_start_notified',
+              sqlite_where=text('planned_start IS NOT NULL'),
+              postgresql_where=text('planned_start IS NOT NULL')),
+        Index('ix_task_user_id_planned_start', 'user_id', 'planned_start'),
+        # planned_start rides along so the calendar's running-at-start check is answered from the index
+        Index('ix_task_user_id_planned_end', 'user_id', 'planned_end', 'planned_start'),
+        Index('ix_task_closed_at', 'closed_at',
+              sqlite_where=text('closed_at IS NOT NULL'),
+              postgresql_where=text('closed_at IS NOT NULL')),
+        Index('ix_task_next_occurrence', 'next_occurrence',
+              sqlite_where=text('next_occurrence IS NOT NULL'),
+              postgresql_where=text('next_occurrence IS NOT NULL')),
+        # Archived tasks keep their id, so SQLite must never hand it out again
+        {'sqlite_autoincrement': True},
+    )
 
     def __repr__(self):
         return f'<Task {self.title}>'
 
+class TaskArchive(Base):
+    """Cold tier for closed tasks; rows keep the id they had in the task table,
+    which is never reused (see Task.__table_args__)."""
+    __tablename__ = 'task_archive'
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    user_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey('user.id'), nullable=True)
+    title: Mapped[Optional[str]] = mapped_column(String(140), nullable=True)
+    details: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    status: Mapped[TaskStatus] = mapped_column(SQLAlchemyEnum(TaskStatus), nullable=False)
+    type: Mapped[TaskType] = mapped_column(SQLAlchemyEnum(TaskType), nullable=False)
+    deadline: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    duration: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    planned_start: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    planned_end: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    suspend_due: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    notify_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    planned_start_notified: Mapped[Optional[bool]] = mapped_column(Boolean, nullable=True)
+    closed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    recurrence: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    recurrence_start: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    next_occurrence: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    archived_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index('ix_task_archive_user_id_id', 'user_id', 'id'),
+        Index('ix_task_archive_user_id_planned_start', 'user_id', 'planned_start'),
+        Index('ix_task_archive_user_id_planned_end', 'user_id', 'planned_end', 'planned_start'),
+    )
+
+    def __repr__(self):
+        return f'<TaskArchive {self.title}>'
+
+class TaskOccurrence(Base):
+    """A completed occurrence of a recurring task.
+
+    task_id has no foreign key because the task may live in either tier.
+    """
+    __tablename__ = 'task_occurrence'
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    task_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    occurrence: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    completed_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index('uq_task_occurrence_task_id_occurrence', 'task_id', 'occurrence', unique=True),
+    )
+
+    def __repr__(self):
+        return f'<TaskOccurrence {self.task_id} {self.occurrence}>'
+
 class Habit(Base):
     __tablename__ = 'habit'
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey('user.id'))
-    name = Column(String(140))
-    description = Column(Text, nullable=True)
-    start_date = Column(DateTime, default=datetime.utcnow)
-    end_date = Column(DateTime, nullable=True)
-    strategy_type = Column(String(50), nullable=True)
-    strategy_params = Column(JSON, nullable=True)
-
-    author = relationship('User', back_populates='habits')
-    habit_logs = relationship('HabitLog', back_populates='habit')
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    user_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey('user.id'), nullable=True)
+    name: Mapped[Optional[str]] = mapped_column(String(140), nullable=True)
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    start_date: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow)
+    end_date: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    strategy_type: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    strategy_params: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+
+    author: Mapped['User'] = relationship('User', back_populates='habits')
+
+    __table_args__ = (
+        Index('ix_habit_user_id', 'user_id'),
+    )
 
     def __repr__(self):
         return f'<Habit {self.name}>'
 
-class HabitLog(Base):
-    __tablename__ = 'habit_log'
-    id = Column(Integer, primary_key=True, index=True)
-    habit_id = Column(Integer, ForeignKey('habit.id'))
-    date = Column(Date, default=datetime.utcnow)
-    is_done = Column(Boolean, default=False)
-    index = Column(Integer, default=0)
+class HabitLogMonth(Base):
+    """Done slots of one habit index over one month: bit d - 1 of done_mask is day d."""
+    __tablename__ = 'habit_log_month'
+    habit_id: Mapped[int] = mapped_column(Integer, ForeignKey('habit.id', ondelete='CASCADE'), primary_key=True)
+    month: Mapped[date] = mapped_column(Date, primary_key=True)
+    index: Mapped[int] = mapped_column(Integer, primary_key=True, default=0)
+    done_mask: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
 
-    habit = relationship('Habit', back_populates='habit_logs')
+    def __repr__(self):
+        return f'<HabitLogMonth {self.habit_id} {self.month} {self.index}>'
+
+class HabitStats(Base):
+    """Streak/completion aggregates of one habit, maintained by HabitStatsService."""
+    __tablename__ = 'habit_stats'
+    habit_id: Mapped[int] = mapped_column(Integer, ForeignKey('habit.id', ondelete='CASCADE'), primary_key=True)
+    completed_days: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    current_streak: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    current_streak_end: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    longest_streak: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    longest_streak_end: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     def __repr__(self):
-        return f'<HabitLog {self.id}>'
+        return f'<HabitStats {self.habit_id}>'
 
 class Movie(Base):
     __tablename__ = 'movie'
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey('user.id'))
-    title = Column(String(140))
-    genre = Column(String(50), nullable=True)
-    rating = Column(Integer, nullable=True)
-    comment = Column(Text, nullable=True)
-
-    author = relationship('User', back_populates='movies')
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    user_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey('user.id'), nullable=True)
+    title: Mapped[Optional[str]] = mapped_column(String(140), nullable=True)
+    genre: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    rating: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    comment: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    author: Mapped['User'] = relationship('User', back_populates='movies')
+
+    __table_args__ = (
+        Index('ix_movie_user_id', 'user_id'),
+    )
 
     def __repr__(self):
         return f'<Movie {self.title}>'
@@ -1,26 +1,40 @@
-from flask import render_template, redirect, url_for, flash, request, jsonify, Response, session
+from flask import render_template, redirect, url_for, flash, request, jsonify, Response, session, stream_with_context
 import json
 from flask_login import login_required
 from app.movies import bp
-from app.schemas import MovieSchema
-from pydantic import ValidationError, TypeAdapter
+from app.schemas import MovieListItem, MOVIE_LIST_ADAPTER, MOVIE_LIST_ITEM_ADAPTER
+from pydantic import ValidationError
 import httpx
-from typing import List
-from app.api_client import make_api_request
+from app.api_client import make_api_request, stream_api_request
+from app.services.export_service import EXPORT_FORMATS
+from app.import_jobs import start_import
 
 
 @bp.route('/movies')
 @login_required
 def movies():
     try:
-        response = make_api_request("GET", "/movies/")
-        movies_data = response.json()
-        movies = TypeAdapter(List[MovieSchema]).validate_python(movies_data)
+        response = make_api_request("GET", "/movies/", params={'fields': list(MovieListItem.model_fields)})
+        movies = MOVIE_LIST_ITEM_ADAPTER.validate_json(response.content)
     except (httpx.RequestError, httpx.HTTPStatusError) as e:
         flash(f"Could not load movies: {e}", "danger")
         movies = []
     return render_template('movies/movies_list.html', movies=movies)
 
+@bp.route('/movies/search')
+@login_required
+def search_movies():
+    query = request.args.get('q', '').strip()
+    if not query:
+        return redirect(url_for('movies.movies'))
+    try:
+        response = make_api_request("GET", "/movies/search", params={'q': query})
+        movies = MOVIE_LIST_ADAPTER.validate_json(response.content)
+    except (httpx.RequestError, httpx.HTTPStatusError) as e:
+        flash(f"Could not search movies: {e}", "danger")
+        movies = []
+    return render_template('movies/movies_list.html', movies=movies, search_query=query)
+
 @bp.route('/movie/<int:movie_id>/json')
 @login_required
 def movie_json(movie_id):
@@ -91,18 +105,25 @@ def delete_movie(movie_id):
 @login_required
 def export_movies():
     fields = request.args.getlist('fields')
+    export_format = request.args.get('format', 'json')
+    if export_format not in EXPORT_FORMATS:
+        export_format = 'json'
     try:
-        response = make_api_request("GET", "/movies/export", params={'fields': fields})
-        movies_to_export = response.json()
-        
-        response_data = json.dumps(movies_to_export, ensure_ascii=False, indent=4)
-        response = Response(response_data, mimetype='application/json; charset=utf-8')
-        response.headers['Content-Disposition'] = 'attachment; filename=movies.json'
-        return response
+        api_response = stream_api_request("GET", "/movies/export", params={'fields': fields, 'format': export_format})
     except (httpx.RequestError, httpx.HTTPStatusError) as e:
         flash(f"Error exporting movies: {e}", 'danger')
         return redirect(url_for('movies.movies'))
 
+    def generate():
+        try:
+            yield from api_response.iter_bytes()
+        finally:
+            api_response.close()
+
+    response = Response(stream_with_context(generate()), mimetype=api_response.headers.get('content-type'))
+    response.headers['Content-Disposition'] = f'attachment; filename=movies.{export_format}'
+    return response
+
 @bp.route('/movies/import', methods=['POST'])
 @login_required
 def import_movies():
@@ -113,11 +134,5 @@ def import_movies():
     if file.filename == '':
         flash('No selected file', 'warning')
         return redirect(url_for('movies.movies'))
-    if file:
-        try:
-            movies_data = json.load(file)
-            make_api_request("POST", "/movies/import", json_data=movies_data)
-            flash('Movies imported successfully!', 'success')
-        except (json.JSONDecodeError, httpx.RequestError, httpx.HTTPStatusError) as e:
-            flash(f'Error importing movies: {e}', 'danger')
-        return redirect(url_for('movies.movies'))
\ No newline at end of file
+    start_import('movies', file)
+    return redirect(url_for('movies.movies'))
\ No newline at end of file
@@ -1,8 +1,12 @@
 from apscheduler.schedulers.background import BackgroundScheduler
-from app.models import Task, TaskType
+from app.models import Task, TaskStatus, TaskType
 from app.database import SessionLocal
 from datetime import datetime, timedelta, timezone
 from app.queue import q
+from app.services.archive_service import ArchiveService
+from app.services.recurrence_service import RecurrenceService
+from app.services.task_service import TaskService
+from config import Config
 
 def check_tasks():
     db_session = SessionLocal()
@@ -18,13 +22,30 @@ def check_tasks():
         # Check notifications
         
         # Notify_at
-        tasks_to_notify = db_session.query(Task).filter(Task.notify_at <= now, Task.notify_at != None).all()
+        tasks_to_notify = db_session.query(Task).filter(
+            Task.notify_at <= now, Task.notify_at != None, Task.recurrence.is_(None)
+        ).all()
         for task in tasks_to_notify:
             if task.author.telegram_chat_id:
                 message = f"Reminder for task: {task.title} (ID: {task.id})"
                 q.enqueue('app.tasks_rq.send_telegram_message', task.author.telegram_chat_id, message)
             task.notify_at = None
 
+        # Recurring tasks: only the cached next occurrence is checked, then advanced
+        now_naive = now.replace(tzinfo=None)
+        recurring_due = db_session.query(Task).filter(
+            Task.next_occurrence <= now_naive,
+            Task.status == TaskStatus.OPEN,
+        ).all()
+        for task in recurring_due:
+            if task.author.telegram_chat_id:
+                message = f"Reminder for task: {task.title} (ID: {task.id}, {task.next_occurrence:%Y-%m-%d %H:%M} UTC)"
+                q.enqueue('app.tasks_rq.send_telegram_message', task.author.telegram_chat_id, message)
+            task.next_occurrence = RecurrenceService.next_occurrence(
+                task.recurrence, task.recurrence_start, now_naive,
+                TaskService.get_completed_occurrences(db_session, task.id), inclusive=False,
+            )
+
         # Planned_start
         one_hour_from_now = now + timedelta(hours=1)
         tasks_to_remind = db_session.query(Task).filter(
@@ -42,7 +63,15 @@ def check_tasks():
     finally:
         db_session.close()
 
+def archive_tasks():
+    db_session = SessionLocal()
+    try:
+        ArchiveService.archive_closed_tasks(db_session)
+    finally:
+        db_session.close()
+
 def init_scheduler():
     scheduler = BackgroundScheduler()
     scheduler.add_job(func=check_tasks, trigger="interval", seconds=60)
+    scheduler.add_job(func=archive_tasks, trigger="interval", minutes=Config.TASK_ARCHIVE_INTERVAL_MINUTES)
     scheduler.start()
@@ -1,8 +1,10 @@
-from pydantic import BaseModel, validator
-from typing import Optional
+from pydantic import BaseModel, Field, TypeAdapter, validator
+from typing import Dict, List, Literal, Optional
 from datetime import datetime, date, timezone
 from zoneinfo import ZoneInfo
 from app.models import TaskStatus, TaskType, UserRole
+from app.services.recurrence_service import RecurrenceService
+from app.services.habit_strategies import build_strategy
 
 class UserBase(BaseModel):
     username: str
@@ -28,6 +30,7 @@ class TaskBase(BaseModel):
     planned_end: Optional[datetime] = None
     suspend_due: Optional[datetime] = None
     notify_at: Optional[datetime] = None
+    recurrence: Optional[str] = None
 
 class TaskCreate(TaskBase):
     @validator('deadline', 'planned_start', 'planned_end', 'suspend_due', 'notify_at', pre=False, always=True)
@@ -36,14 +39,74 @@ class TaskCreate(TaskBase):
             return v.astimezone(timezone.utc).replace(tzinfo=None)
         return v
 
+    @validator('recurrence')
+    def validate_recurrence(cls, v):
+        return RecurrenceService.normalize_rule(v)
+
 
 class TaskSchema(TaskBase):
     id: int
     user_id: int
+    next_occurrence: Optional[datetime] = None
 
     class Config:
         from_attributes = True
 
+class TaskListItem(BaseModel):
+    """The task columns list views render, requested from GET /tasks/ with fields=."""
+    id: int
+    title: str
+    type: TaskType
+
+MAX_BULK_TASK_IDS = 1000
+
+class TaskBulkChanges(BaseModel):
+    """Fields applied to every selected task; only fields that are sent are changed."""
+    status: Optional[TaskStatus] = None
+    type: Optional[TaskType] = None
+    deadline: Optional[datetime] = None
+    duration: Optional[int] = None
+    planned_start: Optional[datetime] = None
+    planned_end: Optional[datetime] = None
+    suspend_due: Optional[datetime] = None
+    notify_at: Optional[datetime] = None
+
+    @validator('deadline', 'planned_start', 'planned_end', 'suspend_due', 'notify_at')
+    def normalize_datetimes_to_utc(cls, v):
+        if v and v.tzinfo:
+            return v.astimezone(timezone.utc).replace(tzinfo=None)
+        return v
+
+    @validator('status', 'type')
+    def not_null(cls, v):
+        if v is None:
+            raise ValueError('may not be null')
+        return v
+
+class TaskBulkRequest(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=MAX_BULK_TASK_IDS)
+    action: Literal['update', 'delete'] = 'update'
+    changes: TaskBulkChanges = TaskBulkChanges()
+
+class TaskOccurrenceSchema(BaseModel):
+    task_id: int
+    title: str
+    occurrence: datetime
+    done: bool
+
+class TaskOccurrenceComplete(BaseModel):
+    occurrence: datetime
+
+    @validator('occurrence')
+    def normalize_datetime_to_utc(cls, v):
+        if v.tzinfo:
+            return v.astimezone(timezone.utc).replace(tzinfo=None)
+        return v
+
+class TaskBulkResult(BaseModel):
+    # Per-id outcome: 'updated', 'deleted' or 'not_found' (missing or not owned)
+    results: Dict[int, str]
+
 class HabitBase(BaseModel):
     name: str
     description: Optional[str] = None
@@ -63,7 +126,11 @@ class HabitBase(BaseModel):
         return v
 
 class HabitCreate(HabitBase):
-    pass
+    @validator('strategy_params')
+    def validate_strategy(cls, v, values):
+        if 'strategy_type' in values:
+            build_strategy(values['strategy_type'], v, values.get('start_date'))
+        return v
 
 class HabitSchema(HabitBase):
     id: int
@@ -72,6 +139,55 @@ class HabitSchema(HabitBase):
     class Config:
         from_attributes = True
 
+class HabitDashboardItem(BaseModel):
+    habit: HabitSchema
+    logs: dict[date, bool | list[bool]]
+    # Days of the range on which the habit can be logged, per its strategy
+    log_dates: List[date] = []
+
+    class Config:
+        from_attributes = True
+
+class HabitGridSchema(BaseModel):
+    """A habit's status grid in compact form, see app/services/habit_grid.py.
+
+    Slot k is day k // frequency after start_date, log index k % frequency.
+    bitmap: base64 bytes, slot k is bit k % 8 of byte k // 8.
+    runs: alternating not-done/done run lengths, starting with not-done.
+    """
+    habit_id: int
+    start_date: date
+    end_date: date
+    frequency: int
+    done: int
+    encoding: Literal['bitmap', 'rle']
+    bitmap: Optional[str] = None
+    runs: Optional[List[int]] = None
+
+class HabitStatsSchema(BaseModel):
+    habit_id: int
+    name: Optional[str] = None
+    completed_days: int
+    required_days: int
+    completion_rate: float
+    current_streak: int
+    longest_streak: int
+    last_completed: Optional[date] = None
+    next_due: Optional[date] = None
+
+class HabitHeatmapDay(BaseModel):
+    date: date
+    # Due dates of all habits on this day, and how many of them are complete
+    required: int
+    done: int
+    # done / required, None when nothing is due
+    ratio: Optional[float] = None
+
+class HabitHeatmapSchema(BaseModel):
+    year: int
+    habits: int
+    days: List[HabitHeatmapDay]
+
 class MovieBase(BaseModel):
     title: str
     genre: Optional[str] = None
@@ -88,6 +204,13 @@ class MovieSchema(MovieBase):
     class Config:
         from_attributes = True
 
+class MovieListItem(BaseModel):
+    """The movie columns list views render, requested from GET /movies/ with fields=."""
+    id: int
+    title: str
+    genre: Optional[str] = None
+    rating: Optional[int] = None
+
 class PersonBase(BaseModel):
     firstname: str
     lastname: Optional[str] = None
@@ -114,3 +237,15 @@ class UserTelegramUpdate(BaseModel):
 class UserTelegramSendMessage(BaseModel):
     chat_id: str
     message: str
+
+
+# List adapters are costly to build, so they are created once and shared by
+# the API and the frontend (e.g. TASK_LIST_ADAPTER.validate_json(response.content))
+TASK_LIST_ADAPTER = TypeAdapter(List[TaskSchema])
+TASK_LIST_ITEM_ADAPTER = TypeAdapter(List[TaskListItem])
+TASK_OCCURRENCE_LIST_ADAPTER = TypeAdapter(List[TaskOccurrenceSchema])
+MOVIE_LIST_ADAPTER = TypeAdapter(List[MovieSchema])
+MOVIE_LIST_ITEM_ADAPTER = TypeAdapter(List[MovieListItem])
+HABIT_DASHBOARD_ADAPTER = TypeAdapter(List[HabitDashboardItem])
+HABIT_STATS_LIST_ADAPTER = TypeAdapter(List[HabitStatsSchema])
+USER_LIST_ADAPTER = TypeAdapter(List[UserSchema])
@@ -0,0 +1,100 @@
+from sqlalchemy import ColumnElement, select, insert, update, delete, literal
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import Task, TaskArchive, TaskStatus
+from config import Config
+from datetime import datetime, timedelta
+from typing import List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+CLOSED_STATUSES = (TaskStatus.DONE, TaskStatus.ARCHIVED)
+# Columns both tiers share; rows move between them with INSERT ... SELECT
+TASK_TIER_COLUMNS = [column.key for column in Task.__table__.columns]
+
+
+class ArchiveService:
+    @staticmethod
+    def stamp_closed_tasks(db: Session, now: datetime):
+        """Starts the archive clock for newly closed tasks and stops it for reopened ones."""
+        db.execute(
+            update(Task)
+            .where(Task.status.in_(CLOSED_STATUSES), Task.closed_at.is_(None))
+            .values(closed_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        db.execute(
+            update(Task)
+            .where(Task.closed_at.is_not(None), Task.status.not_in(CLOSED_STATUSES))
+            .values(closed_at=None)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+
+    @staticmethod
+    def archive_closed_tasks(db: Session, now: Optional[datetime] = None,
+                             older_than_days: int = Config.TASK_ARCHIVE_AFTER_DAYS,
+                             batch_size: int = Config.TASK_ARCHIVE_BATCH_SIZE) -> int:
+        """Moves tasks closed for longer than older_than_days into task_archive, one transaction per batch."""
+        now = now or datetime.utcnow()
+        ArchiveService.stamp_closed_tasks(db, now)
+        cutoff = now - timedelta(days=older_than_days)
+        hot_columns = [Task.__table__.c[key] for key in TASK_TIER_COLUMNS]
+
+        moved = 0
+        while True:
+            ids = db.scalars(
+                select(Task.id)
+                .where(Task.closed_at <= cutoff, Task.status.in_(CLOSED_STATUSES))
+                .order_by(Task.id)
+                .limit(batch_size)
+            ).all()
+            if not ids:
+                break
+            db.execute(
+                insert(TaskArchive).from_select(
+                    TASK_TIER_COLUMNS + ['archived_at'],
+                    select(*hot_columns, literal(now)).where(Task.id.in_(ids)),
+                )
+            )
+            db.execute(delete(Task).where(Task.id.in_(ids)).execution_options(synchronize_session=False))
+            db.commit()
+            moved += len(ids)
+        if moved:
+            logger.info(f"Archived {moved} closed tasks (closed before {cutoff:%Y-%m-%d %H:%M})")
+        return moved
+
+    @staticmethod
+    async def get_archived_task(db: AsyncSession, task_id: int) -> Optional[TaskArchive]:
+        return await db.get(TaskArchive, task_id)
+
+    @staticmethod
+    async def restore_tasks(db: AsyncSession, task_ids: List[int], user_id: Optional[int] = None) -> List[int]:
+        """Moves archived tasks (of user_id, if given) back to the hot table in the
+        caller's transaction; returns the ids that were restored.
+
+        closed_at is reset, so a task that stays closed gets a full grace period again.
+        """
+        conditions: List[ColumnElement[bool]] = [TaskArchive.id.in_(task_ids)]
+        if user_id is not None:
+            conditions.append(TaskArchive.user_id == user_id)
+        restored = list((await db.scalars(select(TaskArchive.id).where(*conditions))).all())
+        if restored:
+            columns = [key for key in TASK_TIER_COLUMNS if key != 'closed_at']
+            await db.execute(
+                insert(Task).from_select(
+                    columns,
+                    select(*[TaskArchive.__table__.c[key] for key in columns]).where(TaskArchive.id.in_(restored)),
+                )
+            )
+            await db.execute(delete(TaskArchive).where(TaskArchive.id.in_(restored)))
+        return restored
+
+    @staticmethod
+    async def restore_task(db: AsyncSession, task_id: int) -> Optional[Task]:
+        """Moves an archived task back to the hot table, e.g. before it is edited."""
+        if not await ArchiveService.restore_tasks(db, [task_id]):
+            return None
+        await db.commit()
+        return await db.get(Task, task_id)
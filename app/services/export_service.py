@@ -0,0 +1,81 @@
+from sqlalchemy import select
+from app.database import AsyncSessionLocal
+from typing import AsyncIterator, List
+from datetime import date, datetime
+import csv
+import enum
+import io
+import json
+
+EXPORT_FORMATS = {
+    'json': 'application/json; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+    'csv': 'text/csv; charset=utf-8',
+}
+EXPORT_BATCH_SIZE = 500
+# Internal bookkeeping columns that are not part of an export
+NON_EXPORTABLE_FIELDS = {'user_id', 'closed_at', 'recurrence_start', 'next_occurrence'}
+
+
+def _to_jsonable(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+class ExportService:
+    @staticmethod
+    def exportable_fields(model) -> List[str]:
+        return [column.key for column in model.__table__.columns if column.key not in NON_EXPORTABLE_FIELDS]
+
+    @staticmethod
+    async def stream_rows(models: List, user_id: int, fields: List[str], batch_size: int = EXPORT_BATCH_SIZE) -> AsyncIterator[List[dict]]:
+        """Yields batches of the user's rows from each model (e.g. both task tiers) in turn,
+        selecting only the requested columns.
+
+        Uses its own session because the generator outlives the request handler.
+        """
+        async with AsyncSessionLocal() as db:
+            for model in models:
+                columns = [getattr(model, field) for field in fields]
+                stmt = (
+                    select(*columns)
+                    .where(model.user_id == user_id)
+                    .order_by(model.id)
+                    .execution_options(yield_per=batch_size)
+                )
+                result = await db.stream(stmt)
+                async for partition in result.partitions():
+                    yield [
+                        {field: _to_jsonable(value) for field, value in zip(fields, row)}
+                        for row in partition
+                    ]
+
+    @staticmethod
+    async def encode(batches: AsyncIterator[List[dict]], fields: List[str], export_format: str) -> AsyncIterator[str]:
+        """Encodes row batches chunk by chunk as a JSON array, NDJSON or CSV."""
+        if export_format == 'csv':
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=fields)
+            writer.writeheader()
+            yield buffer.getvalue()
+            async for batch in batches:
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerows(batch)
+                yield buffer.getvalue()
+        elif export_format == 'ndjson':
+            async for batch in batches:
+                yield ''.join(json.dumps(row, ensure_ascii=False) + '\n' for row in batch)
+        else:
+            yield '['
+            first = True
+            async for batch in batches:
+                if not batch:
+                    continue
+                chunk = ','.join(json.dumps(row, ensure_ascii=False) for row in batch)
+                yield chunk if first else ',' + chunk
+                first = False
+            yield ']'
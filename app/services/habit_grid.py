@@ -0,0 +1,107 @@
+from datetime import date
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+import base64
+import re
+
+_RUN_RE = re.compile(r'0+|1+')
+
+
+@lru_cache(maxsize=None)
+def _spread_table(stride: int) -> List[int]:
+    """For every byte value, its bits moved from position b to b * stride."""
+    return [sum(1 << (bit * stride) for bit in range(8) if byte >> bit & 1) for byte in range(256)]
+
+
+def _spread(mask: int, stride: int) -> int:
+    table, value, shift = _spread_table(stride), 0, 0
+    while mask:
+        value |= table[mask & 0xFF] << shift
+        mask >>= 8
+        shift += 8 * stride
+    return value
+
+
+class HabitGrid:
+    """Done/not-done status of every (day, index) slot of a habit over a date range.
+
+    Stored as one bitset: slot = day_offset * frequency + index, bit k of the
+    bitmap is bit (k % 8) of byte k // 8. Built in a single pass over the log
+    rows, so multi-year ranges cost one bit per slot instead of a dict entry
+    per day.
+    """
+
+    __slots__ = ('start_date', 'days', 'frequency', 'bitmap')
+
+    def __init__(self, start_date: date, days: int, frequency: int = 1, bitmap: Optional[bytearray] = None):
+        self.start_date = start_date
+        self.days = days
+        self.frequency = frequency
+        self.bitmap = bitmap if bitmap is not None else bytearray((days * frequency + 7) // 8)
+
+    @property
+    def slots(self) -> int:
+        return self.days * self.frequency
+
+    @classmethod
+    def from_done(cls, done: Iterable[Tuple[date, int]], start_date: date, end_date: date,
+                  frequency: int = 1) -> 'HabitGrid':
+        """done: (date, index) of every done log; slots outside the range or frequency are ignored."""
+        grid = cls(start_date, (end_date - start_date).days + 1, frequency)
+        bitmap, start_ordinal, slots = grid.bitmap, start_date.toordinal(), grid.slots
+        for day, index in done:
+            if not 0 <= index < frequency:
+                continue
+            slot = (day.toordinal() - start_ordinal) * frequency + index
+            if 0 <= slot < slots:
+                bitmap[slot >> 3] |= 1 << (slot & 7)
+        return grid
+
+    @classmethod
+    def from_month_masks(cls, masks: Iterable[Tuple[date, int, int]], start_date: date, end_date: date,
+                         frequency: int = 1) -> 'HabitGrid':
+        """masks: (month, index, done_mask) rows of habit_log_month, bit d - 1 of done_mask being day d.
+
+        Each month mask is spread to the slot stride and shifted into place
+        whole, so the cost is per month row rather than per done slot.
+        """
+        grid = cls(start_date, (end_date - start_date).days + 1, frequency)
+        start_ordinal, value = start_date.toordinal(), 0
+        for month, index, mask in masks:
+            if not 0 <= index < frequency:
+                continue
+            bits = _spread(mask, frequency) if frequency > 1 else mask
+            shift = (month.toordinal() - start_ordinal) * frequency + index
+            value |= bits << shift if shift >= 0 else bits >> -shift
+        value &= (1 << grid.slots) - 1
+        grid.bitmap = bytearray(value.to_bytes(len(grid.bitmap), 'little'))
+        return grid
+
+    def bit_string(self) -> str:
+        """'0'/'1' per slot, in slot order."""
+        if not self.slots:
+            return ''
+        return format(int.from_bytes(self.bitmap, 'little'), f'0{len(self.bitmap) * 8}b')[::-1][:self.slots]
+
+    def to_dict(self) -> Dict[date, Union[bool, List[bool]]]:
+        """The dates-with-status format: {day: bool}, or {day: [bool] * frequency} for frequency > 1."""
+        flags = list(map('1'.__eq__, self.bit_string()))
+        first = self.start_date.toordinal()
+        days = map(date.fromordinal, range(first, first + self.days))
+        if self.frequency == 1:
+            return dict(zip(days, flags))
+        step = self.frequency
+        return dict(zip(days, (flags[i:i + step] for i in range(0, len(flags), step))))
+
+    def to_base64(self) -> str:
+        return base64.b64encode(self.bitmap).decode()
+
+    def to_runs(self) -> List[int]:
+        """Run-length encoding: alternating run lengths of not-done and done slots, starting with not-done."""
+        bits = self.bit_string()
+        runs = [0] if bits.startswith('1') else []
+        runs.extend(len(run) for run in _RUN_RE.findall(bits))
+        return runs
+
+    def done_count(self) -> int:
+        return bin(int.from_bytes(self.bitmap, 'little')).count('1')
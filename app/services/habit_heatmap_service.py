@@ -0,0 +1,154 @@
+from sqlalchemy import select, and_
+from app.models import Habit, HabitLogMonth
+from app.cache import LRUCache
+from app.schemas import HabitHeatmapSchema
+from app.services.habit_log_store import complete_days_from_masks, iter_days, month_start, range_mask
+from app.services.habit_strategies import get_habit_strategy
+from config import Config
+from datetime import date, datetime, timedelta
+from itertools import count
+from typing import Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Widest week a due date's logs can reach back from it (times_per_week)
+UNIT_LOOKBACK_DAYS = 6
+
+
+def _as_date(value) -> Optional[date]:
+    return value.date() if isinstance(value, datetime) else value
+
+
+class HabitHeatmapCache:
+    """Serialized heatmaps per (user, year), in this process.
+
+    Each user has one entry holding all their cached years, so editing a
+    habit can drop every year at once. Invalidation also moves the user to a
+    new generation; a heatmap computed before that is not stored. Other
+    processes never see these invalidations, so the TTL bounds how stale
+    their copies get; a TTL of 0 turns the cache off.
+    """
+
+    def __init__(self, max_size: int, ttl: int):
+        self.ttl = ttl
+        self._users = LRUCache(max_size, ttl)  # user_id -> (generation, {year: payload})
+        self._generations = count(1)
+
+    def get(self, user_id: int, year: int) -> Tuple[Optional[bytes], Optional[int]]:
+        """The cached payload, if any, and the generation to pass to set()."""
+        entry = self._users.get(user_id)
+        if entry is None:
+            return None, None
+        generation, years = entry
+        return years.get(year), generation
+
+    def set(self, user_id: int, year: int, payload: bytes, generation: Optional[int]):
+        if self.ttl <= 0:
+            return
+        entry = self._users.get(user_id)
+        current, years = entry if entry else (None, {})
+        if current != generation:
+            return
+        self._users.set(user_id, (generation, {**years, year: payload}))
+
+    def invalidate(self, user_id: int, year: Optional[int] = None):
+        """Drops one year of the user's heatmaps, or all of them when year is None."""
+        entry = self._users.get(user_id)
+        years = entry[1] if entry and year is not None else {}
+        self._users.set(user_id, (next(self._generations), {y: p for y, p in years.items() if y != year}))
+
+    def clear(self):
+        self._users.clear()
+
+    def report_workers(self, workers: int):
+        """Warns at API startup when other workers cannot see this cache's invalidations."""
+        if workers > 1 and self.ttl > 0:
+            logger.warning(
+                f"Habit heatmap cache is per-process with {workers} API workers: a habit log handled by one "
+                f"worker shows on heatmaps served by the others only after up to {self.ttl}s. "
+                f"Set HABIT_HEATMAP_CACHE_TTL=0 to disable it."
+            )
+
+
+heatmap_cache = HabitHeatmapCache(
+    max_size=Config.HABIT_HEATMAP_CACHE_MAX_SIZE,
+    ttl=Config.HABIT_HEATMAP_CACHE_TTL,
+)
+
+
+class HabitHeatmapService:
+    """Per-day completion across all of a user's habits for one year.
+
+    A day's required count is the number of habits due on it, its done count
+    the number of those due dates completed, each per the habit's strategy
+    (times_per_week habits are due on the Sunday closing each week). The
+    user's habits and their packed log months come from one joined query;
+    the per-day sums are then bit operations over those masks.
+    """
+
+    @staticmethod
+    def query(user_id: int, year: int):
+        """(Habit, month, index, done_mask) rows, months None for habits without logs in the year."""
+        start, end = date(year, 1, 1), date(year, 12, 31)
+        return (
+            select(Habit, HabitLogMonth.month, HabitLogMonth.index, HabitLogMonth.done_mask)
+            .outerjoin(HabitLogMonth, and_(
+                HabitLogMonth.habit_id == Habit.id,
+                HabitLogMonth.month >= month_start(start - timedelta(days=UNIT_LOOKBACK_DAYS)),
+                HabitLogMonth.month <= end,
+                HabitLogMonth.done_mask != 0,
+            ))
+            .where(Habit.user_id == user_id)
+            .order_by(Habit.id)
+        )
+
+    @staticmethod
+    def build(rows, year: int) -> Dict:
+        start, end = date(year, 1, 1), date(year, 12, 31)
+        first = start.toordinal()
+        required = [0] * (end.toordinal() - first + 1)
+        done = [0] * len(required)
+        months = [date(year, month, 1) for month in range(1, 13)]
+
+        masks_by_habit: Dict[Habit, List[Tuple[date, int, int]]] = {}
+        for habit, month, index, mask in rows:
+            masks = masks_by_habit.setdefault(habit, [])
+            if month is not None:
+                masks.append((month, index, mask))
+
+        for habit, masks in masks_by_habit.items():
+            strategy = get_habit_strategy(habit, strict=False)
+            habit_start, habit_end = _as_date(habit.start_date), _as_date(habit.end_date)
+            low = max(start, habit_start) if habit_start else start
+            high = min(end, habit_end) if habit_end else end
+            if high < low:
+                continue
+
+            for month in months:
+                for day in iter_days(month, strategy.due_mask(month) & range_mask(month, low, high)):
+                    required[day.toordinal() - first] += 1
+
+            log_start, log_end = strategy.unit_window(low, high)
+            complete = complete_days_from_masks(masks, strategy.frequency, strategy.log_mask, log_start, log_end)
+            for unit in strategy.complete_units(complete):
+                if low <= unit <= high:
+                    done[unit.toordinal() - first] += 1
+
+        return {
+            'year': year,
+            'habits': len(masks_by_habit),
+            'days': [
+                {
+                    'date': date.fromordinal(first + offset),
+                    'required': required[offset],
+                    'done': done[offset],
+                    'ratio': done[offset] / required[offset] if required[offset] else None,
+                }
+                for offset in range(len(required))
+            ],
+        }
+
+    @staticmethod
+    def dump_json(heatmap: Dict) -> bytes:
+        return HabitHeatmapSchema.model_validate(heatmap).model_dump_json().encode()
@@ -0,0 +1,151 @@
+from sqlalchemy import Table, select, update, delete, bindparam
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.models import HabitLogMonth
+from datetime import date
+from functools import reduce
+from operator import and_
+from typing import Callable, Collection, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+# Day d of a month is bit d - 1, so a month fits in 31 bits
+MONTH_BITS = 31
+
+# INSERT ... ON CONFLICT constructs per database dialect
+UPSERT_INSERTS: Dict[str, Callable[[Table], Union[sqlite.Insert, postgresql.Insert]]] = {
+    'sqlite': sqlite.insert,
+    'postgresql': postgresql.insert,
+}
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def day_bit(day: date) -> int:
+    return 1 << (day.day - 1)
+
+
+def iter_days(month: date, mask: int) -> Iterator[date]:
+    """Days of `month` whose bit is set in `mask`, in order."""
+    before_first = month.toordinal() - 1
+    while mask:
+        low = mask & -mask
+        yield date.fromordinal(before_first + low.bit_length())
+        mask ^= low
+
+
+def range_mask(month: date, start: Optional[date], end: Optional[date]) -> int:
+    """Bits of the days of `month` within [start, end]; None leaves that side open."""
+    low = max((start - month).days, 0) if start else 0
+    high = min((end - month).days, MONTH_BITS - 1) if end else MONTH_BITS - 1
+    if high < low:
+        return 0
+    return ((1 << (high + 1)) - 1) & ~((1 << low) - 1)
+
+
+def complete_days_from_masks(masks: Iterable[Tuple[date, int, int]], frequency: int, log_mask: Callable[[date], int],
+                             start: Optional[date] = None, end: Optional[date] = None) -> Set[date]:
+    """Days within log_mask(month) and [start, end] done in all slots 0..frequency-1, from (month, index, done_mask) rows."""
+    masks_by_month: Dict[date, List[int]] = {}
+    for month, index, mask in masks:
+        if 0 <= index < frequency:
+            masks_by_month.setdefault(month, []).append(mask)
+
+    days: Set[date] = set()
+    for month, month_masks in masks_by_month.items():
+        # A month missing one of the indexes has no complete day
+        if len(month_masks) < frequency:
+            continue
+        complete = reduce(and_, month_masks) & log_mask(month) & range_mask(month, start, end)
+        days.update(iter_days(month, complete))
+    return days
+
+
+class HabitLogStore:
+    """Packed habit log storage: one habit_log_month row per habit, month and index.
+
+    A toggle is a single bitwise upsert of done_mask; reads fetch a handful of
+    masks per habit and decode them with bit operations. Not-done and missing
+    slots are the same thing, so only done slots are stored.
+    """
+
+    @staticmethod
+    def done_masks_query(habit_ids: Collection[int], start_date: date, end_date: date):
+        """(habit_id, month, index, done_mask) of the non-empty months overlapping the range."""
+        return select(HabitLogMonth.habit_id, HabitLogMonth.month, HabitLogMonth.index, HabitLogMonth.done_mask).where(
+            HabitLogMonth.habit_id.in_(habit_ids),
+            HabitLogMonth.month >= month_start(start_date),
+            HabitLogMonth.month <= end_date,
+            HabitLogMonth.done_mask != 0,
+        )
+
+    @staticmethod
+    def set_done(db: Session, habit_id: int, day: date, index: int, is_done: bool):
+        HabitLogStore.set_many(db, [(habit_id, day, index, is_done)])
+
+    @staticmethod
+    def set_many(db: Session, entries: Iterable[Tuple[int, date, int, bool]]):
+        """Applies (habit_id, day, index, is_done) entries, later ones winning for the same slot.
+
+        Entries are folded into set and clear bits per month row first, so the
+        whole batch is one upsert OR-ing in the set bits and one executemany
+        UPDATE masking out the cleared ones.
+        """
+        changes: Dict[Tuple[int, date, int], List[int]] = {}
+        for habit_id, day, index, is_done in entries:
+            bits, bit = changes.setdefault((habit_id, month_start(day), index), [0, 0]), day_bit(day)
+            if is_done:
+                bits[0], bits[1] = bits[0] | bit, bits[1] & ~bit
+            else:
+                bits[0], bits[1] = bits[0] & ~bit, bits[1] | bit
+
+        table = HabitLogMonth.__table__
+        set_rows = [
+            {'habit_id': habit_id, 'month': month, 'index': index, 'done_mask': set_bits}
+            for (habit_id, month, index), (set_bits, _) in changes.items() if set_bits
+        ]
+        if set_rows:
+            dialect = db.get_bind().dialect.name
+            if dialect not in UPSERT_INSERTS:
+                raise ValueError(f"No upsert configured for database dialect: {dialect}")
+            insert = UPSERT_INSERTS[dialect](table)
+            db.execute(insert.on_conflict_do_update(
+                index_elements=['habit_id', 'month', 'index'],
+                set_={'done_mask': table.c.done_mask.bitwise_or(insert.excluded.done_mask)},
+            ), set_rows)
+
+        clear_rows = [
+            {'key_habit_id': habit_id, 'key_month': month, 'key_index': index, 'keep_mask': ~clear_bits}
+            for (habit_id, month, index), (_, clear_bits) in changes.items() if clear_bits
+        ]
+        if clear_rows:
+            db.execute(
+                update(table)
+                .where(
+                    table.c.habit_id == bindparam('key_habit_id'),
+                    table.c.month == bindparam('key_month'),
+                    table.c['index'] == bindparam('key_index'),
+                )
+                .values(done_mask=table.c.done_mask.bitwise_and(bindparam('keep_mask'))),
+                clear_rows,
+            )
+
+    @staticmethod
+    def complete_days(db: Session, habit_id: int, frequency: int, log_mask: Callable[[date], int],
+                      start: Optional[date] = None, end: Optional[date] = None) -> Set[date]:
+        """Days within log_mask(month) whose slots 0..frequency-1 are all done."""
+        stmt = select(HabitLogMonth.month, HabitLogMonth.index, HabitLogMonth.done_mask).where(
+            HabitLogMonth.habit_id == habit_id,
+            HabitLogMonth.index >= 0,
+            HabitLogMonth.index < frequency,
+            HabitLogMonth.done_mask != 0,
+        )
+        if start is not None:
+            stmt = stmt.where(HabitLogMonth.month >= month_start(start))
+        if end is not None:
+            stmt = stmt.where(HabitLogMonth.month <= end)
+        return complete_days_from_masks(db.execute(stmt), frequency, log_mask, start, end)
+
+    @staticmethod
+    def delete(db: Session, habit_id: int):
+        db.execute(delete(HabitLogMonth).where(HabitLogMonth.habit_id == habit_id))
@@ -1,92 +1,176 @@
+from sqlalchemy import select, delete
 from sqlalchemy.orm import Session
-from app.models import Habit, HabitLog
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import Habit
 from app.schemas import HabitCreate
-from app.services.habit_strategies import DailyStrategy, WeeklyStrategy
-from datetime import date, timedelta
+from app.services.habit_strategies import get_habit_strategy
+from app.services.habit_grid import HabitGrid
+from app.services.habit_heatmap_service import HabitHeatmapService, heatmap_cache
+from app.services.habit_log_store import HabitLogStore
+from app.services.habit_stats_service import HabitStatsService
+from app.services.projection_service import ProjectionService
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Widest range GET /habits/{id}/grid serves in one request (ten years)
+HABIT_GRID_MAX_DAYS = 3660
+# Entries accepted by one POST /habits/log/batch
+MAX_HABIT_LOG_BATCH = 1000
+
 
 class HabitService:
+    """Session-bound helpers shared with AsyncHabitService through run_sync."""
+
+    @staticmethod
+    def get_frequency(habit: Habit) -> int:
+        return get_habit_strategy(habit, strict=False).frequency
+
+    @staticmethod
+    def build_grid(habit: Habit, masks, start_date: date, end_date: date) -> HabitGrid:
+        """masks: (month, index, done_mask) rows of the habit's packed logs."""
+        return HabitGrid.from_month_masks(masks, start_date, end_date, HabitService.get_frequency(habit))
+
+    @staticmethod
+    def record_log(db: Session, habit: Habit, log_date: date, is_done: bool, index: int = 0):
+        """Sets one slot in the packed log and updates the habit's stats; the caller commits."""
+        was_complete = HabitStatsService.is_day_complete(db, habit, log_date)
+        HabitLogStore.set_done(db, habit.id, log_date, index, is_done)
+        HabitStatsService.apply_day_change(db, habit, log_date, was_complete)
+
+    @staticmethod
+    def record_log_batch(db: Session, habits: List[Habit], entries: Sequence[Tuple[int, date, int, bool]]):
+        """Applies (habit_id, date, index, is_done) entries of the given habits; the caller commits.
+
+        Several days may change at once, so each habit's stats are rebuilt
+        once instead of being adjusted day by day.
+        """
+        HabitLogStore.set_many(db, entries)
+        for habit in habits:
+            HabitStatsService.rebuild(db, habit)
+
+
+class AsyncHabitService:
+    """Habit operations for the FastAPI routers."""
+
     @staticmethod
-    def get_habits_by_user(db: Session, user_id: int):
-        return db.query(Habit).filter_by(user_id=user_id).all()
+    async def get_habits_by_user(db: AsyncSession, user_id: int, fields: Optional[List[str]] = None):
+        if fields:
+            stmt = select(*ProjectionService.columns(Habit, fields)).filter_by(user_id=user_id)
+            return [row._asdict() for row in (await db.execute(stmt)).all()]
+        return list((await db.scalars(select(Habit).filter_by(user_id=user_id))).all())
 
     @staticmethod
-    def create_habit(db: Session, habit_data: HabitCreate, user_id: int):
+    async def create_habit(db: AsyncSession, habit_data: HabitCreate, user_id: int):
         habit = Habit(**habit_data.model_dump(), user_id=user_id)
         db.add(habit)
-        db.commit()
-        db.refresh(habit)
+        await db.commit()
+        await db.refresh(habit)
+        heatmap_cache.invalidate(user_id)
         return habit
 
     @staticmethod
-    def get_habit(db: Session, habit_id: int):
-        return db.query(Habit).get(habit_id)
+    async def get_habit(db: AsyncSession, habit_id: int):
+        return await db.get(Habit, habit_id)
 
     @staticmethod
-    def update_habit(db: Session, habit_id: int, habit_data: HabitCreate):
-        habit = db.query(Habit).get(habit_id)
+    async def update_habit(db: AsyncSession, habit_id: int, habit_data: HabitCreate):
+        habit = await db.get(Habit, habit_id)
         if not habit:
             return None
         for field, value in habit_data.model_dump(exclude_unset=True).items():
             setattr(habit, field, value)
-        db.commit()
-        db.refresh(habit)
+        await db.run_sync(HabitStatsService.rebuild, habit)
+        await db.commit()
+        await db.refresh(habit)
+        if habit.user_id is not None:
+            heatmap_cache.invalidate(habit.user_id)
         return habit
 
     @staticmethod
-    def delete_habit(db: Session, habit_id: int):
-        habit = db.query(Habit).get(habit_id)
-        if habit:
-            db.delete(habit)
-            db.commit()
+    async def delete_habit(db: AsyncSession, habit_id: int):
+        user_id = await db.scalar(select(Habit.user_id).where(Habit.id == habit_id))
+        await db.run_sync(HabitLogStore.delete, habit_id)
+        await db.run_sync(HabitStatsService.delete, habit_id)
+        await db.execute(delete(Habit).where(Habit.id == habit_id))
+        await db.commit()
+        if user_id is not None:
+            heatmap_cache.invalidate(user_id)
 
     @staticmethod
-    def get_habit_logs(db: Session, habit_id: int, start_date: date, end_date: date):
-        return db.query(HabitLog).filter(
-            HabitLog.habit_id == habit_id,
-            HabitLog.date >= start_date,
-            HabitLog.date <= end_date
-        ).all()
+    async def get_habit_grid(db: AsyncSession, habit: Habit, start_date: date, end_date: date) -> HabitGrid:
+        rows = (await db.execute(HabitLogStore.done_masks_query([habit.id], start_date, end_date))).all()
+        return HabitService.build_grid(habit, [(month, index, mask) for _, month, index, mask in rows], start_date, end_date)
 
     @staticmethod
-    def get_strategy(habit: Habit):
-        if habit.strategy_type == 'daily':
-            return DailyStrategy()
-        elif habit.strategy_type == 'weekly':
-            return WeeklyStrategy(habit.strategy_params['day_of_week'])
-        else:
-            raise ValueError(f"Unknown strategy type: {habit.strategy_type}")
+    async def get_habit_dates_with_status(db: AsyncSession, habit_id: int, start_date: date, end_date: date):
+        habit = await db.get(Habit, habit_id)
+        if not habit:
+            return {}
+        return (await AsyncHabitService.get_habit_grid(db, habit, start_date, end_date)).to_dict()
 
     @staticmethod
-    def get_habit_dates_with_status(db: Session, habit_id: int, start_date: date, end_date: date):
-        habit = db.query(Habit).get(habit_id)
+    async def get_habits_dashboard(db: AsyncSession, user_id: int, start_date: date, end_date: date):
+        habits = await AsyncHabitService.get_habits_by_user(db, user_id)
+        if not habits:
+            return []
+
+        masks_by_habit: Dict[int, List[Tuple[date, int, int]]] = {habit.id: [] for habit in habits}
+        stmt = HabitLogStore.done_masks_query(masks_by_habit.keys(), start_date, end_date)
+        for habit_id, month, index, mask in await db.execute(stmt):
+            masks_by_habit[habit_id].append((month, index, mask))
+
+        return [
+            {
+                "habit": habit,
+                "logs": HabitService.build_grid(habit, masks_by_habit[habit.id], start_date, end_date).to_dict(),
+                "log_dates": get_habit_strategy(habit, strict=False).log_dates(start_date, end_date),
+            }
+            for habit in habits
+        ]
+
+    @staticmethod
+    async def log_habit(db: AsyncSession, habit_id: int, log_date: date, is_done: bool, index: int = 0):
+        # The log and stats bookkeeping is shared with HabitService through run_sync
+        habit = await db.get(Habit, habit_id)
         if not habit:
-            return {}
-        logs = HabitService.get_habit_logs(db, habit_id, start_date, end_date)
-        log_dates = {(log.date, log.index): log.is_done for log in logs}
-        dates_with_status = {}
-        delta = end_date - start_date
-
-        frequency = 1
-        if habit.strategy_type == 'daily' and habit.strategy_params and 'frequency' in habit.strategy_params:
-            frequency = habit.strategy_params['frequency']
-
-        for i in range(delta.days + 1):
-            day = start_date + timedelta(days=i)
-            if frequency > 1:
-                dates_with_status[day] = [log_dates.get((day, j), False) for j in range(frequency)]
-            else:
-                dates_with_status[day] = log_dates.get((day, 0), False)
-        return dates_with_status
-
-    @staticmethod
-    def log_habit(db: Session, habit_id: int, log_date: date, is_done: bool, index: int = 0):
-        log = db.query(HabitLog).filter_by(habit_id=habit_id, date=log_date, index=index).first()
-        if log:
-            log.is_done = is_done
-        else:
-            log = HabitLog(habit_id=habit_id, date=log_date, is_done=is_done, index=index)
-            db.add(log)
-        db.commit()
-        db.refresh(log)
-        return log
+            return
+        await db.run_sync(HabitService.record_log, habit, log_date, is_done, index)
+        await db.commit()
+        if habit.user_id is not None:
+            heatmap_cache.invalidate(habit.user_id, log_date.year)
 
+    @staticmethod
+    async def log_habit_batch(db: AsyncSession, user_id: int, entries: Sequence[Tuple[int, date, int, bool]]) -> List[int]:
+        """Logs the entries of the user's habits in one transaction; returns the habit ids that matched."""
+        habit_ids = {habit_id for habit_id, _, _, _ in entries}
+        habits = list((await db.scalars(select(Habit).where(Habit.user_id == user_id, Habit.id.in_(habit_ids)))).all())
+        if not habits:
+            return []
+        owned = {habit.id for habit in habits}
+        owned_entries = [entry for entry in entries if entry[0] in owned]
+        await db.run_sync(HabitService.record_log_batch, habits, owned_entries)
+        await db.commit()
+        for year in {log_date.year for _, log_date, _, _ in owned_entries}:
+            heatmap_cache.invalidate(user_id, year)
+        return list(owned)
+
+    @staticmethod
+    async def get_heatmap(db: AsyncSession, user_id: int, year: int) -> bytes:
+        payload, generation = heatmap_cache.get(user_id, year)
+        if payload is None:
+            rows = (await db.execute(HabitHeatmapService.query(user_id, year))).all()
+            payload = HabitHeatmapService.dump_json(HabitHeatmapService.build(rows, year))
+            heatmap_cache.set(user_id, year, payload, generation)
+        return payload
+
+    @staticmethod
+    async def get_habit_stats(db: AsyncSession, habit: Habit) -> dict:
+        stats = await db.run_sync(HabitStatsService.get_stats, habit)
+        await db.commit()
+        return HabitStatsService.summarize(habit, stats)
+
+    @staticmethod
+    async def get_user_habit_stats(db: AsyncSession, user_id: int) -> List[dict]:
+        rows = await db.run_sync(HabitStatsService.get_user_stats, user_id)
+        await db.commit()
+        return [HabitStatsService.summarize(habit, stats) for habit, stats in rows]
@@ -0,0 +1,216 @@
+from sqlalchemy import select, delete
+from sqlalchemy.orm import Session
+from app.models import Habit, HabitStats
+from app.services.habit_log_store import HabitLogStore
+from app.services.habit_strategies import HabitStrategy, get_habit_strategy
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+# Due dates checked per log query while walking a streak outwards from an edited day
+STREAK_SCAN_WINDOW = 120
+
+
+def _strategy(habit: Habit) -> HabitStrategy:
+    # Habits without a valid schedule have nothing due and keep zeroed stats
+    return get_habit_strategy(habit, strict=False)
+
+
+class HabitStatsService:
+    """Streak and completion aggregates per habit, kept in habit_stats.
+
+    Everything is counted in the due dates of the habit's strategy. A due
+    date is complete when its logs are: all frequency slots of the day, or,
+    for times_per_week, enough days of its week. log_habit adjusts the row
+    for the edited due date only: it walks the neighbouring streaks outwards,
+    and falls back to a full rebuild only when a date is removed from the
+    longest streak.
+    """
+
+    @staticmethod
+    def _complete_units(db: Session, habit: Habit, start: Optional[date] = None,
+                        end: Optional[date] = None) -> Set[date]:
+        """Complete due dates in [start, end]; None leaves that side open."""
+        strategy = _strategy(habit)
+        log_start, log_end = strategy.unit_window(start, end)
+        days = HabitLogStore.complete_days(db, habit.id, strategy.frequency, strategy.log_mask, log_start, log_end)
+        return {
+            unit for unit in strategy.complete_units(days)
+            if (start is None or unit >= start) and (end is None or unit <= end)
+        }
+
+    @staticmethod
+    def is_day_complete(db: Session, habit: Habit, day: date) -> bool:
+        """Whether the due date a log on `day` counts towards is complete."""
+        unit = _strategy(habit).unit_of(day)
+        return unit is not None and unit in HabitStatsService._complete_units(db, habit, unit, unit)
+
+    @staticmethod
+    def _walk(db: Session, habit: Habit, unit: date, step: int) -> Tuple[int, Optional[date]]:
+        """Length and far end of the run of complete due dates next to `unit` (excluded), walking forwards for step 1."""
+        strategy = _strategy(habit)
+        if step > 0:
+            advance = lambda day: strategy.next_due(day + timedelta(days=1))
+        else:
+            advance = lambda day: strategy.previous_due(day - timedelta(days=1))
+
+        length, far_end, current = 0, None, unit
+        while True:
+            window: List[date] = []
+            for _ in range(STREAK_SCAN_WINDOW):
+                following = advance(window[-1] if window else current)
+                if following is None:
+                    break
+                window.append(following)
+            if not window:
+                return length, far_end
+            complete = HabitStatsService._complete_units(db, habit, min(window), max(window))
+            for candidate in window:
+                if candidate not in complete:
+                    return length, far_end
+                length, far_end = length + 1, candidate
+            current = window[-1]
+
+    @staticmethod
+    def _latest_complete_unit(db: Session, habit: Habit, before: date) -> Optional[date]:
+        complete = HabitStatsService._complete_units(db, habit, end=before - timedelta(days=1))
+        return max(complete) if complete else None
+
+    @staticmethod
+    def rebuild(db: Session, habit: Habit) -> HabitStats:
+        """Recomputes the habit's aggregates from its whole log history."""
+        strategy = _strategy(habit)
+        complete = sorted(HabitStatsService._complete_units(db, habit))
+        stats = db.get(HabitStats, habit.id) or HabitStats(habit_id=habit.id)
+        stats.completed_days = len(complete)
+        stats.current_streak, stats.current_streak_end = 0, None
+        stats.longest_streak, stats.longest_streak_end = 0, None
+
+        run, previous = 0, None
+        for unit in complete:
+            gap = strategy.count_due(previous + timedelta(days=1), unit - timedelta(days=1)) if previous else 0
+            run = run + 1 if previous and gap == 0 else 1
+            if run > stats.longest_streak:
+                stats.longest_streak, stats.longest_streak_end = run, unit
+            previous = unit
+        if previous:
+            stats.current_streak, stats.current_streak_end = run, previous
+        db.add(stats)
+        db.flush()
+        return stats
+
+    @staticmethod
+    def apply_day_change(db: Session, habit: Habit, day: date, was_complete: bool) -> HabitStats:
+        """Updates the aggregates after the logs of `day` changed; call it after flushing the change."""
+        stats = db.get(HabitStats, habit.id)
+        if stats is None:
+            return HabitStatsService.rebuild(db, habit)
+        strategy = _strategy(habit)
+        unit = strategy.unit_of(day)
+        if unit is None:
+            return stats
+        is_complete = unit in HabitStatsService._complete_units(db, habit, unit, unit)
+        if is_complete == was_complete:
+            return stats
+        previous_due = strategy.previous_due(unit - timedelta(days=1))
+
+        # Common case first: today's log extends or shortens the current
+        # streak, whose length is already known
+        if is_complete and stats.current_streak_end is not None and stats.current_streak_end == previous_due:
+            before = stats.current_streak
+            after, after_end = HabitStatsService._walk(db, habit, unit, 1)
+        elif not is_complete and stats.current_streak_end == unit:
+            before, after, after_end = stats.current_streak - 1, 0, None
+        else:
+            before, _ = HabitStatsService._walk(db, habit, unit, -1)
+            after, after_end = HabitStatsService._walk(db, habit, unit, 1)
+        run_end = after_end or unit
+
+        if is_complete:
+            stats.completed_days += 1
+            run = before + 1 + after
+            # Ties go to the earliest run, as in rebuild
+            longest_end = stats.longest_streak_end
+            if run > stats.longest_streak or (run == stats.longest_streak and longest_end and run_end < longest_end):
+                stats.longest_streak, stats.longest_streak_end = run, run_end
+            if stats.current_streak_end is None or run_end >= stats.current_streak_end:
+                stats.current_streak, stats.current_streak_end = run, run_end
+        else:
+            stats.completed_days -= 1
+            if stats.longest_streak_end == run_end and stats.longest_streak == before + 1 + after:
+                # The longest streak was split; any other run could be the longest now
+                return HabitStatsService.rebuild(db, habit)
+            if stats.current_streak_end == run_end:
+                if after:
+                    stats.current_streak = after
+                elif before:
+                    stats.current_streak, stats.current_streak_end = before, previous_due
+                else:
+                    latest = HabitStatsService._latest_complete_unit(db, habit, unit)
+                    if latest is None:
+                        stats.current_streak, stats.current_streak_end = 0, None
+                    else:
+                        length, _ = HabitStatsService._walk(db, habit, latest, -1)
+                        stats.current_streak, stats.current_streak_end = length + 1, latest
+        db.flush()
+        return stats
+
+    @staticmethod
+    def delete(db: Session, habit_id: int):
+        db.execute(delete(HabitStats).where(HabitStats.habit_id == habit_id))
+
+    @staticmethod
+    def summarize(habit: Habit, stats: HabitStats, today: Optional[date] = None) -> Dict:
+        """Read-time view of the stored aggregates; only the current streak depends on today."""
+        today = today or date.today()
+        strategy = _strategy(habit)
+        start = habit.start_date.date() if isinstance(habit.start_date, datetime) else habit.start_date
+        end_date = habit.end_date.date() if isinstance(habit.end_date, datetime) else habit.end_date
+        end = min(today, end_date) if end_date else today
+        required_days = strategy.count_due(start, end) if start else stats.completed_days
+
+        # A streak stays current until a due date after its end has fully passed
+        current_streak = 0
+        if stats.current_streak_end:
+            missed = strategy.count_due(stats.current_streak_end + timedelta(days=1), today - timedelta(days=1))
+            current_streak = stats.current_streak if missed == 0 else 0
+
+        next_due = strategy.next_due(today)
+        if next_due and end_date and next_due > end_date:
+            next_due = None
+
+        return {
+            'habit_id': habit.id,
+            'name': habit.name,
+            'completed_days': stats.completed_days,
+            'required_days': required_days,
+            'completion_rate': min(1.0, stats.completed_days / required_days) if required_days else 0.0,
+            'current_streak': current_streak,
+            'longest_streak': stats.longest_streak,
+            'last_completed': stats.current_streak_end,
+            'next_due': next_due,
+        }
+
+    @staticmethod
+    def get_stats(db: Session, habit: Habit) -> HabitStats:
+        return db.get(HabitStats, habit.id) or HabitStatsService.rebuild(db, habit)
+
+    @staticmethod
+    def get_user_stats(db: Session, user_id: int) -> List[Tuple[Habit, HabitStats]]:
+        """One joined read of the user's habits and their aggregates; missing rows are built on the way."""
+        rows = db.execute(
+            select(Habit, HabitStats).outerjoin(HabitStats, HabitStats.habit_id == Habit.id)
+            .where(Habit.user_id == user_id).order_by(Habit.id)
+        ).all()
+        return [(habit, stats or HabitStatsService.rebuild(db, habit)) for habit, stats in rows]
+
+    @staticmethod
+    def rebuild_all(db: Session, user_id: Optional[int] = None) -> int:
+        stmt = select(Habit).order_by(Habit.id)
+        if user_id is not None:
+            stmt = stmt.where(Habit.user_id == user_id)
+        count = 0
+        for habit in db.scalars(stmt).all():
+            HabitStatsService.rebuild(db, habit)
+            db.commit()
+            count += 1
+        return count
@@ -1,29 +1,360 @@
 from abc import ABC, abstractmethod
-from datetime import date, timedelta
+from collections import Counter
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Type
+import calendar
+import json
+
+ALL_WEEKDAYS = frozenset(range(7))
+# Distinct habit schedules whose strategy objects are kept
+STRATEGY_CACHE_SIZE = 1024
+# Default schedule anchor for habits without a start date
+DEFAULT_ANCHOR = date(2000, 1, 3)
+
+STRATEGIES: Dict[str, Type['HabitStrategy']] = {}
+
+
+def register_strategy(name: str):
+    """Class decorator adding a strategy to STRATEGIES under the habit's strategy_type."""
+    def decorator(cls):
+        cls.name = name
+        STRATEGIES[name] = cls
+        return cls
+    return decorator
+
+
+def _month_end(day: date) -> date:
+    return day.replace(day=calendar.monthrange(day.year, day.month)[1])
+
+
+def _full_month_mask(month: date) -> int:
+    return (1 << calendar.monthrange(month.year, month.month)[1]) - 1
+
+
+def _positive_int(params: dict, key: str, default: Optional[int] = None, maximum: Optional[int] = None) -> int:
+    value = params.get(key, default)
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1 or (maximum and value > maximum):
+        bound = f" between 1 and {maximum}" if maximum else " of at least 1"
+        raise ValueError(f"'{key}' must be an integer{bound}")
+    return value
+
 
 class HabitStrategy(ABC):
+    """When a habit is due, answered with date arithmetic only.
+
+    A strategy is due on dates. Fixed schedules are due on the days
+    themselves; quota schedules (times_per_week) are due once per period, on
+    its last day, and that period counts as done when enough of its days are.
+    No method walks the calendar one day at a time: counting, n-th and next
+    due dates are closed-form, and listing costs one step per due date.
+    """
+
+    name: Optional[str] = None
+
+    def __init__(self, frequency: int = 1):
+        self.frequency = frequency
+
+    @classmethod
     @abstractmethod
-    def get_required_dates(self, start_date: date, end_date: date) -> list[date]:
-        pass
-
-class DailyStrategy(HabitStrategy):
-    def get_required_dates(self, start_date: date, end_date: date) -> list[date]:
-        dates = []
-        current_date = start_date
-        while current_date <= end_date:
-            dates.append(current_date)
-            current_date += timedelta(days=1)
-        return dates
+    def from_params(cls, params: dict, anchor: date) -> 'HabitStrategy':
+        """Builds the strategy from Habit.strategy_params; raises ValueError on bad params."""
+
+    @abstractmethod
+    def next_due(self, day: date) -> Optional[date]:
+        """First due date on or after `day`."""
+
+    @abstractmethod
+    def previous_due(self, day: date) -> Optional[date]:
+        """Last due date on or before `day`."""
+
+    @abstractmethod
+    def count_due(self, start: date, end: date) -> int:
+        """Number of due dates in [start, end]."""
 
-class WeeklyStrategy(HabitStrategy):
-    def __init__(self, day_of_week: int):
-        self.day_of_week = day_of_week
-
-    def get_required_dates(self, start_date: date, end_date: date) -> list[date]:
-        dates = []
-        current_date = start_date
-        while current_date <= end_date:
-            if current_date.weekday() == self.day_of_week:
-                dates.append(current_date)
-            current_date += timedelta(days=1)
+    @abstractmethod
+    def nth_due(self, n: int, start: date) -> Optional[date]:
+        """The n-th due date (0-based) on or after `start`."""
+
+    @abstractmethod
+    def log_mask(self, month: date) -> int:
+        """Days of `month` whose logs count towards the schedule, bit d - 1 being day d."""
+
+    def due_mask(self, month: date) -> int:
+        """Due dates of `month` as a mask; the same days as log_mask for fixed schedules."""
+        return self.log_mask(month)
+
+    def is_due(self, day: date) -> bool:
+        return self.next_due(day) == day
+
+    def get_required_dates(self, start_date: date, end_date: date) -> List[date]:
+        dates, day = [], self.next_due(start_date)
+        while day is not None and day <= end_date:
+            dates.append(day)
+            day = self.next_due(day + timedelta(days=1))
         return dates
+
+    def log_dates(self, start_date: date, end_date: date) -> List[date]:
+        """Days in range on which the habit can be logged."""
+        return self.get_required_dates(start_date, end_date)
+
+    def unit_of(self, day: date) -> Optional[date]:
+        """The due date a log on `day` counts towards, if any."""
+        return day if self.is_due(day) else None
+
+    def unit_window(self, start: Optional[date], end: Optional[date]) -> Tuple[Optional[date], Optional[date]]:
+        """Days whose logs decide the due dates in [start, end]."""
+        return start, end
+
+    def complete_units(self, complete_days: Set[date]) -> Set[date]:
+        """Due dates done, given the fully logged days within log_mask."""
+        return complete_days
+
+
+class WeekdayStrategy(HabitStrategy):
+    """Due on a fixed set of weekdays (Monday=0)."""
+
+    def __init__(self, weekdays: Iterable[int], frequency: int = 1):
+        super().__init__(frequency)
+        self.weekdays = frozenset(weekdays)
+        self._offsets = [sorted((weekday - first) % 7 for weekday in self.weekdays) for first in range(7)]
+
+    def next_due(self, day: date) -> Optional[date]:
+        offsets = self._offsets[day.weekday()]
+        return day + timedelta(days=offsets[0]) if offsets else None
+
+    def previous_due(self, day: date) -> Optional[date]:
+        if not self.weekdays:
+            return None
+        back = min((day.weekday() - weekday) % 7 for weekday in self.weekdays)
+        return day - timedelta(days=back)
+
+    def count_due(self, start: date, end: date) -> int:
+        if end < start or not self.weekdays:
+            return 0
+        full_weeks, remainder = divmod((end - start).days + 1, 7)
+        first = start.weekday()
+        return full_weeks * len(self.weekdays) + sum(1 for i in range(remainder) if (first + i) % 7 in self.weekdays)
+
+    def nth_due(self, n: int, start: date) -> Optional[date]:
+        first = self.next_due(start)
+        if first is None:
+            return None
+        full_weeks, remainder = divmod(n, len(self.weekdays))
+        offsets = self._offsets[first.weekday()]
+        return first + timedelta(days=7 * full_weeks + offsets[remainder])
+
+    def log_mask(self, month: date) -> int:
+        first = month.weekday()
+        week = sum(1 << offset for offset in range(7) if (first + offset) % 7 in self.weekdays)
+        return (week | week << 7 | week << 14 | week << 21 | week << 28) & _full_month_mask(month)
+
+
+@register_strategy('daily')
+class DailyStrategy(WeekdayStrategy):
+    def __init__(self, frequency: int = 1):
+        super().__init__(ALL_WEEKDAYS, frequency)
+
+    @classmethod
+    def from_params(cls, params: dict, anchor: date) -> 'DailyStrategy':
+        return cls(_positive_int(params, 'frequency', 1))
+
+    def count_due(self, start: date, end: date) -> int:
+        return max((end - start).days + 1, 0)
+
+
+@register_strategy('weekly')
+class WeeklyStrategy(WeekdayStrategy):
+    """params: {"days": [0, 2, 4]}, or {"day_of_week": 0} for a single day."""
+
+    @classmethod
+    def from_params(cls, params: dict, anchor: date) -> 'WeeklyStrategy':
+        days = params.get('days')
+        if days is None and 'day_of_week' in params:
+            days = [params['day_of_week']]
+        if not isinstance(days, list) or not days or not all(
+                isinstance(day, int) and not isinstance(day, bool) and 0 <= day <= 6 for day in days):
+            raise ValueError("'days' must be a non-empty list of weekdays, Monday=0 to Sunday=6")
+        return cls(days, _positive_int(params, 'frequency', 1))
+
+
+@register_strategy('monthly')
+class MonthlyStrategy(HabitStrategy):
+    """params: {"day_of_month": 15}; days past the end of a month fall on its last day."""
+
+    def __init__(self, day_of_month: int, frequency: int = 1):
+        super().__init__(frequency)
+        self.day_of_month = day_of_month
+
+    @classmethod
+    def from_params(cls, params: dict, anchor: date) -> 'MonthlyStrategy':
+        return cls(_positive_int(params, 'day_of_month', maximum=31), _positive_int(params, 'frequency', 1))
+
+    def _due_in(self, month_index: int) -> date:
+        year, month = divmod(month_index, 12)
+        return date(year, month + 1, min(self.day_of_month, calendar.monthrange(year, month + 1)[1]))
+
+    @staticmethod
+    def _month_index(day: date) -> int:
+        return day.year * 12 + day.month - 1
+
+    def next_due(self, day: date) -> date:
+        due = self._due_in(self._month_index(day))
+        return due if due >= day else self._due_in(self._month_index(day) + 1)
+
+    def previous_due(self, day: date) -> date:
+        due = self._due_in(self._month_index(day))
+        return due if due <= day else self._due_in(self._month_index(day) - 1)
+
+    def count_due(self, start: date, end: date) -> int:
+        if end < start:
+            return 0
+        first, last = self.next_due(start), self.previous_due(end)
+        return max(self._month_index(last) - self._month_index(first) + 1, 0) if first <= last else 0
+
+    def nth_due(self, n: int, start: date) -> Optional[date]:
+        return self._due_in(self._month_index(self.next_due(start)) + n)
+
+    def log_mask(self, month: date) -> int:
+        return 1 << (self._due_in(self._month_index(month)).day - 1)
+
+
+@register_strategy('every_n_days')
+class EveryNDaysStrategy(HabitStrategy):
+    """params: {"interval": 3}; due every interval days from the habit's start date."""
+
+    def __init__(self, interval: int, anchor: date, frequency: int = 1):
+        super().__init__(frequency)
+        self.interval = interval
+        self.anchor = anchor
+
+    @classmethod
+    def from_params(cls, params: dict, anchor: date) -> 'EveryNDaysStrategy':
+        return cls(_positive_int(params, 'interval'), anchor, _positive_int(params, 'frequency', 1))
+
+    def next_due(self, day: date) -> date:
+        if day <= self.anchor:
+            return self.anchor
+        steps = -(-(day - self.anchor).days // self.interval)
+        return self.anchor + timedelta(days=steps * self.interval)
+
+    def previous_due(self, day: date) -> Optional[date]:
+        if day < self.anchor:
+            return None
+        return self.anchor + timedelta(days=(day - self.anchor).days // self.interval * self.interval)
+
+    def count_due(self, start: date, end: date) -> int:
+        first, last = self.next_due(start), self.previous_due(end)
+        if last is None or first > last:
+            return 0
+        return (last - first).days // self.interval + 1
+
+    def nth_due(self, n: int, start: date) -> Optional[date]:
+        return self.next_due(start) + timedelta(days=n * self.interval)
+
+    def log_mask(self, month: date) -> int:
+        mask, due, end = 0, self.next_due(month), _month_end(month)
+        while due <= end:
+            mask |= 1 << (due.day - 1)
+            due += timedelta(days=self.interval)
+        return mask
+
+
+@register_strategy('times_per_week')
+class TimesPerWeekStrategy(HabitStrategy):
+    """params: {"times": 3}; any days of a Monday-Sunday week, due on its Sunday."""
+
+    def __init__(self, times: int, frequency: int = 1):
+        super().__init__(frequency)
+        self.times = times
+
+    @classmethod
+    def from_params(cls, params: dict, anchor: date) -> 'TimesPerWeekStrategy':
+        return cls(_positive_int(params, 'times', maximum=7), _positive_int(params, 'frequency', 1))
+
+    def next_due(self, day: date) -> date:
+        return day + timedelta(days=6 - day.weekday())
+
+    def previous_due(self, day: date) -> date:
+        return day - timedelta(days=(day.weekday() + 1) % 7)
+
+    def count_due(self, start: date, end: date) -> int:
+        first = self.next_due(start)
+        return (end - first).days // 7 + 1 if first <= end else 0
+
+    def nth_due(self, n: int, start: date) -> Optional[date]:
+        return self.next_due(start) + timedelta(days=7 * n)
+
+    def log_mask(self, month: date) -> int:
+        return _full_month_mask(month)
+
+    def due_mask(self, month: date) -> int:
+        first_sunday = self.next_due(month).day - 1
+        return sum(1 << bit for bit in range(first_sunday, 31, 7)) & _full_month_mask(month)
+
+    def log_dates(self, start_date: date, end_date: date) -> List[date]:
+        return [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+
+    def unit_of(self, day: date) -> Optional[date]:
+        return self.next_due(day)
+
+    def unit_window(self, start: Optional[date], end: Optional[date]) -> Tuple[Optional[date], Optional[date]]:
+        return (start - timedelta(days=start.weekday()) if start else None), end
+
+    def complete_units(self, complete_days: Set[date]) -> Set[date]:
+        per_week = Counter(self.next_due(day) for day in complete_days)
+        return {sunday for sunday, done in per_week.items() if done >= self.times}
+
+
+class UnscheduledStrategy(HabitStrategy):
+    """Never due; stands in for habits whose strategy is unknown or misconfigured."""
+
+    @classmethod
+    def from_params(cls, params: dict, anchor: date) -> 'UnscheduledStrategy':
+        return cls()
+
+    def next_due(self, day: date) -> Optional[date]:
+        return None
+
+    def previous_due(self, day: date) -> Optional[date]:
+        return None
+
+    def count_due(self, start: date, end: date) -> int:
+        return 0
+
+    def nth_due(self, n: int, start: date) -> Optional[date]:
+        return None
+
+    def log_mask(self, month: date) -> int:
+        return 0
+
+
+UNSCHEDULED = UnscheduledStrategy()
+
+
+@lru_cache(maxsize=STRATEGY_CACHE_SIZE)
+def _cached_strategy(strategy_type: str, params_json: str, anchor: date) -> HabitStrategy:
+    if strategy_type not in STRATEGIES:
+        raise ValueError(f"Unknown strategy type: {strategy_type}")
+    return STRATEGIES[strategy_type].from_params(json.loads(params_json), anchor)
+
+
+def build_strategy(strategy_type: str, params: Optional[dict], anchor: Optional[date] = None) -> HabitStrategy:
+    """The strategy for a schedule, shared by every habit with the same one; raises ValueError if invalid."""
+    if not isinstance(params or {}, dict):
+        raise ValueError("Strategy parameters must be a JSON object")
+    return _cached_strategy(strategy_type, json.dumps(params or {}, sort_keys=True), anchor or DEFAULT_ANCHOR)
+
+
+def get_habit_strategy(habit, strict: bool = True) -> HabitStrategy:
+    """The habit's strategy, cached by its schedule so an edited habit gets a new one.
+
+    With strict=False an unknown or invalid schedule yields UNSCHEDULED instead of raising.
+    """
+    anchor = habit.start_date.date() if isinstance(habit.start_date, datetime) else habit.start_date
+    try:
+        return build_strategy(habit.strategy_type, habit.strategy_params, anchor)
+    except ValueError:
+        if strict:
+            raise
+        return UNSCHEDULED
@@ -0,0 +1,88 @@
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import BaseModel, ValidationError
+from app.models import Task, Movie
+from app.schemas import TaskCreate, MovieCreate
+from app.services.recurrence_service import RecurrenceService
+from config import Config
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type
+
+# Importable collections: kind -> (model, create schema)
+IMPORT_KINDS: Dict[str, Tuple[Any, Type[BaseModel]]] = {
+    'tasks': (Task, TaskCreate),
+    'movies': (Movie, MovieCreate),
+}
+MAX_REPORTED_IMPORT_ERRORS = 50
+
+
+class ImportService:
+    @staticmethod
+    def chunks(items: List[Any], chunk_size: int = Config.IMPORT_CHUNK_SIZE) -> Iterator[Tuple[int, List[Any]]]:
+        for offset in range(0, len(items), chunk_size):
+            yield offset, items[offset:offset + chunk_size]
+
+    @staticmethod
+    def validate_chunk(schema: Type[BaseModel], items: List[Any], offset: int, user_id: int) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Validates one chunk into insertable rows; invalid items are reported by their index in the upload."""
+        rows, errors = [], []
+        for index, item in enumerate(items, start=offset):
+            try:
+                data = schema.model_validate(item)
+            except ValidationError as e:
+                errors.append({'index': index, 'errors': e.errors(include_url=False, include_context=False)})
+                continue
+            rows.append({**data.model_dump(), 'user_id': user_id})
+        return rows, errors
+
+    @staticmethod
+    def prepare_rows(kind: str, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Fills columns the ORM create path would derive, since executemany skips it."""
+        if kind == 'tasks':
+            now = datetime.utcnow()
+            for row in rows:
+                row['recurrence_start'], row['next_occurrence'] = RecurrenceService.schedule(
+                    row.get('recurrence'), row.get('planned_start') or row.get('notify_at'), now
+                )
+        return rows
+
+    @staticmethod
+    def _summary(imported: int, errors: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            'imported': imported,
+            'failed': len(errors),
+            'errors': errors[:MAX_REPORTED_IMPORT_ERRORS],
+        }
+
+    @staticmethod
+    def import_items(db: Session, kind: str, items: List[Any], user_id: int,
+                     progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+        """Bulk-inserts valid items with one executemany and one commit per chunk."""
+        model, schema = IMPORT_KINDS[kind]
+        imported, errors = 0, []
+        for offset, chunk in ImportService.chunks(items):
+            rows, chunk_errors = ImportService.validate_chunk(schema, chunk, offset, user_id)
+            errors.extend(chunk_errors)
+            rows = ImportService.prepare_rows(kind, rows)
+            if rows:
+                db.execute(insert(model), rows)
+                db.commit()
+                imported += len(rows)
+            if progress:
+                progress(offset + len(chunk), len(items))
+        return ImportService._summary(imported, errors)
+
+    @staticmethod
+    async def import_items_async(db: AsyncSession, kind: str, items: List[Any], user_id: int) -> Dict[str, Any]:
+        model, schema = IMPORT_KINDS[kind]
+        imported, errors = 0, []
+        for offset, chunk in ImportService.chunks(items):
+            rows, chunk_errors = ImportService.validate_chunk(schema, chunk, offset, user_id)
+            errors.extend(chunk_errors)
+            rows = ImportService.prepare_rows(kind, rows)
+            if rows:
+                await db.execute(insert(model), rows)
+                await db.commit()
+                imported += len(rows)
+        return ImportService._summary(imported, errors)
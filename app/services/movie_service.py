@@ -1,6 +1,10 @@
+from sqlalchemy import select, delete
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models import Movie
 from app.schemas import MovieCreate
+from app.services.projection_service import ProjectionService
+from typing import List, Optional
 
 class MovieService:
     @staticmethod
@@ -36,3 +40,43 @@ class MovieService:
         if movie:
             db.delete(movie)
             db.commit()
+
+
+
+class AsyncMovieService:
+    """AsyncSession counterparts of MovieService for the FastAPI routers."""
+
+    @staticmethod
+    async def get_movies_by_user(db: AsyncSession, user_id: int, fields: Optional[List[str]] = None):
+        if fields:
+            stmt = select(*ProjectionService.columns(Movie, fields)).filter_by(user_id=user_id)
+            return [row._asdict() for row in (await db.execute(stmt)).all()]
+        return list((await db.scalars(select(Movie).filter_by(user_id=user_id))).all())
+
+    @staticmethod
+    async def get_movie(db: AsyncSession, movie_id: int):
+        return await db.get(Movie, movie_id)
+
+    @staticmethod
+    async def create_movie(db: AsyncSession, movie_data: MovieCreate, user_id: int):
+        movie = Movie(**movie_data.model_dump(), user_id=user_id)
+        db.add(movie)
+        await db.commit()
+        await db.refresh(movie)
+        return movie
+
+    @staticmethod
+    async def update_movie(db: AsyncSession, movie_id: int, movie_data: MovieCreate):
+        movie = await db.get(Movie, movie_id)
+        if not movie:
+            return None
+        for key, value in movie_data.model_dump(exclude_unset=True).items():
+            setattr(movie, key, value)
+        await db.commit()
+        await db.refresh(movie)
+        return movie
+
+    @staticmethod
+    async def delete_movie(db: AsyncSession, movie_id: int):
+        await db.execute(delete(Movie).where(Movie.id == movie_id))
+        await db.commit()
@@ -0,0 +1,45 @@
+from pydantic import BaseModel, TypeAdapter
+from typing import Any, Dict, Iterable, List, Optional, Type
+
+# Rows are addressed by id, so every projection carries it
+ALWAYS_PROJECTED_FIELDS = ('id',)
+
+_PROJECTED_ROWS_ADAPTER = TypeAdapter(List[Dict[str, Any]])
+
+
+class InvalidFieldsError(ValueError):
+    pass
+
+
+class ProjectionService:
+    """Sparse fieldsets (fields=...) for list reads.
+
+    Projected reads select only the requested columns with a Core select,
+    so other columns, e.g. Task.details, are neither read nor serialized.
+    """
+
+    @staticmethod
+    def resolve_fields(schema: Type[BaseModel], fields: Optional[List[str]]) -> Optional[List[str]]:
+        """Validates requested fields against the response schema; None means full rows.
+
+        Accepts repeated (fields=id&fields=title) and comma-separated values.
+        """
+        if not fields:
+            return None
+        requested = {name.strip() for value in fields for name in value.split(',') if name.strip()}
+        unknown = sorted(requested - set(schema.model_fields))
+        if unknown:
+            raise InvalidFieldsError(f"Unknown fields: {unknown}")
+        return list(ALWAYS_PROJECTED_FIELDS) + [
+            name for name in schema.model_fields if name in requested and name not in ALWAYS_PROJECTED_FIELDS
+        ]
+
+    @staticmethod
+    def columns(entity, fields: List[str], extra: Iterable[str] = ()):
+        """Column expressions for a projected select, plus any the query itself needs (e.g. its sort key)."""
+        names = list(fields) + [name for name in extra if name not in fields]
+        return [getattr(entity, name) for name in names]
+
+    @staticmethod
+    def dump_json(rows: List[Dict[str, Any]]) -> bytes:
+        return _PROJECTED_ROWS_ADAPTER.dump_json(rows)
@@ -0,0 +1,99 @@
+from dateutil.rrule import rrule, rrulestr
+from datetime import datetime
+from typing import Collection, List, Optional, Tuple
+import re
+
+# Rules firing more often than this would flood the per-minute scheduler
+ALLOWED_FREQUENCIES = ('YEARLY', 'MONTHLY', 'WEEKLY', 'DAILY', 'HOURLY')
+# Upper bound on occurrences returned for one window, and on completed
+# occurrences skipped while looking for the next pending one
+MAX_OCCURRENCES = 1000
+
+_FREQ_RE = re.compile(r'(?:^|;)FREQ=(\w+)')
+
+
+class InvalidRecurrenceError(ValueError):
+    pass
+
+
+class RecurrenceService:
+    """Lazy expansion of RRULE-style recurrences (RFC 5545 RRULE values).
+
+    A series is stored as its rule plus an anchor (recurrence_start). Only
+    next_occurrence is cached on the task; windows are expanded on demand.
+    """
+
+    @staticmethod
+    def normalize_rule(rule: Optional[str]) -> Optional[str]:
+        """Validates a rule such as 'FREQ=MONTHLY;BYMONTHDAY=1'; empty values mean no recurrence."""
+        if rule is None or not rule.strip():
+            return None
+        rule = rule.strip().upper()
+        if rule.startswith('RRULE:'):
+            rule = rule[len('RRULE:'):]
+        match = _FREQ_RE.search(rule)
+        if not match:
+            raise InvalidRecurrenceError("Recurrence rule must set FREQ")
+        if match.group(1) not in ALLOWED_FREQUENCIES:
+            raise InvalidRecurrenceError(f"FREQ must be one of {', '.join(ALLOWED_FREQUENCIES)}")
+        if 'DTSTART' in rule:
+            raise InvalidRecurrenceError("DTSTART is taken from the task, not the rule")
+        RecurrenceService.parse(rule, datetime(2000, 1, 1))
+        return rule
+
+    @staticmethod
+    def parse(rule: str, start: datetime) -> rrule:
+        try:
+            parsed = rrulestr(rule, dtstart=start)
+        except (ValueError, TypeError) as e:
+            raise InvalidRecurrenceError(f"Invalid recurrence rule: {e}")
+        if not isinstance(parsed, rrule):
+            raise InvalidRecurrenceError("Only a single RRULE is supported")
+        return parsed
+
+    @staticmethod
+    def next_occurrence(rule: str, start: datetime, after: datetime,
+                        completed: Collection[datetime] = (), inclusive: bool = True) -> Optional[datetime]:
+        """First occurrence at or after `after` that has not been completed, or None once the series ends."""
+        parsed = RecurrenceService.parse(rule, start)
+        occurrence = parsed.after(after, inc=inclusive)
+        for _ in range(MAX_OCCURRENCES):
+            if occurrence is None or occurrence not in completed:
+                return occurrence
+            occurrence = parsed.after(occurrence)
+        return None
+
+    @staticmethod
+    def occurrences(rule: str, start: datetime, window_start: datetime, window_end: datetime) -> List[datetime]:
+        """Occurrences in [window_start, window_end), expanded for that window only."""
+        result = []
+        for occurrence in RecurrenceService.parse(rule, start).xafter(window_start, count=MAX_OCCURRENCES, inc=True):
+            if occurrence >= window_end:
+                break
+            result.append(occurrence)
+        return result
+
+    @staticmethod
+    def is_occurrence(rule: str, start: datetime, value: datetime) -> bool:
+        return RecurrenceService.parse(rule, start).after(value, inc=True) == value
+
+    @staticmethod
+    def schedule(recurrence: Optional[str], anchor: Optional[datetime], now: datetime,
+                 completed: Collection[datetime] = ()) -> Tuple[Optional[datetime], Optional[datetime]]:
+        """Returns (recurrence_start, next_occurrence) for a task's recurrence fields."""
+        if not recurrence:
+            return None, None
+        start = anchor or now.replace(second=0, microsecond=0)
+        return start, RecurrenceService.next_occurrence(recurrence, start, now, completed)
+
+    @staticmethod
+    def anchor(task) -> Optional[datetime]:
+        """The series starts at the task's planned start, else its reminder time."""
+        return task.planned_start or task.notify_at or task.recurrence_start
+
+    @staticmethod
+    def apply(task, completed: Collection[datetime] = (), now: Optional[datetime] = None):
+        """Refreshes recurrence_start and next_occurrence after a task's fields changed."""
+        task.recurrence_start, task.next_occurrence = RecurrenceService.schedule(
+            task.recurrence, RecurrenceService.anchor(task), now or datetime.utcnow(), completed
+        )
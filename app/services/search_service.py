@@ -0,0 +1,133 @@
+from sqlalchemy import Float, Row, select, func, table, column, literal_column
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import engine
+from app.models import Task, TaskArchive, Movie
+from config import Config
+from typing import Any, List, Optional
+import re
+
+# Searchable text columns per model; the first column is weighted highest.
+SEARCH_FIELDS = {
+    Task: ('title', 'details'),
+    TaskArchive: ('title', 'details'),
+    Movie: ('title', 'comment'),
+}
+DEFAULT_SEARCH_LIMIT = 50
+MAX_SEARCH_LIMIT = 200
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def search_terms(query: str) -> List[str]:
+    """Splits free text into word tokens, dropping FTS operators and punctuation."""
+    return _TOKEN_RE.findall(query or '')
+
+
+class SQLiteFTSBackend:
+    """FTS5 external-content tables (<table>_fts), kept in sync by triggers.
+
+    See migrations/versions/3c1e2f7a9b40_add_full_text_search.py.
+    """
+
+    @staticmethod
+    def match_expression(terms: List[str]) -> str:
+        # Every term must match; the last one is a prefix so search-as-you-type works
+        quoted = [f'"{term}"' for term in terms]
+        quoted[-1] += '*'
+        return ' '.join(quoted)
+
+    @staticmethod
+    def statement(model, user_id: int, terms: List[str], limit: int):
+        fts_name = f"{model.__tablename__}_fts"
+        fts = table(fts_name, column('rowid'))
+        weights = ', '.join(['10.0'] + ['1.0'] * (len(SEARCH_FIELDS[model]) - 1))
+        # bm25 is lower-is-better; negate it so scores compare like ts_rank
+        score = literal_column(f"-bm25({fts_name}, {weights})", Float).label('score')
+        return (
+            select(model, score)
+            .join(fts, fts.c.rowid == model.id)
+            .where(literal_column(fts_name).op('MATCH')(SQLiteFTSBackend.match_expression(terms)))
+            .where(model.user_id == user_id)
+            .order_by(score.desc(), model.id)
+            .limit(limit)
+        )
+
+
+class PostgresSearchBackend:
+    """tsvector search over the same expression as the ix_<table>_search GIN index."""
+
+    @staticmethod
+    def document(model):
+        # Rendered with literals only, so the planner can match the index expression
+        empty = literal_column("''")
+        text = func.coalesce(getattr(model, SEARCH_FIELDS[model][0]), empty)
+        for field in SEARCH_FIELDS[model][1:]:
+            text = text.op('||')(literal_column("' '")).op('||')(func.coalesce(getattr(model, field), empty))
+        return func.to_tsvector(PostgresSearchBackend.text_config(), text)
+
+    @staticmethod
+    def text_config():
+        return literal_column(f"'{Config.SEARCH_TEXT_CONFIG}'::regconfig")
+
+    @staticmethod
+    def statement(model, user_id: int, terms: List[str], limit: int):
+        document = PostgresSearchBackend.document(model)
+        tsquery = func.to_tsquery(PostgresSearchBackend.text_config(), ' & '.join(terms) + ':*')
+        score = func.ts_rank(document, tsquery).label('score')
+        return (
+            select(model, score)
+            .where(model.user_id == user_id)
+            .where(document.op('@@')(tsquery))
+            .order_by(score.desc(), model.id)
+            .limit(limit)
+        )
+
+
+SEARCH_BACKENDS = {
+    'sqlite': SQLiteFTSBackend,
+    'postgresql': PostgresSearchBackend,
+}
+
+
+def get_search_backend(dialect: Optional[str] = None):
+    dialect = dialect or engine.dialect.name
+    if dialect not in SEARCH_BACKENDS:
+        raise ValueError(f"No search backend configured for database dialect: {dialect}")
+    return SEARCH_BACKENDS[dialect]
+
+
+class SearchService:
+    """Ranked search over one or more models, e.g. [Task, TaskArchive] for both task tiers.
+
+    Each model is queried separately. Scores are only comparable within one
+    table (bm25 and ts_rank depend on that table's corpus statistics), so the
+    ranked lists are interleaved by rank, in the order the models are given.
+    """
+
+    @staticmethod
+    def _statements(models, user_id: int, query: str, limit: int):
+        terms = search_terms(query)
+        if not terms:
+            return []
+        backend = get_search_backend()
+        limit = min(limit, MAX_SEARCH_LIMIT)
+        return [backend.statement(model, user_id, terms, limit) for model in models]
+
+    @staticmethod
+    def _merge(ranked: List[List[Row[Any]]], limit: int):
+        """Round-robin over the per-model hit lists, each already in rank order."""
+        merged: List[Any] = []
+        for rank in range(max(map(len, ranked), default=0)):
+            merged.extend(rows[rank][0] for rows in ranked if rank < len(rows))
+        return merged[:min(limit, MAX_SEARCH_LIMIT)]
+
+    @staticmethod
+    def search(db: Session, models, user_id: int, query: str, limit: int = DEFAULT_SEARCH_LIMIT):
+        ranked = [list(db.execute(stmt).all()) for stmt in SearchService._statements(models, user_id, query, limit)]
+        return SearchService._merge(ranked, limit)
+
+    @staticmethod
+    async def search_async(db: AsyncSession, models, user_id: int, query: str, limit: int = DEFAULT_SEARCH_LIMIT):
+        ranked = [list((await db.execute(stmt)).all()) for stmt in SearchService._statements(models, user_id, query, limit)]
+        return SearchService._merge(ranked, limit)
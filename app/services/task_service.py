@@ -1,12 +1,81 @@
-from sqlalchemy.orm import Session
-from app.models import Task
+from sqlalchemy import select, update, delete, and_, or_, union_all
+from sqlalchemy.orm import Session, aliased, load_only
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import Task, TaskArchive, TaskOccurrence, TaskStatus, TaskType
+from app.services.archive_service import ArchiveService, TASK_TIER_COLUMNS
+from app.services.recurrence_service import RecurrenceService
+from app.services.projection_service import ProjectionService
 from app.schemas import TaskCreate
-from typing import List
+from typing import Any, List, Optional, Set, Tuple, Union
+from datetime import datetime
+import base64
+import json
+
+# Stable sort keys for keyset pagination. Each key is ordered by (column, id);
+# nullable columns put NULLs last.
+TASK_SORT_KEYS = {
+    'id': Task.id,
+    'deadline': Task.deadline,
+    'planned_start': Task.planned_start,
+}
+DEFAULT_TASK_PAGE_SIZE = 50
+MAX_TASK_PAGE_SIZE = 500
+# Widest window GET /tasks/calendar serves in one request (a year view plus padding)
+CALENDAR_MAX_RANGE_DAYS = 400
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_task_cursor(sort: str, task: Task) -> str:
+    value = getattr(task, sort)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([sort, value, task.id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_task_cursor(cursor: str, sort: str) -> Tuple[Optional[object], int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        cursor_sort, value, last_id = json.loads(raw)
+        if sort != 'id' and value is not None:
+            value = datetime.fromisoformat(value)
+        last_id = int(last_id)
+    except (ValueError, TypeError):
+        raise InvalidCursorError("Malformed cursor")
+    if cursor_sort != sort:
+        raise InvalidCursorError("Cursor was issued for a different sort order")
+    return value, last_id
+
+
+def _keyset_condition(sort: str, value, last_id: int, entity=Task):
+    if sort == 'id':
+        return entity.id > last_id
+    column = getattr(entity, sort)
+    if value is None:
+        return and_(column.is_(None), entity.id > last_id)
+    return or_(
+        column > value,
+        and_(column == value, entity.id > last_id),
+        column.is_(None),
+    )
+
+
+def _task_tiers():
+    """Task entity over the hot and archived tiers, for reads that include archived tasks."""
+    archive_columns = [TaskArchive.__table__.c[key] for key in TASK_TIER_COLUMNS]
+    tiers = union_all(select(Task.__table__), select(*archive_columns)).subquery('task_tiers')
+    return aliased(Task, tiers, adapt_on_names=True)
 
 class TaskService:
     @staticmethod
-    def get_tasks_by_user_and_type(db: Session, user_id: int, task_type=None) -> List[Task]:
+    def get_tasks_by_user_and_type(db: Session, user_id: int, task_type=None, fields: Optional[List[str]] = None) -> List[Task]:
         query = db.query(Task).filter_by(user_id=user_id)
+        if fields:
+            # Other columns are deferred; touching them later costs a query per row
+            query = query.options(load_only(*ProjectionService.columns(Task, fields)))
         if task_type:
             if task_type == 'all':
                 query = query.filter(Task.type.in_(['CURRENT', 'ROUTINE', 'INBOX']))
@@ -23,31 +92,262 @@ class TaskService:
         return db.query(Task).filter_by(user_id=user_id).all()
 
     @staticmethod
-    def get_task(db: Session, task_id: int) -> Task:
-        return db.query(Task).get(task_id)
+    def get_task(db: Session, task_id: int, include_archived: bool = False) -> Optional[Union[Task, TaskArchive]]:
+        task = db.get(Task, task_id)
+        if task is None and include_archived:
+            return db.get(TaskArchive, task_id)
+        return task
 
     @staticmethod
     def create_task(db: Session, task_data: TaskCreate, user_id: int) -> Task:
         task = Task(**task_data.model_dump(exclude_unset=True), user_id=user_id)
+        RecurrenceService.apply(task)
         db.add(task)
         db.commit()
         db.refresh(task)
         return task
 
     @staticmethod
-    def update_task(db: Session, task_id: int, task_data: TaskCreate) -> Task:
+    def update_task(db: Session, task_id: int, task_data: TaskCreate) -> Optional[Task]:
         task = db.query(Task).get(task_id)
         if not task:
             return None
         for key, value in task_data.model_dump(exclude_unset=True).items():
             setattr(task, key, value)
+        RecurrenceService.apply(task, TaskService.get_completed_occurrences(db, task.id) if task.recurrence else ())
         db.commit()
         db.refresh(task)
         return task
 
+    @staticmethod
+    def get_completed_occurrences(db: Session, task_id: int) -> Set[datetime]:
+        return set(db.scalars(select(TaskOccurrence.occurrence).where(TaskOccurrence.task_id == task_id)).all())
+
     @staticmethod
     def delete_task(db: Session, task_id: int):
-        task = db.query(Task).get(task_id)
-        if task:
-            db.delete(task)
-            db.commit()
+        """Deletes the task from whichever tier holds it."""
+        db.execute(delete(Task).where(Task.id == task_id))
+        db.execute(delete(TaskArchive).where(TaskArchive.id == task_id))
+        db.execute(delete(TaskOccurrence).where(TaskOccurrence.task_id == task_id))
+        db.commit()
+
+
+class AsyncTaskService:
+    """AsyncSession counterparts of TaskService for the FastAPI routers."""
+
+    @staticmethod
+    async def get_tasks_by_user_and_type(db: AsyncSession, user_id: int, task_type=None) -> List[Task]:
+        stmt = select(Task).filter_by(user_id=user_id)
+        if task_type:
+            if task_type == 'all':
+                stmt = stmt.filter(Task.type.in_(['CURRENT', 'ROUTINE', 'INBOX']))
+            else:
+                stmt = stmt.filter_by(type=task_type)
+        return list((await db.scalars(stmt)).all())
+
+    @staticmethod
+    async def list_tasks(
+        db: AsyncSession,
+        user_id: int,
+        types: Optional[List[TaskType]] = None,
+        statuses: Optional[List[TaskStatus]] = None,
+        deadline_from: Optional[datetime] = None,
+        deadline_to: Optional[datetime] = None,
+        has_notification: Optional[bool] = None,
+        sort: str = 'id',
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_TASK_PAGE_SIZE,
+        include_archived: bool = False,
+        fields: Optional[List[str]] = None,
+    ) -> Tuple[list, Optional[str]]:
+        """Returns one keyset page of the user's tasks and the cursor of the next page.
+
+        With fields, only those columns (plus the sort key) are selected and
+        the page is a list of dicts instead of Task objects.
+        """
+        if sort not in TASK_SORT_KEYS:
+            raise ValueError(f"Unknown sort key: {sort}")
+        entity = _task_tiers() if include_archived else Task
+        column = getattr(entity, sort)
+
+        if fields:
+            stmt = select(*ProjectionService.columns(entity, fields, extra=[sort]))
+        else:
+            stmt = select(entity)
+        stmt = stmt.filter(entity.user_id == user_id)
+        if types:
+            stmt = stmt.filter(entity.type.in_(types))
+        if statuses:
+            stmt = stmt.filter(entity.status.in_(statuses))
+        if deadline_from is not None:
+            stmt = stmt.filter(entity.deadline >= deadline_from)
+        if deadline_to is not None:
+            stmt = stmt.filter(entity.deadline <= deadline_to)
+        if has_notification is not None:
+            stmt = stmt.filter(entity.notify_at.is_not(None) if has_notification else entity.notify_at.is_(None))
+        if cursor:
+            stmt = stmt.filter(_keyset_condition(sort, *decode_task_cursor(cursor, sort), entity=entity))
+
+        if sort == 'id':
+            stmt = stmt.order_by(entity.id)
+        else:
+            stmt = stmt.order_by(column.is_(None), column, entity.id)
+
+        # Fetch one extra row to know whether another page exists
+        result = await db.execute(stmt.limit(limit + 1))
+        tasks = list(result.all() if fields else result.scalars().all())
+        next_cursor = None
+        if len(tasks) > limit:
+            tasks = tasks[:limit]
+            next_cursor = encode_task_cursor(sort, tasks[-1])
+        if fields:
+            tasks = [row._asdict() for row in tasks]
+        return tasks, next_cursor
+
+    @staticmethod
+    async def get_calendar_tasks(db: AsyncSession, user_id: int, start: datetime, end: datetime,
+                                 include_archived: bool = False) -> List[Task]:
+        """Returns the user's planned tasks overlapping [start, end).
+
+        Runs as two range scans: tasks starting inside the window on
+        (user_id, planned_start), and tasks still running at its start on
+        (user_id, planned_end, planned_start), whose trailing column checks
+        planned_start < start inside the index so only overlapping rows are read.
+        """
+        tasks: List[Any] = []
+        models: Tuple[Any, ...] = (Task, TaskArchive) if include_archived else (Task,)
+        for model in models:
+            starts_inside = select(model).filter(
+                model.user_id == user_id, model.planned_start >= start, model.planned_start < end
+            )
+            running_at_start = select(model).filter(
+                model.user_id == user_id, model.planned_end >= start, model.planned_start < start
+            )
+            tasks.extend((await db.scalars(starts_inside)).all())
+            tasks.extend((await db.scalars(running_at_start)).all())
+        tasks.sort(key=lambda task: (task.planned_start, task.id))
+        return tasks
+
+    @staticmethod
+    async def get_all_tasks_for_user(db: AsyncSession, user_id: int) -> List[Task]:
+        return list((await db.scalars(select(Task).filter_by(user_id=user_id))).all())
+
+    @staticmethod
+    async def get_task(db: AsyncSession, task_id: int, include_archived: bool = False) -> Optional[Union[Task, TaskArchive]]:
+        task = await db.get(Task, task_id)
+        if task is None and include_archived:
+            task = await db.get(TaskArchive, task_id)
+        return task
+
+    @staticmethod
+    async def create_task(db: AsyncSession, task_data: TaskCreate, user_id: int) -> Task:
+        task = Task(**task_data.model_dump(exclude_unset=True), user_id=user_id)
+        RecurrenceService.apply(task)
+        db.add(task)
+        await db.commit()
+        await db.refresh(task)
+        return task
+
+    @staticmethod
+    async def update_task(db: AsyncSession, task_id: int, task_data: TaskCreate) -> Optional[Task]:
+        task = await db.get(Task, task_id)
+        if not task:
+            return None
+        for key, value in task_data.model_dump(exclude_unset=True).items():
+            setattr(task, key, value)
+        completed = await AsyncTaskService.get_completed_occurrences(db, task.id) if task.recurrence else ()
+        RecurrenceService.apply(task, completed)
+        await db.commit()
+        await db.refresh(task)
+        return task
+
+    @staticmethod
+    async def get_completed_occurrences(db: AsyncSession, task_id: int) -> Set[datetime]:
+        result = await db.scalars(select(TaskOccurrence.occurrence).where(TaskOccurrence.task_id == task_id))
+        return set(result.all())
+
+    @staticmethod
+    async def complete_occurrence(db: AsyncSession, task: Task, occurrence: datetime) -> Task:
+        """Marks one occurrence of a series done; the series itself stays open."""
+        exists = await db.scalar(select(TaskOccurrence.id).where(
+            TaskOccurrence.task_id == task.id, TaskOccurrence.occurrence == occurrence
+        ))
+        if not exists:
+            db.add(TaskOccurrence(task_id=task.id, occurrence=occurrence))
+            await db.flush()
+        if isinstance(task, Task):
+            RecurrenceService.apply(task, await AsyncTaskService.get_completed_occurrences(db, task.id))
+        await db.commit()
+        return task
+
+    @staticmethod
+    async def get_occurrences(db: AsyncSession, user_id: int, start: datetime, end: datetime) -> List[dict]:
+        """Expands the user's open recurring tasks over [start, end) only."""
+        tasks = (await db.scalars(select(Task).where(
+            Task.user_id == user_id,
+            Task.recurrence.is_not(None),
+            Task.status == TaskStatus.OPEN,
+            Task.recurrence_start < end,
+        ))).all()
+        if not tasks:
+            return []
+        done = set((await db.execute(select(TaskOccurrence.task_id, TaskOccurrence.occurrence).where(
+            TaskOccurrence.task_id.in_([task.id for task in tasks]),
+            TaskOccurrence.occurrence >= start,
+            TaskOccurrence.occurrence < end,
+        ))).all())
+        occurrences = [
+            {'task_id': task.id, 'title': task.title, 'occurrence': occurrence, 'done': (task.id, occurrence) in done}
+            for task in tasks if task.recurrence and task.recurrence_start
+            for occurrence in RecurrenceService.occurrences(task.recurrence, task.recurrence_start, start, end)
+        ]
+        occurrences.sort(key=lambda item: (item['occurrence'], item['task_id']))
+        return occurrences
+
+    @staticmethod
+    async def delete_task(db: AsyncSession, task_id: int):
+        await db.execute(delete(Task).where(Task.id == task_id))
+        await db.execute(delete(TaskArchive).where(TaskArchive.id == task_id))
+        await db.execute(delete(TaskOccurrence).where(TaskOccurrence.task_id == task_id))
+        await db.commit()
+
+    @staticmethod
+    async def bulk_update_tasks(db: AsyncSession, user_id: int, task_ids: List[int], changes: dict) -> List[int]:
+        """Applies one set-based UPDATE to the user's tasks; returns the ids that matched.
+
+        Archived tasks are restored to the hot table first, like a single
+        edit through PUT /tasks/{id}, so both tiers are covered.
+        """
+        await ArchiveService.restore_tasks(db, task_ids, user_id)
+        result = await db.execute(
+            update(Task)
+            .where(Task.user_id == user_id, Task.id.in_(task_ids))
+            .values(**changes)
+            .returning(Task.id)
+            .execution_options(synchronize_session=False)
+        )
+        updated = list(result.scalars().all())
+        if updated and ('planned_start' in changes or 'notify_at' in changes):
+            # The series anchor moved; refresh the cached next occurrence
+            recurring = await db.scalars(select(Task).where(Task.id.in_(updated), Task.recurrence.is_not(None)))
+            for task in recurring.all():
+                RecurrenceService.apply(task, await AsyncTaskService.get_completed_occurrences(db, task.id))
+        await db.commit()
+        return updated
+
+    @staticmethod
+    async def bulk_delete_tasks(db: AsyncSession, user_id: int, task_ids: List[int]) -> List[int]:
+        """Deletes the user's tasks from both tiers; returns the ids that matched."""
+        deleted: List[int] = []
+        for model in (Task, TaskArchive):
+            result = await db.execute(
+                delete(model)
+                .where(model.user_id == user_id, model.id.in_(task_ids))
+                .returning(model.id)
+                .execution_options(synchronize_session=False)
+            )
+            deleted.extend(result.scalars().all())
+        if deleted:
+            await db.execute(delete(TaskOccurrence).where(TaskOccurrence.task_id.in_(deleted)))
+        await db.commit()
+        return deleted
@@ -1,10 +1,22 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models import User, UserRole
 from app.schemas import UserCreate
 from passlib.context import CryptContext
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+import asyncio
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt releases the GIL, so a small thread pool keeps hashing off the event
+# loop while capping how many CPU-heavy hashes run at once.
+_password_executor = ThreadPoolExecutor(
+    max_workers=Config.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash",
+)
+
 class UserService:
     @staticmethod
     def get_user_by_username(db: Session, username: str):
@@ -18,6 +30,14 @@ class UserService:
     def get_user_by_id(db: Session, user_id: int):
         return db.query(User).get(user_id)
 
+    @staticmethod
+    async def get_user_by_id_async(db: AsyncSession, user_id: int):
+        return await db.get(User, user_id)
+
+    @staticmethod
+    async def get_user_by_username_async(db: AsyncSession, username: str):
+        return (await db.scalars(select(User).filter(User.username == username))).first()
+
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
         return pwd_context.verify(plain_password, hashed_password)
@@ -27,16 +47,27 @@ class UserService:
         return pwd_context.hash(password)
 
     @staticmethod
-    def create_user(db: Session, user_data: UserCreate) -> User:
-        hashed_password = UserService.get_password_hash(user_data.password)
-        
+    async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _password_executor, pwd_context.verify, plain_password, hashed_password
+        )
+
+    @staticmethod
+    async def get_password_hash_async(password: str) -> str:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_password_executor, pwd_context.hash, password)
+
+    @staticmethod
+    def create_user(db: Session, user_data: UserCreate, password_hash: str) -> User:
+        """password_hash: user_data.password hashed by the caller, see get_password_hash_async."""
         # The first user created is an admin
         is_first_user = db.query(User).count() == 0
         role = UserRole.ADMIN if is_first_user else UserRole.USER
         
         new_user = User(
             username=user_data.username,
-            password_hash=hashed_password,
+            password_hash=password_hash,
             role=role
         )
         db.add(new_user)
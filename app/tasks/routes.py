@@ -1,14 +1,32 @@
-from flask import render_template, redirect, url_for, flash, request, jsonify, Response, session
+from flask import render_template, redirect, url_for, flash, request, jsonify, Response, session, stream_with_context, make_response
 import json
 from flask_login import login_required
 from app.tasks import bp
-from app.schemas import TaskSchema
-from pydantic import ValidationError, TypeAdapter
+from app.schemas import TaskSchema, TaskListItem, TASK_LIST_ADAPTER, TASK_LIST_ITEM_ADAPTER
+from pydantic import ValidationError
 from app.models import TaskStatus, TaskType
 from datetime import datetime
 import httpx
-from typing import List
-from app.api_client import make_api_request
+from app.api_client import make_api_request, stream_api_request
+from app.services.export_service import EXPORT_FORMATS
+from app.import_jobs import start_import, import_status
+
+
+TASKS_PAGE_SIZE = 50
+
+
+def _fetch_tasks_page(task_type, cursor=None):
+    params = {'type': task_type, 'limit': TASKS_PAGE_SIZE, 'fields': list(TaskListItem.model_fields)}
+    if cursor:
+        params['cursor'] = cursor
+    statuses = request.args.getlist('status')
+    if statuses:
+        params['status'] = statuses
+    if request.args.get('include_archived') == '1':
+        params['include_archived'] = 'true'
+    response = make_api_request("GET", "/tasks/", params=params)
+    tasks = TASK_LIST_ITEM_ADAPTER.validate_json(response.content)
+    return tasks, response.headers.get('X-Next-Cursor')
 
 
 @bp.route('/tasks')
@@ -16,13 +34,39 @@ from app.api_client import make_api_request
 def tasks():
     task_type = request.args.get('type', 'all')
     try:
-        response = make_api_request("GET", "/tasks/", params={'type': task_type})
-        tasks_data = response.json()
-        tasks = TypeAdapter(List[TaskSchema]).validate_python(tasks_data)
+        tasks, next_cursor = _fetch_tasks_page(task_type)
     except (httpx.HTTPStatusError, httpx.RequestError) as e:
         flash(f"Could not load tasks: {e}", "danger")
+        tasks, next_cursor = [], None
+    return render_template('tasks/tasks_list.html', tasks=tasks, next_cursor=next_cursor, current_filter=task_type, task_statuses=TaskStatus, task_types=TaskType)
+
+@bp.route('/tasks/search')
+@login_required
+def search_tasks():
+    query = request.args.get('q', '').strip()
+    if not query:
+        return redirect(url_for('tasks.tasks'))
+    try:
+        response = make_api_request("GET", "/tasks/search", params={'q': query})
+        tasks = TASK_LIST_ADAPTER.validate_json(response.content)
+    except (httpx.HTTPStatusError, httpx.RequestError) as e:
+        flash(f"Could not search tasks: {e}", "danger")
         tasks = []
-    return render_template('tasks/tasks_list.html', tasks=tasks, current_filter=task_type, task_statuses=TaskStatus, task_types=TaskType)
+    return render_template('tasks/tasks_list.html', tasks=tasks, next_cursor=None, current_filter=None, search_query=query, task_statuses=TaskStatus, task_types=TaskType)
+
+@bp.route('/tasks/page')
+@login_required
+def tasks_page():
+    """Renders the next page of the task list as an HTML fragment for incremental loading."""
+    task_type = request.args.get('type', 'all')
+    try:
+        tasks, next_cursor = _fetch_tasks_page(task_type, request.args.get('cursor'))
+    except (httpx.HTTPStatusError, httpx.RequestError) as e:
+        return jsonify({'error': str(e)}), 500
+    response = make_response(render_template('tasks/_task_items.html', tasks=tasks))
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    return response
 
 @bp.route('/task/<int:task_id>/json')
 @login_required
@@ -85,22 +129,43 @@ def delete_task(task_id):
         flash(f"Error deleting task: {e}", 'danger')
         return jsonify({'error': str(e)}), 500
 
+@bp.route('/tasks/bulk', methods=['POST'])
+@login_required
+def bulk_update_tasks():
+    payload = request.get_json()
+    try:
+        response = make_api_request("PATCH", "/tasks/bulk", json_data=payload)
+        results = response.json()['results']
+        changed = sum(1 for outcome in results.values() if outcome != 'not_found')
+        action = 'deleted' if payload.get('action') == 'delete' else 'updated'
+        flash(f'{changed} task(s) {action}.', 'success')
+        return jsonify(results)
+    except (httpx.RequestError, httpx.HTTPStatusError) as e:
+        return jsonify({'error': str(e)}), 500
+
 @bp.route('/tasks/export')
 @login_required
 def export_tasks():
     fields = request.args.getlist('fields')
+    export_format = request.args.get('format', 'json')
+    if export_format not in EXPORT_FORMATS:
+        export_format = 'json'
     try:
-        response = make_api_request("GET", "/tasks/export", params={'fields': fields})
-        tasks_to_export = response.json()
-        
-        response_data = json.dumps(tasks_to_export, ensure_ascii=False, indent=4)
-        response = Response(response_data, mimetype='application/json; charset=utf-8')
-        response.headers['Content-Disposition'] = 'attachment; filename=tasks.json'
-        return response
+        api_response = stream_api_request("GET", "/tasks/export", params={'fields': fields, 'format': export_format})
     except (httpx.RequestError, httpx.HTTPStatusError) as e:
         flash(f"Error exporting tasks: {e}", 'danger')
         return redirect(url_for('tasks.tasks'))
 
+    def generate():
+        try:
+            yield from api_response.iter_bytes()
+        finally:
+            api_response.close()
+
+    response = Response(stream_with_context(generate()), mimetype=api_response.headers.get('content-type'))
+    response.headers['Content-Disposition'] = f'attachment; filename=tasks.{export_format}'
+    return response
+
 @bp.route('/tasks/import', methods=['POST'])
 @login_required
 def import_tasks():
@@ -111,23 +176,24 @@ def import_tasks():
     if file.filename == '':
         flash('No selected file', 'warning')
         return redirect(url_for('tasks.tasks'))
-    if file:
-        try:
-            tasks_data = json.load(file)
-            make_api_request("POST", "/tasks/import", json_data=tasks_data)
-            flash('Tasks imported successfully!', 'success')
-        except (json.JSONDecodeError, httpx.RequestError, httpx.HTTPStatusError) as e:
-            flash(f'Error importing tasks: {e}', 'danger')
-        return redirect(url_for('tasks.tasks'))
+    start_import('tasks', file)
+    return redirect(url_for('tasks.tasks'))
+
+@bp.route('/imports/<job_id>')
+@login_required
+def import_job_status(job_id):
+    state = import_status(job_id)
+    if state is None:
+        return jsonify({'error': 'Import not found'}), 404
+    return jsonify(state)
 
 @bp.route('/task/<int:task_id>')
 @login_required
 def task(task_id):
     try:
         response = make_api_request("GET", f"/tasks/{task_id}")
-        task_data = response.json()
         # The API is the source of truth, no need to check user_id here
-        task = TypeAdapter(TaskSchema).validate_python(task_data)
+        task = TaskSchema.model_validate_json(response.content)
         return render_template('tasks/task_form.html', task=task, form_title='Edit Task', task_statuses=TaskStatus, task_types=TaskType)
     except (httpx.RequestError, httpx.HTTPStatusError) as e:
         flash(f"Error fetching task: {e}", 'danger')
@@ -1,8 +1,14 @@
 from app.services.task_service import TaskService
 from app.services.user_service import UserService
+from app.services.import_service import ImportService
+from app.services.search_service import SearchService
+from app.models import Task, TaskArchive
 from app.schemas import TaskCreate
 from app.database import SessionLocal
 from app.telegram_utils import send_telegram_message, run_async_in_new_loop
+from rq import get_current_job
+import json
+import os
 
 def handle_task_list(chat_id, task_type):
     """Fetches and sends a list of tasks to the user."""
@@ -13,7 +19,7 @@ def handle_task_list(chat_id, task_type):
             run_async_in_new_loop(send_telegram_message(chat_id, "Your account is not linked."))
             return
 
-        tasks = TaskService.get_tasks_by_user_and_type(db_session, user.id, task_type)
+        tasks = TaskService.get_tasks_by_user_and_type(db_session, user.id, task_type, fields=['id', 'title'])
         if tasks:
             message = f"Tasks for type: {task_type}\n\n"
             for task in tasks:
@@ -24,6 +30,26 @@ def handle_task_list(chat_id, task_type):
     finally:
         db_session.close()
 
+def handle_task_search(chat_id, query):
+    """Searches the user's tasks and sends the best matches."""
+    db_session = SessionLocal()
+    try:
+        user = UserService.get_user_by_telegram_chat_id(db_session, str(chat_id))
+        if not user:
+            run_async_in_new_loop(send_telegram_message(chat_id, "Your account is not linked."))
+            return
+
+        tasks = SearchService.search(db_session, [Task, TaskArchive], user.id, query, limit=20)
+        if tasks:
+            message = f"Tasks matching: {query}\n\n"
+            for task in tasks:
+                message += f"- {task.title} (ID: {task.id})\n"
+        else:
+            message = "No tasks found."
+        run_async_in_new_loop(send_telegram_message(chat_id, message))
+    finally:
+        db_session.close()
+
 def create_task(user_id, task_data_dict):
     """Creates a new task."""
     db_session = SessionLocal()
@@ -43,7 +69,7 @@ def delete_task(user_id, task_id):
     """Deletes a task."""
     db_session = SessionLocal()
     try:
-        task = TaskService.get_task(db_session, task_id)
+        task = TaskService.get_task(db_session, task_id, include_archived=True)
         user = UserService.get_user_by_id(db_session, user_id)
         if not user or not user.telegram_chat_id:
             return
@@ -62,3 +88,36 @@ def delete_task(user_id, task_id):
             ))
     finally:
         db_session.close()
+
+def import_file(user_id, kind, path):
+    """Imports a JSON array of tasks or movies uploaded through the frontend.
+
+    Progress is kept in job.meta ('processed'/'total') for the status endpoint;
+    the summary is the job result and is also sent to the linked Telegram chat.
+    """
+    job = get_current_job()
+
+    def report_progress(processed, total):
+        if job:
+            job.meta.update(processed=processed, total=total)
+            job.save_meta()
+
+    db_session = SessionLocal()
+    try:
+        with open(path, encoding='utf-8') as f:
+            items = json.load(f)
+        if not isinstance(items, list):
+            raise ValueError("Import file must contain a JSON array")
+        report_progress(0, len(items))
+        result = ImportService.import_items(db_session, kind, items, user_id, progress=report_progress)
+
+        user = UserService.get_user_by_id(db_session, user_id)
+        if user and user.telegram_chat_id:
+            run_async_in_new_loop(send_telegram_message(
+                user.telegram_chat_id,
+                f"Import of {kind} finished: {result['imported']} imported, {result['failed']} failed."
+            ))
+        return result
+    finally:
+        db_session.close()
+        os.remove(path)
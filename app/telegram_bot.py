@@ -11,6 +11,7 @@ from app.queue import q, redis_conn
 from app.database import SessionLocal
 from app.services.user_service import UserService
 from app.services.task_service import TaskService
+from app.auth.principal_cache import principal_cache
 
 logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s", level=logging.INFO
@@ -18,7 +19,15 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 CONFIRM_DELETE = 0
-GET_TITLE, GET_NOTIFY_CHOICE, GET_NOTIFY_AT = range(3)
+GET_TITLE, GET_NOTIFY_CHOICE, GET_NOTIFY_AT, GET_RECURRENCE = range(4)
+# Repeat choices offered after a reminder time: callback data -> RRULE
+RECURRENCE_CHOICES = {
+    'repeat_none': None,
+    'repeat_daily': 'FREQ=DAILY',
+    'repeat_weekly': 'FREQ=WEEKLY',
+    'repeat_monthly': 'FREQ=MONTHLY',
+    'repeat_yearly': 'FREQ=YEARLY',
+}
 
 def get_db_session():
     """Helper to get a new DB session."""
@@ -73,6 +82,7 @@ async def start(update, context):
                 user.telegram_chat_id = chat_id
                 user.telegram_username = telegram_username
                 db_session.commit()
+                principal_cache.invalidate_remote(user.id)
                 redis_conn.delete(f"telegram_token:{token}")
                 await update.message.reply_text(f"Success! Linked to profile '{user.username}'.")
             else:
@@ -99,6 +109,14 @@ async def task_list(update, context):
     q.enqueue('app.tasks_rq.handle_task_list', chat_id, task_type)
     await update.message.reply_text("Fetching your tasks...")
 
+@restricted_to_role([UserRole.USER, UserRole.ADMIN, UserRole.TRUSTED])
+async def task_search(update, context):
+    if not context.args:
+        await update.message.reply_text("Usage: /task_search <text>")
+        return
+    q.enqueue('app.tasks_rq.handle_task_search', update.message.chat_id, " ".join(context.args))
+    await update.message.reply_text("Searching your tasks...")
+
 @restricted_to_role([UserRole.USER, UserRole.ADMIN, UserRole.TRUSTED])
 async def task_delete(update, context):
     user_id = context.user_data['user_id']
@@ -110,7 +128,7 @@ async def task_delete(update, context):
             return ConversationHandler.END
 
         task_id = int(context.args[0])
-        task = TaskService.get_task(db_session, task_id)
+        task = TaskService.get_task(db_session, task_id, include_archived=True)
 
         if not task or task.user_id != user_id:
             await update.message.reply_text("Task not found or you are not authorized.")
@@ -172,14 +190,41 @@ async def get_notify_choice(update, context):
         return ConversationHandler.END
 
 async def get_notify_at(update, context):
-    user_id = context.user_data['user_id']
     try:
         notify_at = datetime.strptime(update.message.text, "%Y-%m-%d %H:%M")
-        task_data = TaskCreate(title=context.user_data["title"], type=context.user_data["task_type"], notify_at=notify_at)
-        q.enqueue('app.tasks_rq.create_task', user_id, task_data.model_dump())
-        await update.message.reply_text(f"Task '{context.user_data['title']}' with notification created.")
     except ValueError:
         await update.message.reply_text("Invalid format. Please use YYYY-MM-DD HH:MM.")
         return GET_NOTIFY_AT
+    context.user_data["notify_at"] = notify_at
+    keyboard = [
+        [InlineKeyboardButton("Once", callback_data="repeat_none")],
+        [
+            InlineKeyboardButton("Daily", callback_data="repeat_daily"),
+            InlineKeyboardButton("Weekly", callback_data="repeat_weekly"),
+        ],
+        [
+            InlineKeyboardButton("Monthly", callback_data="repeat_monthly"),
+            InlineKeyboardButton("Yearly", callback_data="repeat_yearly"),
+        ],
+    ]
+    await update.message.reply_text("Repeat the reminder?", reply_markup=InlineKeyboardMarkup(keyboard))
+    return GET_RECURRENCE
+
+async def get_recurrence(update, context):
+    query = update.callback_query
+    await query.answer()
+    user_id = context.user_data['user_id']
+    recurrence = RECURRENCE_CHOICES.get(query.data)
+    task_data = TaskCreate(
+        title=context.user_data["title"],
+        type=context.user_data["task_type"],
+        notify_at=context.user_data["notify_at"],
+        recurrence=recurrence,
+    )
+    q.enqueue('app.tasks_rq.create_task', user_id, task_data.model_dump())
+    if recurrence:
+        await query.edit_message_text(text=f"Recurring task '{context.user_data['title']}' created.")
+    else:
+        await query.edit_message_text(text=f"Task '{context.user_data['title']}' with notification created.")
     context.user_data.clear()
     return ConversationHandler.END
@@ -0,0 +1,117 @@
+"""Prints EXPLAIN QUERY PLAN and timings for the hot queries before and after
+the f9615a399b23 indexes.
+
+Uses only the standard library, against a throwaway SQLite file populated with
+synthetic data:
+
+    python benchmarks/explain_indexes.py --users 50 --tasks-per-user 2000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta, date
+
+SCHEMA = """
+CREATE TABLE task (
+    id INTEGER PRIMARY KEY, user_id INTEGER, title VARCHAR(140), details TEXT,
+    status VARCHAR(8) NOT NULL, type VARCHAR(8) NOT NULL, deadline DATETIME,
+    duration INTEGER, planned_start DATETIME, planned_end DATETIME,
+    suspend_due DATETIME, notify_at DATETIME, planned_start_notified BOOLEAN
+);
+CREATE TABLE habit_log (
+    id INTEGER PRIMARY KEY, habit_id INTEGER, date DATE, is_done BOOLEAN, "index" INTEGER
+);
+"""
+
+INDEXES = """
+CREATE INDEX ix_task_user_id_type ON task (user_id, type);
+CREATE INDEX ix_task_suspend_due ON task (suspend_due) WHERE suspend_due IS NOT NULL;
+CREATE INDEX ix_task_notify_at ON task (notify_at) WHERE notify_at IS NOT NULL;
+CREATE INDEX ix_task_planned_start_notified ON task (planned_start, planned_start_notified) WHERE planned_start IS NOT NULL;
+CREATE UNIQUE INDEX uq_habit_log_habit_id_date_index ON habit_log (habit_id, date, "index");
+"""
+
+NOW = datetime(2026, 10, 17, 12, 0)
+
+QUERIES = [
+    ("scheduler: suspend_due",
+     "SELECT id FROM task WHERE suspend_due <= ?", (NOW,)),
+    ("scheduler: notify_at",
+     "SELECT id FROM task WHERE notify_at <= ? AND notify_at IS NOT NULL", (NOW,)),
+    ("scheduler: planned_start",
+     "SELECT id FROM task WHERE planned_start > ? AND planned_start <= ? AND planned_start_notified = 0",
+     (NOW, NOW + timedelta(hours=1))),
+    ("TaskService: user_id + type",
+     "SELECT id FROM task WHERE user_id = ? AND type = ?", (7, "CURRENT")),
+    ("HabitService.log_habit lookup",
+     'SELECT id FROM habit_log WHERE habit_id = ? AND date = ? AND "index" = ?', (3, date(2026, 5, 1), 0)),
+    ("HabitService.get_habit_logs",
+     "SELECT id FROM habit_log WHERE habit_id = ? AND date >= ? AND date <= ?",
+     (3, date(2026, 5, 1), date(2026, 5, 31))),
+]
+
+TYPES = ["INBOX", "CURRENT", "SOMEDAY", "CALENDAR", "REST", "ROUTINE"]
+
+
+def populate(conn, users, tasks_per_user, habits, days):
+    rnd = random.Random(42)
+    rows = []
+    for user_id in range(1, users + 1):
+        for _ in range(tasks_per_user):
+            sparse = rnd.random()
+            rows.append((
+                user_id, "task", "DONE" if rnd.random() < 0.8 else "OPEN", rnd.choice(TYPES),
+                NOW + timedelta(minutes=rnd.randint(-10**6, 10**6)) if sparse < 0.2 else None,
+                NOW + timedelta(minutes=rnd.randint(-600, 600)) if sparse < 0.01 else None,
+                NOW + timedelta(minutes=rnd.randint(-600, 600)) if 0.01 <= sparse < 0.02 else None,
+                sparse < 0.19,
+            ))
+    conn.executemany(
+        "INSERT INTO task (user_id, title, status, type, planned_start, suspend_due, notify_at, planned_start_notified)"
+        " VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    start = date(2026, 10, 17) - timedelta(days=days)
+    conn.executemany(
+        'INSERT INTO habit_log (habit_id, date, is_done, "index") VALUES (?, ?, ?, ?)',
+        ((h, start + timedelta(days=d), True, i) for h in range(1, habits + 1) for d in range(days) for i in range(2)))
+    conn.commit()
+
+
+def report(conn, label, repeat):
+    print(f"=== {label} ===")
+    for name, sql, params in QUERIES:
+        plan = "; ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+        started = time.perf_counter()
+        for _ in range(repeat):
+            conn.execute(sql, params).fetchall()
+        elapsed = (time.perf_counter() - started) / repeat * 1000
+        print(f"{name:<32} {elapsed:8.3f} ms  {plan}")
+    print()
+
+
+def main(args):
+    sqlite3.register_adapter(datetime, lambda v: v.isoformat(" "))
+    sqlite3.register_adapter(date, lambda v: v.isoformat())
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, "bench.db"))
+        conn.executescript(SCHEMA)
+        populate(conn, args.users, args.tasks_per_user, args.habits, args.days)
+        conn.execute("ANALYZE")
+        report(conn, "before", args.repeat)
+        conn.executescript(INDEXES)
+        conn.execute("ANALYZE")
+        report(conn, "after", args.repeat)
+        conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--tasks-per-user", type=int, default=2000)
+    parser.add_argument("--habits", type=int, default=200)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--repeat", type=int, default=20)
+    main(parser.parse_args())
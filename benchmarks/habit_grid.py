@@ -0,0 +1,103 @@
+"""Builds a habit's status grid over a long range with the original per-day
+dict walk and with the HabitGrid bitset, and checks both agree.
+
+In-process, with synthetic logs (no database needed):
+
+    python benchmarks/habit_grid.py --years 5 --frequency 3 --repeat 5
+
+"legacy" is the former HabitService._build_dates_with_status: a (day, index)
+dict over the ORM logs, then one lookup per slot. "grid" builds the bitset
+from the done (date, index) pairs; "packed" builds it from the
+habit_log_month (month, index, done_mask) rows the service now reads.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.habit_grid import HabitGrid
+
+
+def legacy_dates_with_status(frequency, logs, start_date, end_date):
+    log_dates = {(log.date, log.index): log.is_done for log in logs}
+    dates_with_status = {}
+    for i in range((end_date - start_date).days + 1):
+        day = start_date + timedelta(days=i)
+        if frequency > 1:
+            dates_with_status[day] = [log_dates.get((day, j), False) for j in range(frequency)]
+        else:
+            dates_with_status[day] = log_dates.get((day, 0), False)
+    return dates_with_status
+
+
+def make_logs(start_date, days, frequency, fill):
+    rnd = random.Random(42)
+    return [
+        SimpleNamespace(date=start_date + timedelta(days=i), index=j, is_done=rnd.random() < 0.8)
+        for i in range(days) for j in range(frequency)
+        if rnd.random() < fill
+    ]
+
+
+def pack_months(done):
+    masks = {}
+    for day, index in done:
+        key = (day.replace(day=1), index)
+        masks[key] = masks.get(key, 0) | 1 << (day.day - 1)
+    return [(month, index, mask) for (month, index), mask in masks.items()]
+
+
+def best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def main(args):
+    end_date = date(2026, 10, 17)
+    start_date = end_date - timedelta(days=round(365.25 * args.years) - 1)
+    days = (end_date - start_date).days + 1
+    logs = make_logs(start_date, days, args.frequency, args.fill)
+    done = [(log.date, log.index) for log in logs if log.is_done]
+    months = pack_months(done)
+    slots = days * args.frequency
+    print(f"{args.years} years, frequency {args.frequency}: {days} days, {slots} slots, "
+          f"{len(logs)} logs ({len(done)} done, {len(months)} packed rows), best of {args.repeat}")
+
+    legacy_time, legacy = best_of(args.repeat, lambda: legacy_dates_with_status(args.frequency, logs, start_date, end_date))
+    build_time, grid = best_of(args.repeat, lambda: HabitGrid.from_done(done, start_date, end_date, args.frequency))
+    packed_time, packed = best_of(args.repeat, lambda: HabitGrid.from_month_masks(months, start_date, end_date, args.frequency))
+    dict_time, as_dict = best_of(args.repeat, grid.to_dict)
+    b64_time, bitmap = best_of(args.repeat, grid.to_base64)
+    rle_time, runs = best_of(args.repeat, grid.to_runs)
+    assert as_dict == legacy, "grid.to_dict() disagrees with the legacy walk"
+    assert packed.bitmap == grid.bitmap, "the packed build disagrees with the (date, index) build"
+
+    def report(label, seconds, extra=""):
+        print(f"  {label:<22} {seconds * 1000:8.2f} ms  {seconds / slots * 1e9:7.1f} ns/slot{extra}")
+
+    report("legacy dict", legacy_time)
+    report("grid build", build_time)
+    report("packed build", packed_time, f"  x{build_time / packed_time:.1f} vs grid build")
+    report("grid build + to_dict", build_time + dict_time, f"  x{legacy_time / (build_time + dict_time):.1f}")
+    report("grid build + base64", build_time + b64_time,
+           f"  x{legacy_time / (build_time + b64_time):.1f}, {len(bitmap)} chars")
+    report("grid build + rle", build_time + rle_time,
+           f"  x{legacy_time / (build_time + rle_time):.1f}, {len(runs)} runs")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--frequency", type=int, default=1)
+    parser.add_argument("--fill", type=float, default=0.7, help="share of slots that have a log row")
+    parser.add_argument("--repeat", type=int, default=5)
+    main(parser.parse_args())
@@ -0,0 +1,69 @@
+"""Closed-loop load test for the API: N concurrent clients hammering read endpoints.
+
+Run it once against a build with the sync routers and once against the async
+ones, with the same data and uvicorn settings, and compare req/s:
+
+    python benchmarks/load_test.py --base-url http://localhost:5001 \
+        --username bench --password bench --clients 200 --duration 30
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+DEFAULT_PATHS = ["/tasks/", "/habits/", "/movies/"]
+
+
+async def client_loop(client, paths, headers, deadline, latencies, errors):
+    i = 0
+    while time.perf_counter() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        started = time.perf_counter()
+        try:
+            response = await client.get(path, headers=headers)
+            response.raise_for_status()
+        except httpx.HTTPError:
+            errors.append(path)
+            continue
+        latencies.append((time.perf_counter() - started) * 1000)
+
+
+async def main(args):
+    limits = httpx.Limits(max_connections=args.clients, max_keepalive_connections=args.clients)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60, limits=limits) as client:
+        response = await client.post("/auth/token", data={"username": args.username, "password": args.password})
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        latencies, errors = [], []
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(*(
+            client_loop(client, args.paths, headers, deadline, latencies, errors)
+            for _ in range(args.clients)
+        ))
+        elapsed = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    print(f"clients={args.clients} duration={elapsed:.1f}s paths={','.join(args.paths)}")
+    print(f"requests={len(latencies)} errors={len(errors)} throughput={len(latencies) / elapsed:.1f} req/s")
+    if ordered:
+        print(
+            f"latency p50={statistics.median(ordered):.1f}ms "
+            f"p95={ordered[int(len(ordered) * 0.95) - 1]:.1f}ms "
+            f"p99={ordered[int(len(ordered) * 0.99) - 1]:.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:5001")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--paths", nargs="+", default=DEFAULT_PATHS)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,81 @@
+"""Measures latency of other API endpoints while a burst of logins is in flight.
+
+Run against a live API, e.g.:
+
+    python benchmarks/login_burst.py --base-url http://localhost:5001 \
+        --username bench --password bench --logins 50
+
+The account must exist. Compare the reported p99 before and after moving
+bcrypt off the event loop (or while varying PASSWORD_HASH_WORKERS).
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    k = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[k]
+
+
+async def login(client, username, password):
+    response = await client.post("/auth/token", data={"username": username, "password": password})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def login_burst(client, username, password, count):
+    await asyncio.gather(*(login(client, username, password) for _ in range(count)))
+
+
+async def probe(client, path, headers, stop, latencies):
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await client.get(path, headers=headers)
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - started) * 1000)
+
+
+async def main(args):
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60) as client:
+        token = await login(client, args.username, args.password)
+        headers = {"Authorization": f"Bearer {token}"}
+
+        for label, logins in (("idle", 0), ("login burst", args.logins)):
+            latencies = []
+            stop = asyncio.Event()
+            probes = [
+                asyncio.create_task(probe(client, args.probe_path, headers, stop, latencies))
+                for _ in range(args.probes)
+            ]
+            started = time.perf_counter()
+            if logins:
+                await login_burst(client, args.username, args.password, logins)
+            else:
+                await asyncio.sleep(args.idle_seconds)
+            elapsed = time.perf_counter() - started
+            stop.set()
+            await asyncio.gather(*probes)
+
+            print(
+                f"{label:>12}: {len(latencies)} probe requests in {elapsed:.2f}s  "
+                f"p50={statistics.median(latencies):.1f}ms  "
+                f"p99={percentile(latencies, 99):.1f}ms  "
+                f"max={max(latencies):.1f}ms"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:5001")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--logins", type=int, default=50)
+    parser.add_argument("--probes", type=int, default=4, help="concurrent probe loops")
+    parser.add_argument("--probe-path", default="/auth/me")
+    parser.add_argument("--idle-seconds", type=float, default=3.0)
+    asyncio.run(main(parser.parse_args()))
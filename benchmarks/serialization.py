@@ -0,0 +1,117 @@
+"""Per-row cost of serializing a task list in the API and parsing it in the
+Flask frontend, before and after the single-validation fast path.
+
+Runs in-process against synthetic, detached Task rows (no database needed):
+
+    python benchmarks/serialization.py --rows 10000 --repeat 5
+
+API variants:
+  before   [TaskSchema.model_validate(t) ...] + response_model
+           (FastAPI dumps the models back to dicts and validates them again)
+  orjson   one model_validate pass rendered by ORJSONResponse (if installed)
+  after    ORM rows returned as-is; response_model validates them once and
+           Pydantic writes the JSON bytes directly
+
+Frontend variants:
+  before   response.json() + a new TypeAdapter(List[TaskSchema]) per request
+  after    the cached TASK_LIST_ADAPTER.validate_json(response.content)
+"""
+import argparse
+import os
+import sys
+import time
+import warnings
+from datetime import datetime, timedelta
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+
+from app.models import Task, TaskStatus, TaskType
+from app.schemas import TaskSchema, TASK_LIST_ADAPTER
+
+
+def make_tasks(rows):
+    now = datetime(2026, 10, 17, 12, 0)
+    types = list(TaskType)
+    return [
+        Task(
+            id=i, user_id=1, title=f"Task {i}", details="Lorem ipsum dolor sit amet " * 4,
+            status=TaskStatus.OPEN, type=types[i % len(types)],
+            deadline=now + timedelta(days=i % 30), duration=30,
+            planned_start=now + timedelta(hours=i), planned_end=now + timedelta(hours=i + 1),
+            planned_start_notified=False,
+        )
+        for i in range(rows)
+    ]
+
+
+def make_app(tasks):
+    app = FastAPI()
+
+    @app.get("/before", response_model=List[TaskSchema])
+    def before():
+        return [TaskSchema.model_validate(t) for t in tasks]
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+
+        @app.get("/orjson", response_class=ORJSONResponse)
+        def with_orjson():
+            return ORJSONResponse([TaskSchema.model_validate(t).model_dump() for t in tasks])
+
+    @app.get("/after", response_model=List[TaskSchema])
+    def after():
+        return tasks
+
+    return app
+
+
+def best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def report(label, seconds, rows, baseline=None):
+    per_row = seconds / rows * 1e6
+    speedup = f"  x{baseline / seconds:.1f}" if baseline else ""
+    print(f"  {label:<8} {seconds * 1000:8.1f} ms  {per_row:6.2f} us/row{speedup}")
+
+
+def main(args):
+    tasks = make_tasks(args.rows)
+    client = TestClient(make_app(tasks))
+
+    try:
+        import orjson  # noqa: F401
+        variants = ("before", "orjson", "after")
+    except ImportError:
+        variants = ("before", "after")
+
+    print(f"API response, {args.rows} rows (best of {args.repeat}):")
+    baseline = None
+    for variant in variants:
+        seconds = best_of(args.repeat, lambda: client.get(f"/{variant}").raise_for_status())
+        report(variant, seconds, args.rows, baseline)
+        baseline = baseline or seconds
+
+    body = client.get("/after")
+    print(f"Frontend parse, {args.rows} rows (best of {args.repeat}):")
+    before = best_of(args.repeat, lambda: TypeAdapter(List[TaskSchema]).validate_python(body.json()))
+    report("before", before, args.rows)
+    report("after", best_of(args.repeat, lambda: TASK_LIST_ADAPTER.validate_json(body.content)), args.rows, before)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    main(parser.parse_args())
@@ -13,20 +13,23 @@ from telegram.ext import (
 from app.telegram_bot import (
     start,
     task_list,
+    task_search,
     task_delete,
     task_delete_confirm,
     add_task_start,
     get_title,
     get_notify_choice,
     get_notify_at,
+    get_recurrence,
     CONFIRM_DELETE,
     GET_TITLE,
     GET_NOTIFY_CHOICE,
     GET_NOTIFY_AT,
+    GET_RECURRENCE,
 )
 from app.telegram_utils import send_telegram_message
 from app.models import User
-from app.database import SessionLocal
+from app.database import SessionLocal, report_database_profile
 from config import Config
 
 logging.basicConfig(
@@ -83,6 +86,7 @@ def main():
         "task_list_someday", "task_list_rest", "task_list_routine",
     ]
     application.add_handler(CommandHandler(task_list_commands, task_list))
+    application.add_handler(CommandHandler("task_search", task_search))
 
     delete_conv_handler = ConversationHandler(
         entry_points=[CommandHandler("task_delete", task_delete)],
@@ -102,11 +106,13 @@ def main():
             GET_TITLE: [MessageHandler(filters.TEXT & ~filters.COMMAND, get_title)],
             GET_NOTIFY_CHOICE: [CallbackQueryHandler(get_notify_choice)],
             GET_NOTIFY_AT: [MessageHandler(filters.TEXT & ~filters.COMMAND, get_notify_at)],
+            GET_RECURRENCE: [CallbackQueryHandler(get_recurrence)],
         },
         fallbacks=[],
     )
     application.add_handler(add_conv_handler)
 
+    report_database_profile()
     logger.info("Starting Telegram bot polling...")
     application.run_polling()
 
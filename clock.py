@@ -2,6 +2,7 @@ import logging
 from app.scheduler import init_scheduler
 import time
 from config import Config
+from app.database import report_database_profile
 
 logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s", level=logging.INFO
@@ -10,6 +11,7 @@ logger = logging.getLogger(__name__)
 
 def main():
     logger.info("Starting scheduler process...")
+    report_database_profile()
     init_scheduler()
     # Keep the process alive
     while True:
@@ -10,16 +10,81 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 API_BASE_URL = "http://api:5001" # Internal Docker service name and port
 
+# Transport used by the Flask frontend to reach the API:
+#   'http' - pooled HTTP client to API_BASE_URL (split deployments)
+#   'asgi' - dispatch in-process into the FastAPI app (single-node deployments)
+API_TRANSPORT = os.environ.get('API_TRANSPORT', 'http').lower()
+
+# Pooled HTTP transport used by the Flask frontend to reach the API
+API_POOL_MAX_CONNECTIONS = int(os.environ.get('API_POOL_MAX_CONNECTIONS', 20))
+API_POOL_MAX_KEEPALIVE = int(os.environ.get('API_POOL_MAX_KEEPALIVE', 10))
+API_POOL_KEEPALIVE_EXPIRY = float(os.environ.get('API_POOL_KEEPALIVE_EXPIRY', 30))
+API_CONNECT_TIMEOUT = float(os.environ.get('API_CONNECT_TIMEOUT', 2))
+API_TIMEOUT = float(os.environ.get('API_TIMEOUT', 10))
+API_HTTP2 = os.environ.get('API_HTTP2', 'false').lower() in ('1', 'true', 'yes')
+
 class Config:
     # Flask-related configurations
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'you-will-never-guess' # This is for Flask's session management
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or \
         'sqlite:///' + os.path.join(basedir, 'data', 'app.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Connection pool (per process, applies to both the sync and async engines).
+    # The async pool hands out connections bound to the event loop that opened
+    # them, so each process must drive the async engine from one loop only:
+    # uvicorn's, or the single loop thread of the in-process ASGI transport
+    # (API_TRANSPORT=asgi).
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 30))
+    # SQLite connection profile, applied once per new connection
+    SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE', 'WAL')
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
+    SQLITE_CACHE_SIZE = int(os.environ.get('SQLITE_CACHE_SIZE', -16000)) # negative = KiB, i.e. 16 MB
+    SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', 128 * 1024 * 1024))
+    SQLITE_TEMP_STORE = os.environ.get('SQLITE_TEMP_STORE', 'MEMORY')
+    SQLITE_FOREIGN_KEYS = os.environ.get('SQLITE_FOREIGN_KEYS', 'true').lower() in ('1', 'true', 'yes')
     PERMANENT_SESSION_LIFETIME = 5400
+    # Seconds the frontend trusts the identity (role) kept in the signed session
+    # before re-checking it with the API's /auth/me; admin-only pages always re-check by default
+    IDENTITY_MAX_AGE = int(os.environ.get('IDENTITY_MAX_AGE', 300))
+    ADMIN_IDENTITY_MAX_AGE = int(os.environ.get('ADMIN_IDENTITY_MAX_AGE', 0))
     TELEGRAM_BOT_TOKEN = os.environ.get('TELEGRAM_BOT_TOKEN')
     TELEGRAM_BOT_USERNAME = os.environ.get('TELEGRAM_BOT_USERNAME')
     TELEGRAM_ADMIN_CHAT_ID = os.environ.get('TELEGRAM_ADMIN_CHAT_ID', None)
     REDIS_URL = os.environ.get('REDIS_URL') or 'redis://'
+    # Authenticated-principal cache used by the API's get_current_user.
+    # 'memory' keeps a per-process LRU only; 'redis' also shares entries (and
+    # invalidations) between processes, with the LRU in front as a short-lived L1.
+    # With 'memory', invalidations made by other API workers, the CLI or the
+    # bot are not seen until PRINCIPAL_CACHE_TTL; the API warns at startup when
+    # API_WORKERS > 1.
+    PRINCIPAL_CACHE_BACKEND = os.environ.get('PRINCIPAL_CACHE_BACKEND', 'memory').lower()
+    PRINCIPAL_CACHE_TTL = int(os.environ.get('PRINCIPAL_CACHE_TTL', 60))
+    PRINCIPAL_CACHE_LOCAL_TTL = int(os.environ.get('PRINCIPAL_CACHE_LOCAL_TTL', 5))
+    PRINCIPAL_CACHE_MAX_SIZE = int(os.environ.get('PRINCIPAL_CACHE_MAX_SIZE', 1024))
+    # API worker processes, as passed to uvicorn/gunicorn through WEB_CONCURRENCY
+    API_WORKERS = int(os.environ.get('WEB_CONCURRENCY', 1))
+    # Cache of GET /habits/heatmap responses per (user, year), dropped when the
+    # user logs or edits a habit. It is single-process: with API_WORKERS > 1 the
+    # other workers keep serving their copy for up to HABIT_HEATMAP_CACHE_TTL,
+    # which is why the default is short; the API warns at startup in that case.
+    HABIT_HEATMAP_CACHE_TTL = int(os.environ.get('HABIT_HEATMAP_CACHE_TTL', 30))
+    HABIT_HEATMAP_CACHE_MAX_SIZE = int(os.environ.get('HABIT_HEATMAP_CACHE_MAX_SIZE', 1024))
+    # Max concurrent bcrypt hash/verify operations run off the API event loop
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+    # Task/movie imports: items validated and inserted per transaction, and the
+    # upload size (bytes) above which the frontend hands the file to an RQ job
+    IMPORT_CHUNK_SIZE = int(os.environ.get('IMPORT_CHUNK_SIZE', 1000))
+    IMPORT_BACKGROUND_THRESHOLD = int(os.environ.get('IMPORT_BACKGROUND_THRESHOLD', 1024 * 1024))
+    IMPORT_UPLOAD_DIR = os.environ.get('IMPORT_UPLOAD_DIR') or os.path.join(basedir, 'data', 'imports')
+    IMPORT_JOB_TIMEOUT = int(os.environ.get('IMPORT_JOB_TIMEOUT', 3600))
+    # Text search configuration used by the Postgres search backend (SQLite uses FTS5)
+    SEARCH_TEXT_CONFIG = os.environ.get('SEARCH_TEXT_CONFIG', 'simple')
+    # Cold tier: DONE/ARCHIVED tasks closed for longer than this move to task_archive
+    TASK_ARCHIVE_AFTER_DAYS = int(os.environ.get('TASK_ARCHIVE_AFTER_DAYS', 30))
+    TASK_ARCHIVE_BATCH_SIZE = int(os.environ.get('TASK_ARCHIVE_BATCH_SIZE', 500))
+    TASK_ARCHIVE_INTERVAL_MINUTES = int(os.environ.get('TASK_ARCHIVE_INTERVAL_MINUTES', 60))
 
 
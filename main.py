@@ -1,8 +1,18 @@
 from fastapi import FastAPI
 from app.api import habits, movies, tasks, auth, admin, telegram
+from app.auth.principal_cache import principal_cache
+from app.database import report_database_profile
+from app.services.habit_heatmap_service import heatmap_cache
+from config import Config
 
 app = FastAPI()
 
+@app.on_event("startup")
+def log_database_profile():
+    report_database_profile()
+    principal_cache.report_backend(Config.API_WORKERS)
+    heatmap_cache.report_workers(Config.API_WORKERS)
+
 app.include_router(habits.router)
 app.include_router(movies.router)
 app.include_router(tasks.router)
@@ -22,11 +22,21 @@ logger = logging.getLogger('alembic.env')
 # for 'autogenerate' support
 from app.database import Base
 # Import all models to ensure they are registered with Base
-from app.models import User, Task, Habit, HabitLog, Movie 
+from app.models import User, Task, TaskArchive, TaskOccurrence, Habit, HabitLogMonth, HabitStats, Movie
 from config import Config
 
 target_metadata = Base.metadata
 
+
+def include_name(name, type_, parent_names):
+    # Full-text search objects (FTS5 tables and their shadow tables, Postgres
+    # GIN indexes) are managed by the add_full_text_search migration, not autogenerate
+    if type_ == "table":
+        return "_fts" not in name
+    if type_ == "index":
+        return not name.endswith("_search")
+    return True
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -49,6 +59,7 @@ def run_migrations_offline():
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_name=include_name,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -64,17 +75,26 @@ def run_migrations_online():
     and associate a connection with the context.
 
     """
+    # A caller may pass its own connection, e.g. tests migrating a scratch database
+    connection = config.attributes.get('connection')
+    if connection is not None:
+        _run_migrations(connection)
+        return
+
     from app.database import engine
 
-    connectable = engine
+    with engine.connect() as connection:
+        _run_migrations(connection)
+
 
-    with connectable.connect() as connection:
-        context.configure(
-            connection=connection, target_metadata=target_metadata
-        )
+def _run_migrations(connection):
+    context.configure(
+        connection=connection, target_metadata=target_metadata,
+        include_name=include_name,
+    )
 
-        with context.begin_transaction():
-            context.run_migrations()
+    with context.begin_transaction():
+        context.run_migrations()
 
 
 if context.is_offline_mode():
@@ -0,0 +1,75 @@
+"""add full text search
+
+Revision ID: 3c1e2f7a9b40
+Revises: f08751ea9eee
+Create Date: 2026-10-17 14:02:37.551904
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from config import Config
+
+
+# revision identifiers, used by Alembic.
+revision = '3c1e2f7a9b40'
+down_revision = 'f08751ea9eee'
+branch_labels = None
+depends_on = None
+
+# table -> searchable columns, see app/services/search_service.py:SEARCH_FIELDS
+SEARCH_FIELDS = {
+    'task': ('title', 'details'),
+    'movie': ('title', 'comment'),
+}
+
+
+def _sqlite_upgrade(table, fields):
+    fts = f'{table}_fts'
+    columns = ', '.join(fields)
+    new_values = ', '.join(f'new.{field}' for field in fields)
+    old_values = ', '.join(f'old.{field}' for field in fields)
+    op.execute(
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({columns}, content='{table}', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    )
+    # External-content table: the triggers keep it in sync with every write,
+    # including bulk inserts and set-based updates that bypass the ORM
+    op.execute(
+        f"CREATE TRIGGER {table}_fts_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values}); END"
+    )
+    op.execute(
+        f"CREATE TRIGGER {table}_fts_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); END"
+    )
+    op.execute(
+        f"CREATE TRIGGER {table}_fts_au AFTER UPDATE OF {columns} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values}); END"
+    )
+    op.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def _postgresql_document(fields):
+    text = " || ' ' || ".join(f"coalesce({field}, '')" for field in fields)
+    return f"to_tsvector('{Config.SEARCH_TEXT_CONFIG}'::regconfig, {text})"
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    for table, fields in SEARCH_FIELDS.items():
+        if dialect == 'sqlite':
+            _sqlite_upgrade(table, fields)
+        elif dialect == 'postgresql':
+            op.execute(f"CREATE INDEX ix_{table}_search ON {table} USING gin ({_postgresql_document(fields)})")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    for table in SEARCH_FIELDS:
+        if dialect == 'sqlite':
+            for suffix in ('ai', 'ad', 'au'):
+                op.execute(f"DROP TRIGGER IF EXISTS {table}_fts_{suffix}")
+            op.execute(f"DROP TABLE IF EXISTS {table}_fts")
+        elif dialect == 'postgresql':
+            op.execute(f"DROP INDEX IF EXISTS ix_{table}_search")
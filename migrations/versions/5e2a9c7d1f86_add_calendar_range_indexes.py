@@ -0,0 +1,29 @@
+"""add calendar range indexes
+
+Revision ID: 5e2a9c7d1f86
+Revises: b7d4e1c2a6f3
+Create Date: 2026-10-17 16:05:48.310962
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e2a9c7d1f86'
+down_revision = 'b7d4e1c2a6f3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # GET /tasks/calendar?start=&end= overlap query, one index per branch of the OR
+    for table in ('task', 'task_archive'):
+        op.create_index(f'ix_{table}_user_id_planned_start', table, ['user_id', 'planned_start'], unique=False)
+        op.create_index(f'ix_{table}_user_id_planned_end', table, ['user_id', 'planned_end'], unique=False)
+
+
+def downgrade():
+    for table in ('task_archive', 'task'):
+        op.drop_index(f'ix_{table}_user_id_planned_end', table_name=table)
+        op.drop_index(f'ix_{table}_user_id_planned_start', table_name=table)
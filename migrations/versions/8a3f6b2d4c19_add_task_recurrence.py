@@ -0,0 +1,48 @@
+"""add task recurrence
+
+Revision ID: 8a3f6b2d4c19
+Revises: 5e2a9c7d1f86
+Create Date: 2026-10-17 17:12:30.442018
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8a3f6b2d4c19'
+down_revision = '5e2a9c7d1f86'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    for table in ('task', 'task_archive'):
+        op.add_column(table, sa.Column('recurrence', sa.String(length=255), nullable=True))
+        op.add_column(table, sa.Column('recurrence_start', sa.DateTime(), nullable=True))
+        op.add_column(table, sa.Column('next_occurrence', sa.DateTime(), nullable=True))
+
+    # Scheduler scan for due occurrences; partial so it only holds recurring tasks
+    op.create_index('ix_task_next_occurrence', 'task', ['next_occurrence'], unique=False,
+                    sqlite_where=sa.text('next_occurrence IS NOT NULL'),
+                    postgresql_where=sa.text('next_occurrence IS NOT NULL'))
+
+    op.create_table('task_occurrence',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('occurrence', sa.DateTime(), nullable=False),
+    sa.Column('completed_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('uq_task_occurrence_task_id_occurrence', 'task_occurrence', ['task_id', 'occurrence'], unique=True)
+
+
+def downgrade():
+    op.drop_index('uq_task_occurrence_task_id_occurrence', table_name='task_occurrence')
+    op.drop_table('task_occurrence')
+    op.drop_index('ix_task_next_occurrence', table_name='task')
+    # Plain ALTER TABLE (SQLite >= 3.35): a batch rebuild would drop the FTS triggers
+    for table in ('task_archive', 'task'):
+        op.drop_column(table, 'next_occurrence')
+        op.drop_column(table, 'recurrence_start')
+        op.drop_column(table, 'recurrence')
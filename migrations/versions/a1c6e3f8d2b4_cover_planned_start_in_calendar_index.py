@@ -0,0 +1,34 @@
+"""cover planned_start in the calendar planned_end index
+
+Revision ID: a1c6e3f8d2b4
+Revises: d2a7c5e9f3b1
+Create Date: 2026-10-18 15:20:11.604218
+
+The calendar's running-at-start query filters on planned_end >= start and
+planned_start < start. With planned_start in the (user_id, planned_end) index
+SQLite checks both bounds there and only reads the overlapping rows, instead
+of choosing an open-ended scan of (user_id, planned_start).
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1c6e3f8d2b4'
+down_revision = 'd2a7c5e9f3b1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    for table in ('task', 'task_archive'):
+        op.drop_index(f'ix_{table}_user_id_planned_end', table_name=table)
+        op.create_index(f'ix_{table}_user_id_planned_end', table, ['user_id', 'planned_end', 'planned_start'],
+                        unique=False)
+
+
+def downgrade():
+    for table in ('task_archive', 'task'):
+        op.drop_index(f'ix_{table}_user_id_planned_end', table_name=table)
+        op.create_index(f'ix_{table}_user_id_planned_end', table, ['user_id', 'planned_end'], unique=False)
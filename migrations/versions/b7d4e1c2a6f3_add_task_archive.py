@@ -0,0 +1,103 @@
+"""add task archive
+
+Revision ID: b7d4e1c2a6f3
+Revises: 3c1e2f7a9b40
+Create Date: 2026-10-17 15:20:11.084377
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from config import Config
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d4e1c2a6f3'
+down_revision = '3c1e2f7a9b40'
+branch_labels = None
+depends_on = None
+
+SEARCH_COLUMNS = ('title', 'details')
+
+
+def _sqlite_create_fts():
+    # Same layout as task_fts (see 3c1e2f7a9b40_add_full_text_search.py)
+    op.execute(
+        "CREATE VIRTUAL TABLE task_archive_fts USING fts5(title, details, content='task_archive', "
+        "content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    )
+    op.execute(
+        "CREATE TRIGGER task_archive_fts_ai AFTER INSERT ON task_archive BEGIN "
+        "INSERT INTO task_archive_fts(rowid, title, details) VALUES (new.id, new.title, new.details); END"
+    )
+    op.execute(
+        "CREATE TRIGGER task_archive_fts_ad AFTER DELETE ON task_archive BEGIN "
+        "INSERT INTO task_archive_fts(task_archive_fts, rowid, title, details) "
+        "VALUES ('delete', old.id, old.title, old.details); END"
+    )
+    op.execute(
+        "CREATE TRIGGER task_archive_fts_au AFTER UPDATE OF title, details ON task_archive BEGIN "
+        "INSERT INTO task_archive_fts(task_archive_fts, rowid, title, details) "
+        "VALUES ('delete', old.id, old.title, old.details); "
+        "INSERT INTO task_archive_fts(rowid, title, details) VALUES (new.id, new.title, new.details); END"
+    )
+
+
+def upgrade():
+    op.add_column('task', sa.Column('closed_at', sa.DateTime(), nullable=True))
+    op.create_index('ix_task_closed_at', 'task', ['closed_at'], unique=False,
+                    sqlite_where=sa.text('closed_at IS NOT NULL'),
+                    postgresql_where=sa.text('closed_at IS NOT NULL'))
+
+    op.create_table('task_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('title', sa.String(length=140), nullable=True),
+    sa.Column('details', sa.Text(), nullable=True),
+    sa.Column('status', sa.Enum('OPEN', 'DONE', 'ARCHIVED', name='taskstatus'), nullable=False),
+    sa.Column('type', sa.Enum('INBOX', 'CURRENT', 'SOMEDAY', 'CALENDAR', 'REST', 'ROUTINE', name='tasktype'), nullable=False),
+    sa.Column('deadline', sa.DateTime(), nullable=True),
+    sa.Column('duration', sa.Integer(), nullable=True),
+    sa.Column('planned_start', sa.DateTime(), nullable=True),
+    sa.Column('planned_end', sa.DateTime(), nullable=True),
+    sa.Column('suspend_due', sa.DateTime(), nullable=True),
+    sa.Column('notify_at', sa.DateTime(), nullable=True),
+    sa.Column('planned_start_notified', sa.Boolean(), nullable=True),
+    sa.Column('closed_at', sa.DateTime(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_task_archive_user_id_id', 'task_archive', ['user_id', 'id'], unique=False)
+
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        _sqlite_create_fts()
+    elif dialect == 'postgresql':
+        document = " || ' ' || ".join(f"coalesce({column}, '')" for column in SEARCH_COLUMNS)
+        op.execute(
+            f"CREATE INDEX ix_task_archive_search ON task_archive "
+            f"USING gin (to_tsvector('{Config.SEARCH_TEXT_CONFIG}'::regconfig, {document}))"
+        )
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for suffix in ('ai', 'ad', 'au'):
+            op.execute(f"DROP TRIGGER IF EXISTS task_archive_fts_{suffix}")
+        op.execute("DROP TABLE IF EXISTS task_archive_fts")
+    elif dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_task_archive_search")
+
+    # Bring archived rows back so downgrading loses no data
+    op.execute(
+        "INSERT INTO task (id, user_id, title, details, status, type, deadline, duration, planned_start, "
+        "planned_end, suspend_due, notify_at, planned_start_notified, closed_at) "
+        "SELECT id, user_id, title, details, status, type, deadline, duration, planned_start, "
+        "planned_end, suspend_due, notify_at, planned_start_notified, closed_at FROM task_archive"
+    )
+    op.drop_index('ix_task_archive_user_id_id', table_name='task_archive')
+    op.drop_table('task_archive')
+    op.drop_index('ix_task_closed_at', table_name='task')
+    # Plain ALTER TABLE (SQLite >= 3.35): a batch rebuild would drop the task_fts triggers
+    op.drop_column('task', 'closed_at')
@@ -0,0 +1,36 @@
+"""add habit stats
+
+Revision ID: c4f1a8e2b7d5
+Revises: 8a3f6b2d4c19
+Create Date: 2026-10-17 22:31:05.118407
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4f1a8e2b7d5'
+down_revision = '8a3f6b2d4c19'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Rows are filled lazily on first read or log, or all at once with
+    # `flask habit-stats rebuild`
+    op.create_table('habit_stats',
+    sa.Column('habit_id', sa.Integer(), nullable=False),
+    sa.Column('completed_days', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('current_streak', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('current_streak_end', sa.Date(), nullable=True),
+    sa.Column('longest_streak', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('longest_streak_end', sa.Date(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['habit_id'], ['habit.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('habit_id')
+    )
+
+
+def downgrade():
+    op.drop_table('habit_stats')
@@ -0,0 +1,81 @@
+"""never reuse task ids
+
+Revision ID: d2a7c5e9f3b1
+Revises: e6b9d3f1a2c8
+Create Date: 2026-10-18 10:12:45.318062
+
+Archived tasks keep their id in task_archive, so the task table must never
+hand out an id again once its row moved to the cold tier. SQLite reuses the
+highest rowid after it is deleted unless the key is AUTOINCREMENT, which needs
+a table rebuild; the sequence is seeded from both tiers.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.schema import CreateTable
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2a7c5e9f3b1'
+down_revision = 'e6b9d3f1a2c8'
+branch_labels = None
+depends_on = None
+
+MAX_TASK_ID = "SELECT max(coalesce((SELECT max(id) FROM task), 0), coalesce((SELECT max(id) FROM task_archive), 0))"
+
+
+def _renumber_colliding_tasks():
+    """Moves hot tasks that share their id with an archived task to fresh ids.
+
+    Completed occurrences follow the hot task, which is the one the API
+    resolved the shared id to.
+    """
+    offset = op.get_bind().exec_driver_sql(MAX_TASK_ID).scalar()
+    colliding = "SELECT id FROM task WHERE id IN (SELECT id FROM task_archive)"
+    op.execute(f"UPDATE task_occurrence SET task_id = task_id + {offset} WHERE task_id IN ({colliding})")
+    op.execute(f"UPDATE task SET id = id + {offset} WHERE id IN (SELECT id FROM task_archive)")
+
+
+def _sqlite_rebuild_task(autoincrement):
+    """Recreates task with or without AUTOINCREMENT, following SQLite's
+    generalized ALTER TABLE procedure.
+
+    A batch operation would lose the task_fts triggers and the partial index
+    conditions, so the dependent objects are restored from their own DDL.
+    """
+    bind = op.get_bind()
+    dependents = bind.exec_driver_sql(
+        "SELECT sql FROM sqlite_master WHERE tbl_name = 'task' AND type IN ('index', 'trigger') AND sql IS NOT NULL"
+    ).scalars().all()
+    metadata = sa.MetaData()
+    task = sa.Table('task', metadata, autoload_with=bind)
+    rebuilt = task.to_metadata(metadata, name='task_rebuild')
+    rebuilt.dialect_options['sqlite']['autoincrement'] = autoincrement
+
+    columns = ', '.join(column.name for column in task.columns)
+    op.execute(CreateTable(rebuilt))
+    op.execute(f"INSERT INTO task_rebuild ({columns}) SELECT {columns} FROM task")
+    op.execute("DROP TABLE task")
+    op.execute("ALTER TABLE task_rebuild RENAME TO task")
+    for sql in dependents:
+        op.execute(sql)
+    # Renumbered rows kept their old task_fts rowids
+    op.execute("INSERT INTO task_fts(task_fts) VALUES ('rebuild')")
+
+
+def upgrade():
+    _renumber_colliding_tasks()
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        _sqlite_rebuild_task(autoincrement=True)
+        op.execute("DELETE FROM sqlite_sequence WHERE name = 'task'")
+        op.execute(f"INSERT INTO sqlite_sequence (name, seq) VALUES ('task', ({MAX_TASK_ID}))")
+    elif dialect == 'postgresql':
+        # SERIAL never reuses ids; only make sure it is ahead of the archive
+        op.execute(f"SELECT setval(pg_get_serial_sequence('task', 'id'), greatest(({MAX_TASK_ID}), 1))")
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'sqlite':
+        _sqlite_rebuild_task(autoincrement=False)
+        op.execute("DELETE FROM sqlite_sequence WHERE name = 'task'")
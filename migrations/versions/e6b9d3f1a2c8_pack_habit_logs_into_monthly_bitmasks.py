@@ -0,0 +1,93 @@
+"""pack habit logs into monthly bitmasks
+
+Revision ID: e6b9d3f1a2c8
+Revises: c4f1a8e2b7d5
+Create Date: 2026-10-17 23:48:12.504219
+
+"""
+from datetime import timedelta
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e6b9d3f1a2c8'
+down_revision = 'c4f1a8e2b7d5'
+branch_labels = None
+depends_on = None
+
+habit = sa.table('habit', sa.column('id', sa.Integer))
+habit_log = sa.table(
+    'habit_log',
+    sa.column('habit_id', sa.Integer),
+    sa.column('date', sa.Date),
+    sa.column('is_done', sa.Boolean),
+    sa.column('index', sa.Integer),
+)
+habit_log_month = sa.table(
+    'habit_log_month',
+    sa.column('habit_id', sa.Integer),
+    sa.column('month', sa.Date),
+    sa.column('index', sa.Integer),
+    sa.column('done_mask', sa.Integer),
+)
+
+
+def upgrade():
+    op.create_table('habit_log_month',
+    sa.Column('habit_id', sa.Integer(), nullable=False),
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('index', sa.Integer(), nullable=False),
+    sa.Column('done_mask', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['habit_id'], ['habit.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('habit_id', 'month', 'index')
+    )
+
+    # Only done logs carry information; logs detached from deleted habits are dropped
+    masks = {}
+    rows = op.get_bind().execute(
+        sa.select(habit_log.c.habit_id, habit_log.c.date, habit_log.c.index).where(
+            habit_log.c.is_done.is_(True),
+            habit_log.c.date.isnot(None),
+            habit_log.c.habit_id.in_(sa.select(habit.c.id)),
+        )
+    )
+    for habit_id, day, index in rows:
+        key = (habit_id, day.replace(day=1), index or 0)
+        masks[key] = masks.get(key, 0) | 1 << (day.day - 1)
+    if masks:
+        op.bulk_insert(habit_log_month, [
+            {'habit_id': habit_id, 'month': month, 'index': index, 'done_mask': mask}
+            for (habit_id, month, index), mask in masks.items()
+        ])
+
+    op.drop_index('uq_habit_log_habit_id_date_index', table_name='habit_log')
+    op.drop_table('habit_log')
+
+
+def downgrade():
+    op.create_table('habit_log',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('habit_id', sa.Integer(), nullable=True),
+    sa.Column('date', sa.Date(), nullable=True),
+    sa.Column('is_done', sa.Boolean(), nullable=True),
+    sa.Column('index', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['habit_id'], ['habit.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('uq_habit_log_habit_id_date_index', 'habit_log', ['habit_id', 'date', 'index'], unique=True)
+
+    logs = []
+    rows = op.get_bind().execute(
+        sa.select(habit_log_month.c.habit_id, habit_log_month.c.month, habit_log_month.c.index,
+                  habit_log_month.c.done_mask).where(habit_log_month.c.done_mask != 0)
+    )
+    for habit_id, month, index, mask in rows:
+        for bit in range(31):
+            if mask >> bit & 1:
+                logs.append({'habit_id': habit_id, 'date': month + timedelta(days=bit), 'is_done': True, 'index': index})
+    if logs:
+        op.bulk_insert(habit_log, logs)
+
+    op.drop_table('habit_log_month')
@@ -0,0 +1,27 @@
+"""add task pagination indexes
+
+Revision ID: f08751ea9eee
+Revises: f9615a399b23
+Create Date: 2026-10-17 11:40:05.118230
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f08751ea9eee'
+down_revision = 'f9615a399b23'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keyset pages of GET /tasks/ walk (user_id, sort key, id)
+    op.create_index('ix_task_user_id_id', 'task', ['user_id', 'id'], unique=False)
+    op.create_index('ix_task_user_id_deadline', 'task', ['user_id', 'deadline'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_task_user_id_deadline', table_name='task')
+    op.drop_index('ix_task_user_id_id', table_name='task')
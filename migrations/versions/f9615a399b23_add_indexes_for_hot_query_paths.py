@@ -0,0 +1,53 @@
+"""add indexes for hot query paths
+
+Revision ID: f9615a399b23
+Revises: 08ae6922edf7
+Create Date: 2026-10-17 10:12:41.203518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f9615a399b23'
+down_revision = '08ae6922edf7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # TaskService list filters
+    op.create_index('ix_task_user_id_type', 'task', ['user_id', 'type'], unique=False)
+
+    # Scheduler scans (app/scheduler.py:check_tasks); partial so they only hold pending rows
+    op.create_index('ix_task_suspend_due', 'task', ['suspend_due'], unique=False,
+                    sqlite_where=sa.text('suspend_due IS NOT NULL'),
+                    postgresql_where=sa.text('suspend_due IS NOT NULL'))
+    op.create_index('ix_task_notify_at', 'task', ['notify_at'], unique=False,
+                    sqlite_where=sa.text('notify_at IS NOT NULL'),
+                    postgresql_where=sa.text('notify_at IS NOT NULL'))
+    op.create_index('ix_task_planned_start_notified', 'task', ['planned_start', 'planned_start_notified'], unique=False,
+                    sqlite_where=sa.text('planned_start IS NOT NULL'),
+                    postgresql_where=sa.text('planned_start IS NOT NULL'))
+
+    op.create_index('ix_habit_user_id', 'habit', ['user_id'], unique=False)
+    op.create_index('ix_movie_user_id', 'movie', ['user_id'], unique=False)
+
+    # Collapse duplicate habit logs (keep the latest write) before enforcing uniqueness
+    op.execute('UPDATE habit_log SET "index" = 0 WHERE "index" IS NULL')
+    op.execute(
+        'DELETE FROM habit_log WHERE id NOT IN '
+        '(SELECT MAX(id) FROM habit_log GROUP BY habit_id, date, "index")'
+    )
+    op.create_index('uq_habit_log_habit_id_date_index', 'habit_log', ['habit_id', 'date', 'index'], unique=True)
+
+
+def downgrade():
+    op.drop_index('uq_habit_log_habit_id_date_index', table_name='habit_log')
+    op.drop_index('ix_movie_user_id', table_name='movie')
+    op.drop_index('ix_habit_user_id', table_name='habit')
+    op.drop_index('ix_task_planned_start_notified', table_name='task')
+    op.drop_index('ix_task_notify_at', table_name='task')
+    op.drop_index('ix_task_suspend_due', table_name='task')
+    op.drop_index('ix_task_user_id_type', table_name='task')
@@ -0,0 +1,157 @@
+import os
+import shutil
+import tempfile
+
+# Config reads the environment at import time, so the test database must be
+# chosen before any app module is imported.
+_TEST_DIR = tempfile.mkdtemp(prefix='goat-tests-')
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(_TEST_DIR, 'app.db')
+os.environ['API_TRANSPORT'] = 'asgi'
+os.environ['PRINCIPAL_CACHE_BACKEND'] = 'memory'
+os.environ['IMPORT_UPLOAD_DIR'] = os.path.join(_TEST_DIR, 'imports')
+
+import pytest
+from alembic import command
+from alembic.config import Config as AlembicConfig
+from fastapi.testclient import TestClient
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PASSWORD = 'secret-password'
+
+
+def alembic_config() -> AlembicConfig:
+    config = AlembicConfig()
+    config.set_main_option('script_location', os.path.join(ROOT, 'migrations'))
+    return config
+
+
+@pytest.fixture(scope='session', autouse=True)
+def database():
+    """Migrates the test database to head once; tests share it and are cleaned up after each run."""
+    command.upgrade(alembic_config(), 'head')
+    yield
+    from app.database import engine
+    engine.dispose()
+    shutil.rmtree(_TEST_DIR, ignore_errors=True)
+
+
+@pytest.fixture
+def scratch_engine(tmp_path):
+    """A separate, empty SQLite database for migration tests."""
+    from sqlalchemy import create_engine
+    engine = create_engine(f"sqlite:///{tmp_path / 'scratch.db'}")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def migrate(scratch_engine):
+    """Runs migrate('upgrade' | 'downgrade', revision) against scratch_engine."""
+    def run(direction: str, revision: str):
+        config = alembic_config()
+        with scratch_engine.begin() as connection:
+            config.attributes['connection'] = connection
+            getattr(command, direction)(config, revision)
+    return run
+
+
+@pytest.fixture(autouse=True)
+def clean_database(database):
+    yield
+    from app.database import Base, engine
+    from app.auth.principal_cache import principal_cache
+    from app.services.habit_heatmap_service import heatmap_cache
+    with engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+    principal_cache._local.clear()
+    heatmap_cache.clear()
+
+
+@pytest.fixture
+def db():
+    from app.database import SessionLocal
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture(scope='session')
+def password_hash():
+    from app.services.user_service import UserService
+    return UserService.get_password_hash(PASSWORD)
+
+
+@pytest.fixture
+def make_user(db, password_hash):
+    """Creates a user directly in the database; returns (user, auth headers)."""
+    from app.auth.jwt import create_access_token
+    from app.models import User, UserRole
+
+    def make(username: str = 'alice', role: UserRole = UserRole.USER):
+        user = User(username=username, password_hash=password_hash, role=role)
+        db.add(user)
+        db.commit()
+        token = create_access_token(data={'sub': user.username}, user_id=user.id)
+        return user, {'Authorization': f'Bearer {token}'}
+    return make
+
+
+@pytest.fixture
+def user_and_headers(make_user):
+    return make_user()
+
+
+@pytest.fixture
+def user(user_and_headers):
+    return user_and_headers[0]
+
+
+@pytest.fixture
+def auth_headers(user_and_headers):
+    return user_and_headers[1]
+
+
+@pytest.fixture
+def make_task(db, user):
+    """Creates a task of the default user (or of user=) directly in the database."""
+    from app.models import Task
+
+    def make(title: str = 'task', **fields):
+        owner = fields.pop('user', user)
+        task = Task(title=title, user_id=owner.id, **fields)
+        db.add(task)
+        db.commit()
+        return task
+    return make
+
+
+@pytest.fixture
+def client():
+    from main import app
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def flask_app():
+    from app import create_app
+    app = create_app()
+    app.config.update(TESTING=True)
+    return app
+
+
+@pytest.fixture
+def flask_client(flask_app):
+    return flask_app.test_client()
+
+
+@pytest.fixture
+def login(flask_client, make_user):
+    """Creates a user and logs the Flask client in as them; returns (user, API auth headers)."""
+    def log_in(username: str = 'alice', **kwargs):
+        user, headers = make_user(username, **kwargs)
+        response = flask_client.post('/auth/login', data={'username': username, 'password': PASSWORD})
+        assert response.status_code == 302, response.get_data(as_text=True)
+        return user, headers
+    return log_in
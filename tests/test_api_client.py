@@ -0,0 +1,78 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app import api_client
+from app.models import UserRole
+
+
+class _OkHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def http_api(monkeypatch):
+    """A local keep-alive HTTP server standing in for the API, with a fresh pooled client."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _OkHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(api_client, 'API_TRANSPORT', 'http')
+    monkeypatch.setattr(api_client, 'API_BASE_URL', f'http://127.0.0.1:{server.server_port}')
+    api_client.close_http_client()
+    api_client._reset_after_fork()
+    yield
+    api_client.close_http_client()
+    server.shutdown()
+    server.server_close()
+
+
+def test_client_is_shared_until_closed(http_api):
+    client = api_client.get_http_client()
+    assert api_client.get_http_client() is client
+    api_client.close_http_client()
+    assert api_client.get_http_client() is not client
+
+
+def test_requests_reuse_pooled_connection(http_api):
+    for _ in range(3):
+        assert api_client.make_api_request('GET', '/ping', token='t').json() == {'ok': True}
+
+    stats = api_client.get_pool_stats()
+    assert stats['transport'] == 'http'
+    assert (stats['requests'], stats['misses'], stats['hits']) == (3, 1, 2)
+    assert stats['hit_ratio'] == pytest.approx(2 / 3)
+
+
+def test_unsupported_method_is_rejected():
+    with pytest.raises(ValueError):
+        api_client.make_api_request('TRACE', '/ping')
+
+
+def test_pool_stats_require_admin(flask_client, login):
+    anonymous = flask_client.get('/health/api-pool')
+    assert anonymous.status_code != 200
+    assert b'hit_ratio' not in anonymous.data
+
+    login('bob')
+    response = flask_client.get('/health/api-pool')
+    assert response.status_code == 302
+    assert response.headers['Location'] == '/'
+
+
+def test_pool_stats_for_admin(flask_client, login):
+    login('root', role=UserRole.ADMIN)
+    response = flask_client.get('/health/api-pool')
+    assert response.status_code == 200
+    assert set(response.get_json()) >= {'requests', 'hits', 'misses', 'hit_ratio', 'transport'}
@@ -0,0 +1,75 @@
+import threading
+
+import httpx
+import pytest
+
+from app import api_client
+
+
+@pytest.fixture
+def asgi_client(monkeypatch):
+    monkeypatch.setattr(api_client, 'API_TRANSPORT', 'asgi')
+    api_client.close_http_client()
+    yield api_client.get_http_client()
+    api_client.close_http_client()
+
+
+def test_asgi_transport_dispatches_into_the_api(asgi_client):
+    assert isinstance(asgi_client._transport, api_client.InProcessASGITransport)
+    assert api_client.make_api_request('GET', '/health').json() == {'status': 'ok'}
+
+
+def test_asgi_transport_forwards_auth(asgi_client, user, auth_headers):
+    token = auth_headers['Authorization'].split()[1]
+    assert api_client.make_api_request('GET', '/auth/me', token=token).json()['username'] == user.username
+
+
+def test_asgi_transport_raises_api_errors(asgi_client):
+    with pytest.raises(httpx.HTTPStatusError) as error:
+        api_client.make_api_request('GET', '/auth/me', token='not-a-token')
+    assert error.value.response.status_code == 401
+
+
+def test_asgi_transport_does_not_count_pool_stats(asgi_client):
+    api_client._reset_after_fork()
+    api_client.make_api_request('GET', '/health')
+    assert api_client.get_pool_stats()['requests'] == 0
+
+
+def test_unknown_transport_is_rejected(monkeypatch):
+    monkeypatch.setattr(api_client, 'API_TRANSPORT', 'carrier-pigeon')
+    with pytest.raises(ValueError, match='Unknown API_TRANSPORT'):
+        api_client._build_client()
+
+
+def test_asgi_transport_serves_concurrent_threads(asgi_client, user, auth_headers):
+    token = auth_headers['Authorization'].split()[1]
+    start, results = threading.Barrier(4), []
+
+    def fetch():
+        start.wait()
+        for _ in range(5):
+            results.append(api_client.make_api_request('GET', '/movies/', token=token).status_code)
+
+    threads = [threading.Thread(target=fetch, daemon=True) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+    assert not any(thread.is_alive() for thread in threads)
+    assert results == [200] * 20
+
+
+def test_asgi_transport_loop_is_shared_and_closed_with_the_client(asgi_client):
+    api_client.make_api_request('GET', '/health')
+    transport = asgi_client._transport
+    loop, loop_thread = transport._loop, transport._thread
+
+    caller = threading.Thread(target=api_client.make_api_request, args=('GET', '/health'))
+    caller.start()
+    caller.join(timeout=10)
+    assert transport._loop is loop
+
+    api_client.close_http_client()
+    assert loop.is_closed()
+    assert not loop_thread.is_alive()
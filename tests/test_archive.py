@@ -0,0 +1,133 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select, text
+
+from app import tasks_rq
+from app.models import Task, TaskArchive, TaskStatus
+from app.services.archive_service import ArchiveService
+from app.services.task_service import TaskService
+
+
+def archive(db):
+    return ArchiveService.archive_closed_tasks(db, older_than_days=0)
+
+
+def test_archiving_waits_for_the_grace_period(db, make_task):
+    task = make_task('done', status=TaskStatus.DONE)
+    task_id, now = task.id, datetime(2026, 3, 1)
+    assert ArchiveService.archive_closed_tasks(db, now=now, older_than_days=30) == 0
+    db.expire_all()
+    assert task.closed_at == now
+    assert ArchiveService.archive_closed_tasks(db, now=datetime(2026, 4, 1), older_than_days=30) == 1
+    assert db.get(TaskArchive, task_id).archived_at == datetime(2026, 4, 1)
+
+
+def test_ids_of_archived_tasks_are_not_reused(client, db, auth_headers, make_task):
+    make_task('first')
+    newest_id = make_task('newest', status=TaskStatus.DONE).id
+    archive(db)
+
+    created_id = make_task('created after archiving', status=TaskStatus.DONE).id
+    assert created_id > newest_id
+    assert archive(db) == 1
+    assert db.scalars(select(TaskArchive.id).order_by(TaskArchive.id)).all() == [newest_id, created_id]
+    assert client.get(f'/tasks/{newest_id}', headers=auth_headers).json()['title'] == 'newest'
+
+
+def test_editing_an_archived_task_restores_it(client, db, auth_headers, make_task):
+    task_id = make_task('done', status=TaskStatus.DONE).id
+    archive(db)
+
+    response = client.put(f'/tasks/{task_id}', headers=auth_headers, json={'title': 'reopened', 'status': 'OPEN'})
+    assert response.status_code == 200
+    assert db.get(TaskArchive, task_id) is None
+    task = db.get(Task, task_id)
+    assert (task.title, task.status, task.closed_at) == ('reopened', TaskStatus.OPEN, None)
+
+
+def test_bulk_update_restores_archived_tasks(client, db, auth_headers, make_user, make_task):
+    hot = make_task('hot')
+    archived_id = make_task('archived', status=TaskStatus.DONE).id
+    _, bob = make_user('bob')
+    archive(db)
+
+    # Another user's ids are neither restored nor updated
+    response = client.patch('/tasks/bulk', headers=bob, json={'ids': [archived_id], 'changes': {'type': 'CURRENT'}})
+    assert response.json() == {'results': {str(archived_id): 'not_found'}}
+    assert db.get(TaskArchive, archived_id) is not None
+
+    response = client.patch('/tasks/bulk', headers=auth_headers,
+                            json={'ids': [hot.id, archived_id], 'changes': {'type': 'CURRENT'}})
+    assert response.json() == {'results': {str(hot.id): 'updated', str(archived_id): 'updated'}}
+    db.expire_all()
+    assert db.get(TaskArchive, archived_id) is None
+    restored = db.get(Task, archived_id)
+    assert (restored.type.value, restored.status, restored.closed_at) == ('CURRENT', TaskStatus.DONE, None)
+
+
+@pytest.fixture
+def telegram_messages(monkeypatch):
+    """Collects the (chat_id, text) messages the RQ jobs would send."""
+    sent = []
+    monkeypatch.setattr(tasks_rq, 'send_telegram_message', lambda chat_id, text: (chat_id, text))
+    monkeypatch.setattr(tasks_rq, 'run_async_in_new_loop', sent.append)
+    return sent
+
+
+def test_bot_finds_and_deletes_archived_tasks(db, user, make_task, telegram_messages):
+    task_id = make_task('done', status=TaskStatus.DONE).id
+    user.telegram_chat_id = '42'
+    db.commit()
+    archive(db)
+
+    found = TaskService.get_task(db, task_id, include_archived=True)
+    assert (type(found), found.title) == (TaskArchive, 'done')
+    assert TaskService.get_task(db, task_id) is None
+
+    tasks_rq.delete_task(user.id, task_id)
+    assert telegram_messages == [('42', "Task 'done' deleted successfully.")]
+    db.expire_all()
+    assert db.get(TaskArchive, task_id) is None
+
+
+def test_bot_cannot_delete_another_users_archived_task(db, user, make_user, make_task, telegram_messages):
+    task_id = make_task('done', status=TaskStatus.DONE).id
+    bob, _ = make_user('bob')
+    bob.telegram_chat_id = '7'
+    db.commit()
+    archive(db)
+
+    tasks_rq.delete_task(bob.id, task_id)
+    assert telegram_messages == [('7', 'Task not found or you are not authorized to delete it.')]
+    assert db.get(TaskArchive, task_id) is not None
+
+
+def test_migration_seeds_the_id_sequence_from_the_archive(scratch_engine, migrate):
+    migrate('upgrade', 'e6b9d3f1a2c8')
+    with scratch_engine.begin() as connection:
+        connection.execute(text("INSERT INTO user (id, username) VALUES (1, 'alice')"))
+        connection.execute(text("INSERT INTO task (id, user_id, title, status, type) VALUES "
+                                "(1, 1, 'hot', 'OPEN', 'INBOX'), (3, 1, 'collides', 'OPEN', 'INBOX')"))
+        connection.execute(text("INSERT INTO task_archive (id, user_id, title, status, type, archived_at) VALUES "
+                                "(3, 1, 'archived', 'DONE', 'INBOX', '2026-03-01'), "
+                                "(7, 1, 'newest', 'DONE', 'INBOX', '2026-03-01')"))
+        connection.execute(text("INSERT INTO task_occurrence (task_id, occurrence, completed_at) "
+                                "VALUES (3, '2026-03-01', '2026-03-01')"))
+
+    migrate('upgrade', 'head')
+    with scratch_engine.begin() as connection:
+        # The hot task that already shared id 3 with the archive moved past it, with its occurrence
+        assert connection.execute(text("SELECT id, title FROM task ORDER BY id")).all() == [(1, 'hot'), (10, 'collides')]
+        assert connection.execute(text("SELECT task_id FROM task_occurrence")).scalar() == 10
+        assert connection.execute(text("SELECT rowid FROM task_fts WHERE task_fts MATCH 'collides'")).scalar() == 10
+        connection.execute(text("INSERT INTO task (user_id, title, status, type) VALUES (1, 'new', 'OPEN', 'INBOX')"))
+        assert connection.execute(text("SELECT id FROM task WHERE title = 'new'")).scalar() == 11
+        assert connection.execute(text("SELECT rowid FROM task_fts WHERE task_fts MATCH 'new'")).scalar() == 11
+        plan = connection.execute(text("EXPLAIN QUERY PLAN SELECT id FROM task WHERE notify_at <= '2026-03-01'")).all()
+        assert 'ix_task_notify_at' in plan[0][-1]
+
+    migrate('downgrade', 'e6b9d3f1a2c8')
+    with scratch_engine.begin() as connection:
+        assert connection.execute(text("SELECT count(*) FROM task")).scalar() == 3
+        assert connection.execute(text("SELECT count(*) FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'task'")).scalar() == 3
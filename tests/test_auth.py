@@ -0,0 +1,58 @@
+import threading
+
+import pytest
+
+from app.services import user_service
+
+
+@pytest.fixture
+def hash_threads(monkeypatch):
+    """Records the thread each bcrypt hash/verify runs on."""
+    threads = []
+    hash_password, verify_password = user_service.pwd_context.hash, user_service.pwd_context.verify
+
+    def hash_(*args, **kwargs):
+        threads.append(threading.current_thread().name)
+        return hash_password(*args, **kwargs)
+
+    def verify(*args, **kwargs):
+        threads.append(threading.current_thread().name)
+        return verify_password(*args, **kwargs)
+
+    monkeypatch.setattr(user_service.pwd_context, 'hash', hash_)
+    monkeypatch.setattr(user_service.pwd_context, 'verify', verify)
+    return threads
+
+
+def register(client, username, password='hunter22'):
+    return client.post('/auth/register', json={'username': username, 'password': password})
+
+
+def test_register_then_login(client, hash_threads):
+    response = register(client, 'alice')
+    assert response.status_code == 201
+    assert response.json()['role'] == 'ADMIN'
+    assert register(client, 'bob').json()['role'] == 'USER'
+
+    token = client.post('/auth/token', data={'username': 'alice', 'password': 'hunter22'})
+    assert token.status_code == 200
+    me = client.get('/auth/me', headers={'Authorization': f"Bearer {token.json()['access_token']}"})
+    assert me.json()['username'] == 'alice'
+
+    # Both hashing on registration and verification on login stay off the event loop
+    assert len(hash_threads) == 3
+    assert all(name.startswith('password-hash') for name in hash_threads)
+
+
+def test_register_rejects_taken_username(client):
+    assert register(client, 'alice').status_code == 201
+    response = register(client, 'alice', 'other-password')
+    assert response.status_code == 400
+    assert response.json()['detail'] == 'Username already registered'
+
+
+@pytest.mark.parametrize('username,password', [('alice', 'wrong-password'), ('nobody', 'hunter22')])
+def test_login_rejects_bad_credentials(client, username, password):
+    register(client, 'alice')
+    response = client.post('/auth/token', data={'username': username, 'password': password})
+    assert response.status_code == 401
@@ -0,0 +1,40 @@
+import pytest
+
+from app import cache as cache_module
+from app.cache import LRUCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(max_size=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c')) == (1, 3)
+
+
+def test_lru_entries_expire(clock):
+    cache = LRUCache(max_size=2, ttl=10)
+    cache.set('a', 1)
+    clock[0] += 9
+    assert cache.get('a') == 1
+    clock[0] += 2
+    assert cache.get('a') is None
+
+
+def test_lru_delete_and_clear():
+    cache = LRUCache(max_size=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.delete('a')
+    assert (cache.get('a'), cache.get('b')) == (None, 2)
+    cache.clear()
+    assert cache.get('b') is None
@@ -0,0 +1,62 @@
+from datetime import datetime
+
+import pytest
+
+from app.models import TaskStatus
+from app.services.archive_service import ArchiveService
+from app.services.task_service import CALENDAR_MAX_RANGE_DAYS
+
+WINDOW = {'start': '2026-03-02T00:00:00', 'end': '2026-03-09T00:00:00'}
+
+
+def calendar(client, headers, **params):
+    response = client.get('/tasks/calendar', headers=headers, params=dict(WINDOW, **params))
+    assert response.status_code == 200, response.text
+    return [task['title'] for task in response.json()]
+
+
+def test_feed_returns_tasks_overlapping_the_window(client, auth_headers, make_task):
+    make_task('inside', planned_start=datetime(2026, 3, 4, 9), planned_end=datetime(2026, 3, 4, 10))
+    make_task('running at start', planned_start=datetime(2026, 2, 27), planned_end=datetime(2026, 3, 3))
+    make_task('no end, starts inside', planned_start=datetime(2026, 3, 2))
+    make_task('ended before', planned_start=datetime(2026, 2, 20), planned_end=datetime(2026, 3, 1, 23))
+    make_task('starts at end', planned_start=datetime(2026, 3, 9))
+    make_task('not planned')
+    assert calendar(client, auth_headers) == ['running at start', 'no end, starts inside', 'inside']
+
+
+def test_feed_converts_aware_bounds_to_utc(client, auth_headers, make_task):
+    make_task('late evening utc', planned_start=datetime(2026, 3, 1, 23, 30))
+    assert calendar(client, auth_headers, start='2026-03-02T00:00:00+01:00', end='2026-03-03T00:00:00+01:00') == [
+        'late evening utc'
+    ]
+
+
+def test_feed_can_include_archived_tasks(client, db, auth_headers, make_task):
+    make_task('done', status=TaskStatus.DONE, planned_start=datetime(2026, 3, 3))
+    ArchiveService.archive_closed_tasks(db, older_than_days=0)
+    assert calendar(client, auth_headers) == []
+    assert calendar(client, auth_headers, include_archived=True) == ['done']
+
+
+@pytest.mark.parametrize('params', [
+    {'start': '2026-03-09T00:00:00', 'end': '2026-03-02T00:00:00'},
+    {'start': '2026-01-01T00:00:00', 'end': f'{2026 + CALENDAR_MAX_RANGE_DAYS // 365 + 1}-01-01T00:00:00'},
+    {'start': '2026-03-02T00:00:00'},
+], ids=['inverted', 'too-wide', 'unbounded'])
+def test_feed_requires_a_bounded_range(client, auth_headers, params):
+    assert client.get('/tasks/calendar', headers=auth_headers, params=params).status_code == 422
+
+
+def test_events_page_renders_tasks_and_occurrences(flask_client, login, make_task):
+    user, _ = login('carol')
+    make_task('meeting', user=user, planned_start=datetime(2026, 3, 4, 9), planned_end=datetime(2026, 3, 4, 10))
+    make_task('standup', user=user, recurrence='FREQ=WEEKLY', recurrence_start=datetime(2026, 3, 1, 9),
+              planned_start=datetime(2026, 3, 1, 9))
+
+    response = flask_client.get('/calendar/events', query_string=WINDOW)
+    assert response.status_code == 200
+    events = response.get_json()
+    assert [(event['title'], event['start']) for event in events] == [
+        ('meeting', '2026-03-04T09:00:00'), ('standup', '2026-03-08T09:00:00'),
+    ]
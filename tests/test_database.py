@@ -0,0 +1,55 @@
+import asyncio
+import logging
+
+import pytest
+
+from app import database
+from config import Config
+
+# PRAGMA reads report enum-like settings as numbers
+EXPECTED_PRAGMAS = {
+    'journal_mode': Config.SQLITE_JOURNAL_MODE.lower(),
+    'synchronous': 1,  # NORMAL
+    'busy_timeout': Config.SQLITE_BUSY_TIMEOUT_MS,
+    'cache_size': Config.SQLITE_CACHE_SIZE,
+    'temp_store': 2,  # MEMORY
+    'foreign_keys': 1,
+}
+
+
+def test_sync_connections_apply_the_sqlite_profile():
+    with database.engine.connect() as connection:
+        for name, expected in EXPECTED_PRAGMAS.items():
+            assert connection.exec_driver_sql(f'PRAGMA {name}').scalar() == expected, name
+
+
+def test_async_connections_apply_the_sqlite_profile():
+    async def read_pragmas():
+        async with database.async_engine.connect() as connection:
+            pragmas = {name: (await connection.exec_driver_sql(f'PRAGMA {name}')).scalar() for name in EXPECTED_PRAGMAS}
+        # Pooled aiosqlite connections must not outlive this event loop
+        await database.async_engine.dispose()
+        return pragmas
+
+    assert asyncio.run(read_pragmas()) == EXPECTED_PRAGMAS
+
+
+def test_report_database_profile_logs_effective_settings(caplog):
+    with caplog.at_level(logging.INFO, logger='app.database'):
+        database.report_database_profile()
+    assert 'journal_mode=wal' in caplog.text
+    assert f'busy_timeout={Config.SQLITE_BUSY_TIMEOUT_MS}' in caplog.text
+
+
+@pytest.mark.parametrize('uri,expected', [
+    ('sqlite:///app.db', 'sqlite+aiosqlite:///app.db'),
+    ('postgresql+psycopg2://u:p@db/app', 'postgresql+asyncpg://u:p@db/app'),
+    ('postgres://u:p@db/app', 'postgresql+asyncpg://u:p@db/app'),
+])
+def test_async_database_uri(uri, expected):
+    assert database.get_async_database_uri(uri) == expected
+
+
+def test_async_database_uri_rejects_unknown_dialect():
+    with pytest.raises(ValueError, match='No async driver'):
+        database.get_async_database_uri('oracle://db/app')
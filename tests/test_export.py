@@ -0,0 +1,102 @@
+import asyncio
+import csv
+import io
+import json
+
+import pytest
+
+from app.models import Movie, Task, TaskStatus
+from app.services.archive_service import ArchiveService
+from app.services.export_service import EXPORT_FORMATS, ExportService
+
+
+@pytest.fixture
+def tasks(db, make_task):
+    """An open task and an archived one, as {'id', 'title'} dicts."""
+    tasks = [make_task('write "report", draft', details='line one\nline two'), make_task('ship it', status=TaskStatus.DONE)]
+    tasks = [{'id': task.id, 'title': task.title} for task in tasks]
+    ArchiveService.archive_closed_tasks(db, older_than_days=0)
+    return tasks
+
+
+def export(client, headers, path='/tasks/export', **params):
+    response = client.get(path, headers=headers, params=params)
+    assert response.status_code == 200, response.text
+    return response
+
+
+def test_json_export_includes_archived_tasks(client, auth_headers, tasks):
+    response = export(client, auth_headers)
+    assert response.headers['content-type'] == 'application/json; charset=utf-8'
+    rows = response.json()
+    assert [row['id'] for row in rows] == [task['id'] for task in tasks]
+    assert rows[0]['details'] == 'line one\nline two'
+    assert rows[1]['status'] == 'DONE'
+    assert 'user_id' not in rows[0] and 'closed_at' not in rows[0]
+
+
+def test_export_can_skip_archived_tasks(client, auth_headers, tasks):
+    rows = export(client, auth_headers, include_archived=False).json()
+    assert [row['id'] for row in rows] == [tasks[0]['id']]
+
+
+def test_ndjson_export_selects_fields(client, auth_headers, tasks):
+    response = export(client, auth_headers, format='ndjson', fields=['id', 'title'])
+    assert response.headers['content-type'] == 'application/x-ndjson; charset=utf-8'
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines == tasks
+
+
+def test_csv_export_quotes_values(client, auth_headers, tasks):
+    response = export(client, auth_headers, format='csv', fields=['id', 'title', 'details'])
+    assert response.headers['content-type'] == 'text/csv; charset=utf-8'
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert rows[0] == {'id': str(tasks[0]['id']), 'title': 'write "report", draft', 'details': 'line one\nline two'}
+    assert rows[1]['details'] == ''
+
+
+@pytest.mark.parametrize('path,field', [('/tasks/export', 'user_id'), ('/movies/export', 'nope')])
+def test_export_rejects_unknown_fields(client, auth_headers, path, field):
+    response = client.get(path, headers=auth_headers, params={'fields': ['id', field]})
+    assert response.status_code == 422
+
+
+def test_export_is_scoped_to_the_user(client, make_user, tasks):
+    _, bob = make_user('bob')
+    assert export(client, bob).json() == []
+    assert export(client, bob, format='csv').text.strip() == ','.join(ExportService.exportable_fields(Task))
+
+
+def test_movie_export(client, db, user, auth_headers):
+    db.add_all([Movie(title='Alien', rating=9, user_id=user.id), Movie(title='Heat', genre='crime', user_id=user.id)])
+    db.commit()
+    rows = [json.loads(line) for line in export(client, auth_headers, path='/movies/export', format='ndjson').text.splitlines()]
+    assert [row['title'] for row in rows] == ['Alien', 'Heat']
+    assert rows[0].keys() == {'id', 'title', 'genre', 'rating', 'comment'}
+    assert (rows[0]['rating'], rows[1]['genre']) == (9, 'crime')
+
+
+@pytest.mark.parametrize('export_format,expected', [
+    ('json', '[{"id": 1},{"id": 2},{"id": 3}]'),
+    ('ndjson', '{"id": 1}\n{"id": 2}\n{"id": 3}\n'),
+    ('csv', 'id\r\n1\r\n2\r\n3\r\n'),
+])
+def test_encode_joins_batches(export_format, expected):
+    async def batches():
+        for batch in ([{'id': 1}, {'id': 2}], [], [{'id': 3}]):
+            yield batch
+
+    async def encode():
+        return ''.join([chunk async for chunk in ExportService.encode(batches(), ['id'], export_format)])
+
+    assert asyncio.run(encode()) == expected
+
+
+@pytest.mark.parametrize('path', ['/tasks/export', '/movies/export'])
+@pytest.mark.parametrize('requested,served', [('ndjson', 'ndjson'), ('csv', 'csv'), ('xml', 'json')])
+def test_frontend_export_serves_the_api_formats(flask_client, login, path, requested, served):
+    login('carol')
+    response = flask_client.get(path, query_string={'format': requested})
+    assert response.status_code == 200
+    assert response.headers['Content-Disposition'].endswith(f'.{served}')
+    assert response.mimetype == EXPORT_FORMATS[served].split(';')[0]
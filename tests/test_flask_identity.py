@@ -0,0 +1,117 @@
+import time
+
+import pytest
+from sqlalchemy import delete, update
+
+from app import extensions
+from app.auth.identity import SESSION_KEY
+from app.auth.principal_cache import principal_cache
+from app.models import User, UserRole
+
+
+@pytest.fixture
+def opened_sessions(monkeypatch):
+    """Counts DB sessions opened by the Flask frontend itself."""
+    opened = []
+    session_factory = extensions.SessionLocal
+
+    def open_session():
+        opened.append(True)
+        return session_factory()
+
+    monkeypatch.setattr(extensions, 'SessionLocal', open_session)
+    return opened
+
+
+def test_login_stores_identity_in_session(flask_client, login):
+    user, _ = login()
+    with flask_client.session_transaction() as session:
+        identity = dict(session[SESSION_KEY])
+    assert time.time() - identity.pop('checked_at') < 60
+    assert identity == {'id': user.id, 'username': 'alice', 'role': 'USER'}
+
+
+def test_pages_do_not_open_a_db_session(flask_client, login, opened_sessions):
+    login()
+    assert flask_client.get('/habits').status_code == 200
+    assert flask_client.get('/movies').status_code == 200
+    assert opened_sessions == []
+
+
+def test_profile_opens_a_db_session_lazily(flask_client, login, opened_sessions):
+    login()
+    assert flask_client.get('/auth/profile').status_code == 200
+    assert len(opened_sessions) == 1
+
+
+def expire_identity(flask_client):
+    with flask_client.session_transaction() as session:
+        session[SESSION_KEY] = {**session[SESSION_KEY], 'checked_at': 0}
+
+
+def set_role(db, user, role):
+    db.execute(update(User).where(User.id == user.id).values(role=role))
+    db.commit()
+    principal_cache.invalidate(user.id)
+
+
+def test_expired_identity_is_rechecked_with_the_api(flask_client, login, db):
+    user, _ = login()
+    set_role(db, user, UserRole.TRUSTED)
+
+    # Still within IDENTITY_MAX_AGE: the session is trusted as is
+    assert flask_client.get('/habits').status_code == 200
+    with flask_client.session_transaction() as session:
+        assert session[SESSION_KEY]['role'] == 'USER'
+
+    expire_identity(flask_client)
+    assert flask_client.get('/habits').status_code == 200
+    with flask_client.session_transaction() as session:
+        assert session[SESSION_KEY]['role'] == 'TRUSTED'
+        assert time.time() - session[SESSION_KEY]['checked_at'] < 60
+
+
+def test_deleted_user_is_logged_out_once_identity_expires(flask_client, login, db):
+    user, _ = login()
+    db.execute(delete(User).where(User.id == user.id))
+    db.commit()
+    principal_cache.invalidate(user.id)
+
+    expire_identity(flask_client)
+    response = flask_client.get('/')
+    assert response.status_code == 302
+    assert response.headers['Location'] == '/auth/login'
+    with flask_client.session_transaction() as session:
+        assert SESSION_KEY not in session
+
+
+def test_demoted_admin_loses_admin_pages_at_once(flask_client, login, db):
+    user, _ = login('root', role=UserRole.ADMIN)
+    assert flask_client.get('/health/api-pool').status_code == 200
+
+    set_role(db, user, UserRole.USER)
+    response = flask_client.get('/health/api-pool')
+    assert response.status_code == 302
+    assert response.headers['Location'] == '/'
+    with flask_client.session_transaction() as session:
+        assert session[SESSION_KEY]['role'] == 'USER'
+
+
+def test_identity_is_restored_from_the_api_token(flask_client, login):
+    user, _ = login()
+    with flask_client.session_transaction() as session:
+        session.pop(SESSION_KEY)
+
+    # Only the remember-me and access_token cookies are left
+    assert flask_client.get('/habits').status_code == 200
+    with flask_client.session_transaction() as session:
+        assert session[SESSION_KEY]['id'] == user.id
+
+
+def test_logout_forgets_identity(flask_client, login):
+    login()
+    response = flask_client.get('/auth/logout')
+    assert response.status_code == 302
+    with flask_client.session_transaction() as session:
+        assert SESSION_KEY not in session
+    assert flask_client.get_cookie('access_token') is None
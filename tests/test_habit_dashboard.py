@@ -0,0 +1,54 @@
+from datetime import date
+
+
+def create_habit(client, headers, **fields):
+    payload = {'name': 'read', 'strategy_type': 'daily', 'strategy_params': {}, 'start_date': '2026-01-01'}
+    payload.update(fields)
+    response = client.post('/habits/', headers=headers, json=payload)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_dashboard_returns_every_habit_with_its_range(client, auth_headers):
+    daily = create_habit(client, auth_headers)
+    twice = create_habit(client, auth_headers, name='stretch', strategy_params={'frequency': 2})
+    client.post('/habits/log', headers=auth_headers, json={'habit_id': daily['id'], 'date': '2026-03-02', 'is_done': True})
+    client.post('/habits/log', headers=auth_headers,
+                json={'habit_id': twice['id'], 'date': '2026-03-03', 'is_done': True, 'index': 1})
+
+    response = client.get('/habits/dashboard', headers=auth_headers,
+                          params={'start_date': '2026-03-01', 'end_date': '2026-03-03'})
+    assert response.status_code == 200
+    items = {item['habit']['id']: item for item in response.json()}
+    assert set(items) == {daily['id'], twice['id']}
+    assert items[daily['id']]['logs'] == {'2026-03-01': False, '2026-03-02': True, '2026-03-03': False}
+    assert items[twice['id']]['logs'] == {
+        '2026-03-01': [False, False], '2026-03-02': [False, False], '2026-03-03': [False, True],
+    }
+
+
+def test_dashboard_is_scoped_to_the_user(client, make_user):
+    _, alice = make_user('alice')
+    _, bob = make_user('bob')
+    create_habit(client, alice)
+
+    response = client.get('/habits/dashboard', headers=bob, params={'start_date': '2026-03-01', 'end_date': '2026-03-03'})
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+def test_dashboard_rejects_inverted_range(client, auth_headers):
+    response = client.get('/habits/dashboard', headers=auth_headers,
+                          params={'start_date': '2026-03-03', 'end_date': '2026-03-01'})
+    assert response.status_code == 400
+
+
+def test_habits_page_renders_dashboard(flask_client, login, client):
+    _, headers = login()
+    habit = create_habit(client, headers, name='meditate', start_date=date.today().isoformat())
+
+    response = flask_client.get('/habits')
+    assert response.status_code == 200
+    body = response.get_data(as_text=True)
+    assert 'meditate' in body
+    assert f"logHabit('{habit['id']}'" in body
@@ -0,0 +1,76 @@
+import base64
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from app.services.habit_grid import HabitGrid
+from test_habit_dashboard import create_habit
+
+START, END = date(2026, 1, 30), date(2026, 3, 2)
+
+
+def month_masks(done):
+    """Packs (day, index) pairs the way habit_log_month stores them."""
+    masks = {}
+    for day, index in done:
+        key = (day.replace(day=1), index)
+        masks[key] = masks.get(key, 0) | 1 << (day.day - 1)
+    return [(month, index, mask) for (month, index), mask in masks.items()]
+
+
+def test_to_dict_and_runs():
+    grid = HabitGrid.from_done([(date(2026, 1, 31), 0), (date(2026, 2, 1), 0), (date(2026, 3, 5), 0)], START, date(2026, 2, 2))
+    assert grid.to_dict() == {
+        date(2026, 1, 30): False, date(2026, 1, 31): True, date(2026, 2, 1): True, date(2026, 2, 2): False,
+    }
+    assert grid.bit_string() == '0110'
+    assert grid.to_runs() == [1, 2, 1]
+    assert grid.done_count() == 2
+    assert base64.b64decode(grid.to_base64()) == bytes([0b0110])
+
+
+def test_frequency_slots_are_grouped_per_day():
+    grid = HabitGrid.from_done([(START, 1), (START, 2), (START + timedelta(days=1), 0)], START, START + timedelta(days=1), 2)
+    assert grid.to_dict() == {START: [False, True], START + timedelta(days=1): [True, False]}
+    assert grid.to_runs() == [1, 2, 1]
+
+
+def test_runs_start_with_not_done():
+    assert HabitGrid.from_done([(START, 0)], START, START + timedelta(days=2)).to_runs() == [0, 1, 2]
+    assert HabitGrid.from_done([], START, START).to_runs() == [1]
+
+
+@pytest.mark.parametrize('frequency', [1, 2, 3])
+def test_month_masks_match_per_log_build(frequency):
+    rnd = random.Random(frequency)
+    days = (END - START).days
+    # Logs on both sides of the range must be clipped, not wrapped
+    done = {(START + timedelta(days=rnd.randint(-40, days + 40)), rnd.randrange(frequency)) for _ in range(60)}
+    expected = HabitGrid.from_done(done, START, END, frequency)
+    grid = HabitGrid.from_month_masks(month_masks(done), START, END, frequency)
+    assert grid.bit_string() == expected.bit_string()
+    assert grid.to_dict() == expected.to_dict()
+
+
+def test_grid_endpoint_encodings(client, auth_headers):
+    habit = create_habit(client, auth_headers, strategy_params={'frequency': 2})
+    for day, index in (('2026-03-01', 1), ('2026-03-02', 0)):
+        client.post('/habits/log', headers=auth_headers, json={'habit_id': habit['id'], 'date': day, 'is_done': True, 'index': index})
+
+    params = {'start_date': '2026-03-01', 'end_date': '2026-03-03'}
+    bitmap = client.get(f"/habits/{habit['id']}/grid", headers=auth_headers, params=params).json()
+    assert (bitmap['frequency'], bitmap['done'], bitmap['runs']) == (2, 2, None)
+    assert base64.b64decode(bitmap['bitmap']) == bytes([0b0110])
+
+    rle = client.get(f"/habits/{habit['id']}/grid", headers=auth_headers, params=dict(params, encoding='rle')).json()
+    assert (rle['bitmap'], rle['runs']) == (None, [1, 2, 3])
+
+
+@pytest.mark.parametrize('params', [
+    {'start_date': '2026-03-02', 'end_date': '2026-03-01'},
+    {'start_date': '2016-01-01', 'end_date': '2026-03-01'},
+], ids=['inverted', 'too-wide'])
+def test_grid_endpoint_rejects_bad_ranges(client, auth_headers, params):
+    habit = create_habit(client, auth_headers)
+    assert client.get(f"/habits/{habit['id']}/grid", headers=auth_headers, params=params).status_code == 400
@@ -0,0 +1,134 @@
+from datetime import date
+import logging
+
+import pytest
+
+from app.models import Habit
+from app.services import habit_heatmap_service as heatmap_module
+from app.services.habit_heatmap_service import HabitHeatmapCache, HabitHeatmapService
+from test_habit_dashboard import create_habit
+
+
+@pytest.fixture
+def heatmap_queries(monkeypatch):
+    """Counts heatmaps computed from the database rather than served from the cache."""
+    queries = []
+    query = HabitHeatmapService.query
+
+    def counted(user_id, year):
+        queries.append((user_id, year))
+        return query(user_id, year)
+
+    monkeypatch.setattr(HabitHeatmapService, 'query', staticmethod(counted))
+    return queries
+
+
+def log(client, headers, habit, day, is_done=True):
+    response = client.post('/habits/log', headers=headers, json={'habit_id': habit['id'], 'date': day, 'is_done': is_done})
+    assert response.status_code == 200, response.text
+
+
+def heatmap(client, headers, year=2026):
+    response = client.get('/habits/heatmap', headers=headers, params={'year': year})
+    assert response.status_code == 200, response.text
+    body = response.json()
+    return body, {day['date']: (day['required'], day['done']) for day in body['days']}
+
+
+def test_days_count_due_and_completed_habits(client, auth_headers):
+    daily = create_habit(client, auth_headers, start_date='2026-01-05', end_date='2026-01-10')
+    mondays = create_habit(client, auth_headers, name='swim', strategy_type='weekly', strategy_params={'days': [0]})
+    twice = create_habit(client, auth_headers, name='run', strategy_type='times_per_week', strategy_params={'times': 2})
+    for habit, day in ((daily, '2026-01-05'), (mondays, '2026-01-05'), (daily, '2026-01-06'),
+                       (twice, '2026-01-06'), (twice, '2026-01-07'), (twice, '2026-01-13')):
+        log(client, auth_headers, habit, day)
+
+    body, days = heatmap(client, auth_headers)
+    assert (body['year'], body['habits'], len(body['days'])) == (2026, 3, 365)
+    assert days['2026-01-04'] == (1, 0)   # the first week's Sunday, with no runs logged
+    assert days['2026-01-05'] == (2, 2)
+    assert days['2026-01-06'] == (1, 1)
+    assert days['2026-01-10'] == (1, 0)
+    assert days['2026-01-11'] == (1, 1)   # the week of two runs closes
+    assert days['2026-01-12'] == (1, 0)   # only the Monday habit, the daily one has ended
+    assert days['2026-01-13'] == (0, 0)
+    assert days['2026-01-18'] == (1, 0)   # one run is not enough
+    assert next(day for day in body['days'] if day['date'] == '2026-01-13')['ratio'] is None
+
+
+def test_heatmap_is_scoped_to_the_user(client, make_user):
+    _, alice = make_user('alice')
+    _, bob = make_user('bob')
+    habit = create_habit(client, alice)
+    log(client, alice, habit, '2026-01-01')
+
+    body, days = heatmap(client, bob)
+    assert body['habits'] == 0
+    assert days['2026-01-01'] == (0, 0)
+
+
+def test_heatmap_is_cached_until_the_user_logs_or_edits(client, auth_headers, heatmap_queries):
+    habit = create_habit(client, auth_headers)
+    heatmap(client, auth_headers)
+    heatmap(client, auth_headers, 2025)
+    heatmap(client, auth_headers)
+    assert len(heatmap_queries) == 2
+
+    # A log drops only its own year
+    log(client, auth_headers, habit, '2026-03-01')
+    _, days = heatmap(client, auth_headers)
+    heatmap(client, auth_headers, 2025)
+    assert days['2026-03-01'] == (1, 1)
+    assert len(heatmap_queries) == 3
+
+    # Editing the habit drops every year
+    payload = {'name': 'read', 'strategy_type': 'weekly', 'strategy_params': {'days': [6]}, 'start_date': '2026-01-01'}
+    assert client.put(f"/habits/{habit['id']}", headers=auth_headers, json=payload).status_code == 200
+    _, days = heatmap(client, auth_headers)
+    heatmap(client, auth_headers, 2025)
+    assert days['2026-03-01'] == (1, 1)
+    assert days['2026-03-02'] == (0, 0)
+    assert len(heatmap_queries) == 5
+
+
+def test_cache_ignores_heatmaps_computed_before_an_invalidation():
+    cache = HabitHeatmapCache(max_size=10, ttl=60)
+    payload, generation = cache.get(1, 2026)
+    assert (payload, generation) == (None, None)
+    cache.set(1, 2026, b'first', generation)
+    assert cache.get(1, 2026)[0] == b'first'
+
+    _, generation = cache.get(1, 2025)
+    cache.invalidate(1, 2026)
+    cache.set(1, 2025, b'computed before', generation)
+    assert cache.get(1, 2025)[0] is None
+    assert cache.get(1, 2026)[0] is None
+
+    _, generation = cache.get(1, 2026)
+    cache.set(1, 2026, b'fresh', generation)
+    assert cache.get(1, 2026)[0] == b'fresh'
+    cache.invalidate(1)
+    assert cache.get(1, 2026)[0] is None
+
+
+def test_zero_ttl_disables_the_cache():
+    cache = HabitHeatmapCache(max_size=10, ttl=0)
+    _, generation = cache.get(1, 2026)
+    cache.set(1, 2026, b'payload', generation)
+    assert cache.get(1, 2026)[0] is None
+
+
+def test_startup_warns_when_several_workers_cache_heatmaps(caplog):
+    with caplog.at_level(logging.WARNING, logger=heatmap_module.__name__):
+        HabitHeatmapCache(max_size=10, ttl=30).report_workers(1)
+        HabitHeatmapCache(max_size=10, ttl=0).report_workers(4)
+        assert caplog.text == ''
+        HabitHeatmapCache(max_size=10, ttl=30).report_workers(4)
+    assert 'HABIT_HEATMAP_CACHE_TTL=0' in caplog.text
+
+
+def test_misconfigured_habits_are_never_due():
+    habit = Habit(id=1, name='legacy', strategy_type='hourly', strategy_params={}, start_date=date(2026, 1, 1))
+    built = HabitHeatmapService.build([(habit, date(2026, 1, 1), 0, 0b1)], 2026)
+    assert built['habits'] == 1
+    assert all((day['required'], day['done']) == (0, 0) for day in built['days'])
@@ -0,0 +1,72 @@
+from app.services.habit_service import MAX_HABIT_LOG_BATCH
+from test_habit_dashboard import create_habit
+
+
+def entry(habit_id, day, is_done=True, index=0):
+    return {'habit_id': habit_id, 'date': day, 'is_done': is_done, 'index': index}
+
+
+def batch(client, headers, *entries):
+    return client.post('/habits/log/batch', headers=headers, json={'entries': list(entries)})
+
+
+def done_dates(client, headers, habit_id, start='2026-01-01', end='2026-01-05'):
+    response = client.get(f'/habits/{habit_id}/dates-with-status', headers=headers,
+                          params={'start_date': start, 'end_date': end})
+    return [day for day, is_done in response.json().items() if is_done]
+
+
+def test_batch_logs_several_habits(client, auth_headers):
+    read = create_habit(client, auth_headers)
+    run = create_habit(client, auth_headers, name='run')
+
+    response = batch(client, auth_headers, entry(read['id'], '2026-01-01'), entry(run['id'], '2026-01-02'),
+                     entry(read['id'], '2026-02-01'))
+    assert response.status_code == 200
+    assert response.json() == {'results': {str(read['id']): 'logged', str(run['id']): 'logged'}}
+    assert done_dates(client, auth_headers, read['id'], end='2026-02-01') == ['2026-01-01', '2026-02-01']
+    assert done_dates(client, auth_headers, run['id']) == ['2026-01-02']
+
+
+def test_later_entries_win_for_the_same_slot(client, auth_headers):
+    habit = create_habit(client, auth_headers)
+    batch(client, auth_headers, entry(habit['id'], '2026-01-03'))
+
+    response = batch(client, auth_headers,
+                     entry(habit['id'], '2026-01-01'), entry(habit['id'], '2026-01-01', is_done=False),
+                     entry(habit['id'], '2026-01-02', is_done=False), entry(habit['id'], '2026-01-02'),
+                     entry(habit['id'], '2026-01-03', is_done=False))
+    assert response.status_code == 200
+    assert done_dates(client, auth_headers, habit['id']) == ['2026-01-02']
+
+
+def test_unknown_and_foreign_habits_are_not_found(client, make_user):
+    _, alice = make_user('alice')
+    _, bob = make_user('bob')
+    mine = create_habit(client, alice)
+    theirs = create_habit(client, bob)
+
+    response = batch(client, alice, entry(theirs['id'], '2026-01-01'), entry(mine['id'], '2026-01-01'),
+                     entry(999999, '2026-01-01'))
+    assert response.status_code == 200
+    assert response.json() == {
+        'results': {str(theirs['id']): 'not_found', str(mine['id']): 'logged', '999999': 'not_found'},
+    }
+    assert done_dates(client, bob, theirs['id']) == []
+    assert done_dates(client, alice, mine['id']) == ['2026-01-01']
+
+
+def test_batch_rebuilds_the_stats(client, auth_headers):
+    habit = create_habit(client, auth_headers)
+    batch(client, auth_headers, *(entry(habit['id'], f'2026-01-0{day}') for day in (1, 2, 3, 5)))
+    batch(client, auth_headers, entry(habit['id'], '2026-01-04'), entry(habit['id'], '2026-01-01', is_done=False))
+
+    stats = client.get(f"/habits/{habit['id']}/stats", headers=auth_headers).json()
+    assert (stats['completed_days'], stats['longest_streak'], stats['last_completed']) == (4, 4, '2026-01-05')
+
+
+def test_batch_size_is_bounded(client, auth_headers):
+    habit = create_habit(client, auth_headers)
+    assert batch(client, auth_headers).status_code == 422
+    entries = [entry(habit['id'], '2026-01-01')] * (MAX_HABIT_LOG_BATCH + 1)
+    assert batch(client, auth_headers, *entries).status_code == 422
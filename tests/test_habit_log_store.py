@@ -0,0 +1,103 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import select, text
+
+from app.models import HabitLogMonth
+from app.services.habit_log_store import complete_days_from_masks, day_bit, iter_days, range_mask
+from test_habit_dashboard import create_habit
+
+
+def log(client, headers, habit_id, day, is_done=True, index=0):
+    response = client.post('/habits/log', headers=headers,
+                           json={'habit_id': habit_id, 'date': day, 'is_done': is_done, 'index': index})
+    assert response.status_code == 200, response.text
+
+
+def month_rows(db, habit_id):
+    db.expire_all()
+    return db.execute(
+        select(HabitLogMonth.month, HabitLogMonth.index, HabitLogMonth.done_mask)
+        .where(HabitLogMonth.habit_id == habit_id).order_by(HabitLogMonth.month, HabitLogMonth.index)
+    ).all()
+
+
+@pytest.mark.parametrize('day,bit', [(date(2026, 1, 1), 0), (date(2026, 1, 31), 30), (date(2024, 2, 29), 28)])
+def test_day_bits(day, bit):
+    assert day_bit(day) == 1 << bit
+    assert list(iter_days(day.replace(day=1), day_bit(day))) == [day]
+
+
+def test_range_mask_clips_to_the_month():
+    month = date(2026, 1, 1)
+    assert range_mask(month, None, None) == (1 << 31) - 1
+    assert range_mask(month, date(2025, 12, 20), date(2026, 1, 2)) == 0b11
+    assert range_mask(month, date(2026, 1, 31), date(2026, 2, 5)) == 1 << 30
+    assert range_mask(month, date(2026, 2, 1), None) == 0
+
+
+def test_complete_days_need_every_index():
+    month = date(2026, 1, 1)
+    masks = [(month, 0, 0b111), (month, 1, 0b110), (month, 2, 0b111)]
+    assert complete_days_from_masks(masks, 2, lambda _: -1) == {date(2026, 1, 2), date(2026, 1, 3)}
+    assert complete_days_from_masks(masks, 3, lambda _: -1, end=date(2026, 1, 2)) == {date(2026, 1, 2)}
+    assert complete_days_from_masks(masks[:1], 2, lambda _: -1) == set()
+
+
+def test_logs_across_month_and_year_boundaries(client, db, auth_headers):
+    habit = create_habit(client, auth_headers, start_date='2025-12-01')
+    for day in ('2025-12-31', '2026-01-01', '2026-01-31', '2026-02-01'):
+        log(client, auth_headers, habit['id'], day)
+
+    assert month_rows(db, habit['id']) == [
+        (date(2025, 12, 1), 0, 1 << 30),
+        (date(2026, 1, 1), 0, 1 | 1 << 30),
+        (date(2026, 2, 1), 0, 1),
+    ]
+    response = client.get(f"/habits/{habit['id']}/dates-with-status", headers=auth_headers,
+                          params={'start_date': '2025-12-30', 'end_date': '2026-02-02'})
+    done = [day for day, is_done in response.json().items() if is_done]
+    assert done == ['2025-12-31', '2026-01-01', '2026-01-31', '2026-02-01']
+
+
+def test_clearing_the_last_bit_leaves_an_empty_row(client, db, auth_headers):
+    habit = create_habit(client, auth_headers, strategy_params={'frequency': 2})
+    log(client, auth_headers, habit['id'], '2026-01-31', index=1)
+    log(client, auth_headers, habit['id'], '2026-01-31', is_done=False, index=1)
+    # Unlogging a slot that was never done is a no-op
+    log(client, auth_headers, habit['id'], '2026-03-01', is_done=False)
+
+    assert month_rows(db, habit['id']) == [(date(2026, 1, 1), 1, 0)]
+    response = client.get(f"/habits/{habit['id']}/dates-with-status", headers=auth_headers,
+                          params={'start_date': '2026-01-31', 'end_date': '2026-01-31'})
+    assert response.json() == {'2026-01-31': [False, False]}
+
+    log(client, auth_headers, habit['id'], '2026-01-30', index=1)
+    assert month_rows(db, habit['id']) == [(date(2026, 1, 1), 1, 1 << 29)]
+
+
+def test_migration_round_trips_habit_logs(scratch_engine, migrate):
+    migrate('upgrade', 'c4f1a8e2b7d5')
+    with scratch_engine.begin() as connection:
+        connection.execute(text("INSERT INTO user (id, username) VALUES (1, 'alice')"))
+        connection.execute(text("INSERT INTO habit (id, name, user_id) VALUES (1, 'read', 1)"))
+        connection.execute(text(
+            "INSERT INTO habit_log (habit_id, date, is_done, \"index\") VALUES "
+            "(1, '2025-12-31', 1, 0), (1, '2026-01-01', 1, 0), (1, '2026-01-31', 1, 0), (1, '2026-01-31', 1, 1), "
+            "(1, '2026-01-15', 0, 0), (1, '2026-02-01', 1, NULL), (2, '2026-01-01', 1, 0)"
+        ))
+
+    migrate('upgrade', 'e6b9d3f1a2c8')
+    with scratch_engine.begin() as connection:
+        # Not-done logs and logs of missing habits carry nothing; a NULL index is slot 0
+        rows = connection.execute(text(
+            "SELECT month, \"index\", done_mask FROM habit_log_month WHERE habit_id = 1 ORDER BY month, \"index\""
+        )).all()
+        assert rows == [('2025-12-01', 0, 1 << 30), ('2026-01-01', 0, 1 | 1 << 30), ('2026-01-01', 1, 1 << 30),
+                        ('2026-02-01', 0, 1)]
+
+    migrate('downgrade', 'c4f1a8e2b7d5')
+    with scratch_engine.begin() as connection:
+        logs = connection.execute(text("SELECT habit_id, date, is_done, \"index\" FROM habit_log ORDER BY date, \"index\"")).all()
+        assert logs == [(1, '2025-12-31', 1, 0), (1, '2026-01-01', 1, 0), (1, '2026-01-31', 1, 0),
+                        (1, '2026-01-31', 1, 1), (1, '2026-02-01', 1, 0)]
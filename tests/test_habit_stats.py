@@ -0,0 +1,129 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from app.models import Habit, HabitStats
+from app.services.habit_stats_service import HabitStatsService
+from app.services.habit_strategies import build_strategy
+from test_habit_dashboard import create_habit
+
+FIELDS = ('completed_days', 'current_streak', 'current_streak_end', 'longest_streak', 'longest_streak_end')
+
+
+def log(client, headers, habit, day, is_done=True, index=0):
+    response = client.post('/habits/log', headers=headers,
+                           json={'habit_id': habit['id'], 'date': day.isoformat(), 'is_done': is_done, 'index': index})
+    assert response.status_code == 200, response.text
+
+
+def stored(db, habit):
+    """The aggregates as maintained incrementally by the log endpoint."""
+    db.expire_all()
+    stats = db.get(HabitStats, habit['id'])
+    return tuple(getattr(stats, field) for field in FIELDS)
+
+
+def recomputed(db, habit):
+    """The aggregates a full rebuild from the logs yields, leaving the stored row untouched."""
+    db.expire_all()
+    stats = HabitStatsService.rebuild(db, db.get(Habit, habit['id']))
+    fields = tuple(getattr(stats, field) for field in FIELDS)
+    db.rollback()
+    return fields
+
+
+def jan(day):
+    return date(2026, 1, day)
+
+
+def test_log_extends_breaks_and_rejoins_the_streak(client, db, auth_headers):
+    habit = create_habit(client, auth_headers)
+    for day in (1, 2, 3):
+        log(client, auth_headers, habit, jan(day))
+    assert stored(db, habit) == (3, 3, jan(3), 3, jan(3))
+
+    # Unlogging the middle day splits the longest streak
+    log(client, auth_headers, habit, jan(2), is_done=False)
+    assert stored(db, habit)[:4] == (2, 1, jan(3), 1)
+    assert stored(db, habit) == recomputed(db, habit)
+
+    log(client, auth_headers, habit, jan(2))
+    assert stored(db, habit) == (3, 3, jan(3), 3, jan(3))
+
+    # Unlogging the last day shortens the current streak to the day before
+    log(client, auth_headers, habit, jan(3), is_done=False)
+    assert stored(db, habit) == recomputed(db, habit) == (2, 2, jan(2), 2, jan(2))
+
+
+def test_backdated_logs_join_later_runs(client, db, auth_headers):
+    habit = create_habit(client, auth_headers)
+    log(client, auth_headers, habit, jan(10))
+    log(client, auth_headers, habit, jan(11))
+    log(client, auth_headers, habit, jan(5))
+    assert stored(db, habit) == (3, 2, jan(11), 2, jan(11))
+
+    for day in (9, 7, 6):
+        log(client, auth_headers, habit, jan(day))
+    assert stored(db, habit) == (6, 3, jan(11), 3, jan(7))
+
+    # The missing day bridges both runs
+    log(client, auth_headers, habit, jan(8))
+    assert stored(db, habit) == recomputed(db, habit) == (7, 7, jan(11), 7, jan(11))
+
+
+def test_day_is_complete_only_when_every_slot_is_logged(client, db, auth_headers):
+    habit = create_habit(client, auth_headers, strategy_params={'frequency': 2})
+    log(client, auth_headers, habit, jan(1))
+    assert stored(db, habit) == (0, 0, None, 0, None)
+    log(client, auth_headers, habit, jan(1), index=1)
+    assert stored(db, habit) == (1, 1, jan(1), 1, jan(1))
+
+
+def test_strategy_change_rebuilds_the_stats(client, db, auth_headers):
+    habit = create_habit(client, auth_headers)
+    mondays = [jan(5), jan(12), jan(19)]
+    for day in mondays:
+        log(client, auth_headers, habit, day)
+    assert stored(db, habit) == (3, 1, jan(19), 1, jan(5))
+
+    payload = {'name': 'read', 'strategy_type': 'weekly', 'strategy_params': {'days': [0]}, 'start_date': '2026-01-01'}
+    assert client.put(f"/habits/{habit['id']}", headers=auth_headers, json=payload).status_code == 200
+    assert stored(db, habit) == (3, 3, jan(19), 3, jan(19))
+
+    payload['strategy_params'] = {'days': [0, 1]}
+    assert client.put(f"/habits/{habit['id']}", headers=auth_headers, json=payload).status_code == 200
+    assert stored(db, habit) == recomputed(db, habit) == (3, 1, jan(19), 1, jan(5))
+
+
+def test_stats_endpoint_reports_the_stored_aggregates(client, auth_headers):
+    habit = create_habit(client, auth_headers)
+    for day in (1, 2, 4):
+        log(client, auth_headers, habit, jan(day))
+
+    response = client.get(f"/habits/{habit['id']}/stats", headers=auth_headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert (body['completed_days'], body['longest_streak'], body['last_completed']) == (3, 2, '2026-01-04')
+    assert [item['habit_id'] for item in client.get('/habits/stats', headers=auth_headers).json()] == [habit['id']]
+
+
+@pytest.mark.parametrize('strategy_type,strategy_params', [
+    ('daily', {}),
+    ('daily', {'frequency': 2}),
+    ('weekly', {'days': [0, 2, 4]}),
+    ('monthly', {'day_of_month': 31}),
+    ('every_n_days', {'interval': 3}),
+    ('times_per_week', {'times': 2}),
+])
+def test_incremental_stats_match_a_full_rebuild(client, db, auth_headers, strategy_type, strategy_params):
+    habit = create_habit(client, auth_headers, strategy_type=strategy_type, strategy_params=strategy_params)
+    frequency = strategy_params.get('frequency', 1)
+    rng = random.Random(f'{strategy_type}{strategy_params}')
+    # Few enough loggable days that runs keep forming and splitting
+    days = build_strategy(strategy_type, strategy_params, jan(1)).log_dates(jan(1), date(2029, 12, 31))[:40]
+
+    for _ in range(80):
+        day = rng.choice(days)
+        log(client, auth_headers, habit, day, is_done=rng.random() < 0.7, index=rng.randrange(frequency))
+        assert stored(db, habit) == recomputed(db, habit), day
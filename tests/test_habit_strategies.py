@@ -0,0 +1,101 @@
+import calendar
+from datetime import date, timedelta
+
+import pytest
+
+from app.services.habit_strategies import STRATEGIES, UNSCHEDULED, build_strategy
+
+ANCHOR = date(2024, 1, 10)
+# Spans a leap February, month ends of every length and a year boundary
+START, END = date(2023, 12, 1), date(2025, 3, 31)
+DAYS = [START + timedelta(days=offset) for offset in range((END - START).days + 1)]
+
+
+def monthly_due(dom):
+    return lambda day: day.day == min(dom, calendar.monthrange(day.year, day.month)[1])
+
+
+# Day-by-day definitions of when each registered strategy is due
+SCHEDULES = [
+    ('daily', {}, lambda day: True),
+    ('weekly', {'days': [0, 2, 4]}, lambda day: day.weekday() in (0, 2, 4)),
+    ('weekly', {'day_of_week': 6}, lambda day: day.weekday() == 6),
+    ('monthly', {'day_of_month': 1}, monthly_due(1)),
+    ('monthly', {'day_of_month': 15}, monthly_due(15)),
+    ('monthly', {'day_of_month': 30}, monthly_due(30)),
+    ('monthly', {'day_of_month': 31}, monthly_due(31)),
+    ('every_n_days', {'interval': 1}, lambda day: day >= ANCHOR),
+    ('every_n_days', {'interval': 3}, lambda day: day >= ANCHOR and (day - ANCHOR).days % 3 == 0),
+    ('every_n_days', {'interval': 45}, lambda day: day >= ANCHOR and (day - ANCHOR).days % 45 == 0),
+    ('times_per_week', {'times': 3}, lambda day: day.weekday() == 6),
+]
+
+
+def test_every_registered_strategy_is_covered():
+    assert {strategy_type for strategy_type, _, _ in SCHEDULES} == set(STRATEGIES)
+
+
+@pytest.fixture(params=SCHEDULES, ids=lambda schedule: f'{schedule[0]}-{schedule[1]}')
+def schedule(request):
+    strategy_type, params, is_due = request.param
+    # Reference due dates over a margin around the range, so next/previous answers near its edges are known
+    margin = [START - timedelta(days=400) + timedelta(days=offset) for offset in range((END - START).days + 801)]
+    return build_strategy(strategy_type, params, ANCHOR), [day for day in margin if is_due(day)]
+
+
+def test_next_and_previous_due(schedule):
+    strategy, due = schedule
+    for day in DAYS:
+        assert strategy.next_due(day) == next((d for d in due if d >= day), None), day
+        assert strategy.previous_due(day) == next((d for d in reversed(due) if d <= day), None), day
+        assert strategy.is_due(day) == (day in due), day
+
+
+def test_count_and_list_due(schedule):
+    strategy, due = schedule
+    for start in DAYS[::7]:
+        for end in (start - timedelta(days=1), start, start + timedelta(days=6), start + timedelta(days=40), END):
+            expected = [d for d in due if start <= d <= end]
+            assert strategy.count_due(start, end) == len(expected), (start, end)
+            assert strategy.get_required_dates(start, end) == expected, (start, end)
+
+
+def test_nth_due(schedule):
+    strategy, due = schedule
+    for start in DAYS[::5]:
+        following = [d for d in due if d >= start]
+        for n in range(min(12, len(following))):
+            assert strategy.nth_due(n, start) == following[n], (n, start)
+
+
+def test_month_masks(schedule):
+    strategy, due = schedule
+    months = sorted({day.replace(day=1) for day in DAYS})
+    for month in months:
+        expected = sum(1 << (d.day - 1) for d in due if d.replace(day=1) == month)
+        assert strategy.due_mask(month) == expected, month
+        if strategy.name == 'times_per_week':
+            assert strategy.log_mask(month) == (1 << calendar.monthrange(month.year, month.month)[1]) - 1
+        else:
+            assert strategy.log_mask(month) == expected, month
+
+
+def test_unscheduled_is_never_due():
+    day = date(2026, 1, 1)
+    assert (UNSCHEDULED.next_due(day), UNSCHEDULED.previous_due(day), UNSCHEDULED.nth_due(0, day)) == (None, None, None)
+    assert UNSCHEDULED.count_due(day, day + timedelta(days=30)) == 0
+    assert UNSCHEDULED.get_required_dates(day, day + timedelta(days=30)) == []
+
+
+@pytest.mark.parametrize('strategy_type,params', [
+    ('weekly', {'days': []}),
+    ('weekly', {'days': [7]}),
+    ('monthly', {'day_of_month': 32}),
+    ('every_n_days', {'interval': 0}),
+    ('times_per_week', {'times': 8}),
+    ('daily', {'frequency': True}),
+    ('hourly', {}),
+])
+def test_invalid_params_are_rejected(strategy_type, params):
+    with pytest.raises(ValueError):
+        build_strategy(strategy_type, params, ANCHOR)
@@ -0,0 +1,53 @@
+import pytest
+
+from test_habit_dashboard import create_habit
+
+HABIT = {'name': 'mine', 'strategy_type': 'daily', 'strategy_params': {}, 'start_date': '2026-01-01'}
+
+
+def test_habit_crud(client, auth_headers):
+    habit = create_habit(client, auth_headers)
+    assert client.get(f"/habits/{habit['id']}", headers=auth_headers).json()['name'] == 'read'
+    assert [h['id'] for h in client.get('/habits/', headers=auth_headers).json()] == [habit['id']]
+
+    response = client.put(f"/habits/{habit['id']}", headers=auth_headers, json=HABIT)
+    assert response.status_code == 200
+    assert response.json()['name'] == 'mine'
+
+    assert client.delete(f"/habits/{habit['id']}", headers=auth_headers).status_code == 204
+    assert client.get(f"/habits/{habit['id']}", headers=auth_headers).status_code == 404
+    assert client.get('/habits/', headers=auth_headers).json() == []
+
+
+@pytest.mark.parametrize('method,path,body', [
+    ('GET', '/habits/{id}', lambda habit_id: None),
+    ('PUT', '/habits/{id}', lambda habit_id: HABIT),
+    ('DELETE', '/habits/{id}', lambda habit_id: None),
+    ('POST', '/habits/log', lambda habit_id: {'habit_id': habit_id, 'date': '2026-03-01', 'is_done': True}),
+    ('GET', '/habits/{id}/dates-with-status?start_date=2026-03-01&end_date=2026-03-02', lambda habit_id: None),
+    ('GET', '/habits/{id}/grid?start_date=2026-03-01&end_date=2026-03-02', lambda habit_id: None),
+    ('GET', '/habits/{id}/stats', lambda habit_id: None),
+], ids=['get', 'update', 'delete', 'log', 'dates-with-status', 'grid', 'stats'])
+def test_habit_endpoints_check_ownership(client, make_user, method, path, body):
+    _, alice = make_user('alice')
+    _, bob = make_user('bob')
+    habit_id = create_habit(client, alice)['id']
+
+    response = client.request(method, path.format(id=habit_id), headers=bob, json=body(habit_id))
+    assert response.status_code == 403
+    response = client.request(method, path.format(id=habit_id + 1), headers=bob, json=body(habit_id + 1))
+    assert response.status_code == 404
+
+
+def test_log_and_unlog_habit(client, auth_headers):
+    habit = create_habit(client, auth_headers)
+    params = {'start_date': '2026-03-01', 'end_date': '2026-03-02'}
+
+    log = {'habit_id': habit['id'], 'date': '2026-03-02', 'is_done': True}
+    assert client.post('/habits/log', headers=auth_headers, json=log).json() == {'success': True}
+    dates = client.get(f"/habits/{habit['id']}/dates-with-status", headers=auth_headers, params=params).json()
+    assert dates == {'2026-03-01': False, '2026-03-02': True}
+
+    client.post('/habits/log', headers=auth_headers, json=dict(log, is_done=False))
+    dates = client.get(f"/habits/{habit['id']}/dates-with-status", headers=auth_headers, params=params).json()
+    assert dates == {'2026-03-01': False, '2026-03-02': False}
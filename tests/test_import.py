@@ -0,0 +1,87 @@
+import io
+import json
+
+import pytest
+from sqlalchemy import select
+
+from app import import_jobs, tasks_rq
+from app.models import Movie, Task
+from app.services.import_service import ImportService, MAX_REPORTED_IMPORT_ERRORS
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    chunks = ImportService.chunks
+    monkeypatch.setattr(ImportService, 'chunks', staticmethod(lambda items: chunks(items, 2)))
+
+
+def test_import_reports_invalid_items_by_index(client, db, auth_headers, small_chunks):
+    items = [{'title': 'one'}, {'details': 'no title'}, {'title': 'two', 'type': 'CURRENT'}, {'title': 'three', 'status': 'NOPE'}]
+    response = client.post('/tasks/import', headers=auth_headers, json=items)
+    assert response.status_code == 200
+    result = response.json()
+    assert (result['imported'], result['failed']) == (2, 2)
+    assert [error['index'] for error in result['errors']] == [1, 3]
+    assert db.scalars(select(Task.title).order_by(Task.id)).all() == ['one', 'two']
+
+
+def test_import_schedules_recurring_tasks(client, db, auth_headers):
+    items = [{'title': 'rent', 'recurrence': 'FREQ=MONTHLY;BYMONTHDAY=1', 'notify_at': '2026-01-01T09:00:00'}]
+    assert client.post('/tasks/import', headers=auth_headers, json=items).json()['imported'] == 1
+    task = db.scalars(select(Task)).one()
+    assert task.recurrence_start is not None and task.next_occurrence is not None
+
+
+def test_import_caps_reported_errors(client, auth_headers):
+    items = [{}] * (MAX_REPORTED_IMPORT_ERRORS + 5)
+    result = client.post('/movies/import', headers=auth_headers, json=items).json()
+    assert result['failed'] == MAX_REPORTED_IMPORT_ERRORS + 5
+    assert len(result['errors']) == MAX_REPORTED_IMPORT_ERRORS
+
+
+def test_import_progress_and_file_job(db, user, tmp_path, small_chunks):
+    path = tmp_path / 'movies.json'
+    path.write_text(json.dumps([{'title': 'Alien'}, {'title': 'Heat'}, {'rating': 3}]))
+    progress = []
+    result = ImportService.import_items(db, 'movies', json.loads(path.read_text()), user.id,
+                                        progress=lambda done, total: progress.append((done, total)))
+    assert progress == [(2, 3), (3, 3)]
+    assert result['imported'] == 2
+
+    assert tasks_rq.import_file(user.id, 'movies', str(path))['imported'] == 2
+    assert not path.exists()
+    assert db.scalars(select(Movie.title).where(Movie.user_id == user.id)).all() == ['Alien', 'Heat'] * 2
+
+
+def upload(flask_client, items, kind='tasks'):
+    data = {'file': (io.BytesIO(json.dumps(items).encode()), f'{kind}.json')}
+    return flask_client.post(f'/{kind}/import', data=data, content_type='multipart/form-data')
+
+
+def test_small_upload_is_imported_inline(flask_client, login, db):
+    login()
+    assert upload(flask_client, [{'title': 'inline'}]).status_code == 302
+    assert db.scalars(select(Task.title)).all() == ['inline']
+
+
+def test_large_upload_is_queued(flask_client, login, monkeypatch):
+    user, _ = login()
+    enqueued = []
+
+    class Job:
+        id = 'job-1'
+
+    def enqueue(func, *args, **kwargs):
+        enqueued.append((func, args, kwargs['meta']))
+        return Job()
+
+    monkeypatch.setattr(import_jobs.Config, 'IMPORT_BACKGROUND_THRESHOLD', 0)
+    monkeypatch.setattr(import_jobs.q, 'enqueue', enqueue)
+    assert upload(flask_client, [{'title': 'queued'}], kind='movies').status_code == 302
+
+    [(func, (user_id, kind, path), meta)] = enqueued
+    assert (func, user_id, kind, meta) == ('app.tasks_rq.import_file', user.id, 'movies', {'user_id': user.id, 'kind': 'movies'})
+    with open(path) as f:
+        assert json.load(f) == [{'title': 'queued'}]
+    with flask_client.session_transaction() as session:
+        assert session['import_job_id'] == 'job-1'
@@ -0,0 +1,34 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app.database import engine
+from app.models import Task, TaskArchive, TaskType
+
+NOW = datetime(2026, 10, 17, 12, 0)
+
+
+def query_plan(statement) -> str:
+    sql = statement.compile(engine, compile_kwargs={'literal_binds': True})
+    with engine.connect() as connection:
+        rows = connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {sql}').all()
+    return ' | '.join(row[-1] for row in rows)
+
+
+@pytest.mark.parametrize('statement,index', [
+    (select(Task.id).where(Task.suspend_due <= NOW), 'ix_task_suspend_due'),
+    (select(Task.id).where(Task.notify_at <= NOW, Task.notify_at != None, Task.recurrence.is_(None)),
+     'ix_task_notify_at'),
+    (select(Task.id).where(Task.planned_start > NOW, Task.planned_start <= NOW + timedelta(hours=1),
+                           Task.planned_start_notified == False),
+     'ix_task_planned_start_notified'),
+    (select(Task.id).where(Task.user_id == 7, Task.type == TaskType.CURRENT), 'ix_task_user_id_type'),
+    (select(Task).where(Task.user_id == 7, Task.planned_end >= NOW, Task.planned_start < NOW),
+     'ix_task_user_id_planned_end'),
+    (select(TaskArchive).where(TaskArchive.user_id == 7, TaskArchive.planned_end >= NOW, TaskArchive.planned_start < NOW),
+     'ix_task_archive_user_id_planned_end'),
+], ids=['suspend_due', 'notify_at', 'planned_start', 'user_id_type', 'calendar_running', 'calendar_running_archive'])
+def test_hot_queries_use_their_index(statement, index):
+    plan = query_plan(statement)
+    assert f'USING INDEX {index}' in plan or f'USING COVERING INDEX {index}' in plan, plan
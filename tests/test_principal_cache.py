@@ -0,0 +1,111 @@
+import json
+import logging
+
+import pytest
+from sqlalchemy import delete
+
+from app.auth import principal_cache as principal_cache_module
+from app.auth.principal_cache import PrincipalCache, principal_cache
+from app.models import User, UserRole
+
+
+class FakeRedis:
+    def __init__(self, fail: bool = False):
+        self.data = {}
+        self.fail = fail
+
+    def _check(self):
+        if self.fail:
+            raise ConnectionError('redis is down')
+
+    def get(self, key):
+        self._check()
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self._check()
+        self.data[key] = value
+
+    def delete(self, key):
+        self._check()
+        self.data.pop(key, None)
+
+
+def test_authenticated_principal_is_served_from_cache(client, db, user, auth_headers):
+    assert client.get('/habits/', headers=auth_headers).status_code == 200
+    assert principal_cache.get(user.id)['username'] == user.username
+
+    # The row is gone, but the cached principal still authenticates the token
+    db.execute(delete(User).where(User.id == user.id))
+    db.commit()
+    assert client.get('/habits/', headers=auth_headers).status_code == 200
+
+    principal_cache.invalidate(user.id)
+    assert client.get('/habits/', headers=auth_headers).status_code == 401
+
+
+def test_role_change_invalidates_cached_principal(client, make_user):
+    _, admin = make_user('root', role=UserRole.ADMIN)
+    bob, bob_headers = make_user('bob')
+    assert client.get('/auth/me', headers=bob_headers).json()['role'] == 'USER'
+
+    response = client.post(f'/admin/users/{bob.id}/set_role', headers=admin, params={'new_role': 'TRUSTED'})
+    assert response.status_code == 200
+    assert client.get('/auth/me', headers=bob_headers).json()['role'] == 'TRUSTED'
+
+
+def test_redis_backend_shares_principals(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(PrincipalCache, '_redis', staticmethod(lambda: redis))
+    writer = PrincipalCache('redis', ttl=60, local_ttl=5, max_size=10)
+    reader = PrincipalCache('redis', ttl=60, local_ttl=5, max_size=10)
+
+    writer.set(User(id=7, username='carol', role=UserRole.ADMIN))
+    assert json.loads(redis.data['principal:7'])['role'] == 'ADMIN'
+    principal = reader.get(7)
+    assert PrincipalCache.to_user(principal).role == UserRole.ADMIN
+
+    writer.invalidate(7)
+    assert 'principal:7' not in redis.data
+
+
+def test_redis_failures_fall_back_to_the_database(monkeypatch):
+    monkeypatch.setattr(PrincipalCache, '_redis', staticmethod(lambda: FakeRedis(fail=True)))
+    cache = PrincipalCache('redis', ttl=60, local_ttl=5, max_size=10)
+    cache.set(User(id=7, username='carol', role=UserRole.USER))
+    assert cache.get(8) is None
+    cache.invalidate(7)
+    assert cache.get(7) is None
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        PrincipalCache('memcached', ttl=60, local_ttl=5, max_size=10)
+
+
+def test_remote_invalidation_warns_without_a_shared_backend(caplog):
+    cache = PrincipalCache('memory', ttl=60, local_ttl=5, max_size=10)
+    cache.set(User(id=7, username='carol', role=UserRole.USER))
+    with caplog.at_level(logging.WARNING, logger=principal_cache_module.__name__):
+        cache.invalidate_remote(7)
+    assert cache.get(7) is None
+    assert 'PRINCIPAL_CACHE_BACKEND=redis' in caplog.text
+
+
+def test_remote_invalidation_reaches_redis_quietly(monkeypatch, caplog):
+    redis = FakeRedis()
+    monkeypatch.setattr(PrincipalCache, '_redis', staticmethod(lambda: redis))
+    cache = PrincipalCache('redis', ttl=60, local_ttl=5, max_size=10)
+    cache.set(User(id=7, username='carol', role=UserRole.USER))
+    with caplog.at_level(logging.WARNING, logger=principal_cache_module.__name__):
+        cache.invalidate_remote(7)
+    assert 'principal:7' not in redis.data
+    assert caplog.text == ''
+
+
+@pytest.mark.parametrize('backend,workers,warns', [('memory', 1, False), ('memory', 4, True), ('redis', 4, False)])
+def test_startup_warns_about_per_process_caches(caplog, backend, workers, warns):
+    cache = PrincipalCache(backend, ttl=60, local_ttl=5, max_size=10)
+    with caplog.at_level(logging.WARNING, logger=principal_cache_module.__name__):
+        cache.report_backend(workers)
+    assert ('API workers' in caplog.text) == warns
@@ -0,0 +1,55 @@
+from datetime import datetime
+
+import pytest
+
+from app.models import Movie, TaskStatus
+from app.schemas import TaskSchema
+from app.services.archive_service import ArchiveService
+from app.services.projection_service import InvalidFieldsError, ProjectionService
+from test_habit_dashboard import create_habit
+
+
+def test_resolve_fields_follows_schema_order():
+    assert ProjectionService.resolve_fields(TaskSchema, ['type,title', ' deadline ']) == ['id', 'title', 'type', 'deadline']
+    assert ProjectionService.resolve_fields(TaskSchema, None) is None
+    with pytest.raises(InvalidFieldsError, match='details_html'):
+        ProjectionService.resolve_fields(TaskSchema, ['title', 'details_html'])
+
+
+def test_task_projection_selects_only_requested_columns(client, db, auth_headers, make_task):
+    make_task('one', details='long text', deadline=datetime(2026, 3, 2))
+    make_task('two', deadline=datetime(2026, 3, 1))
+    make_task('done', status=TaskStatus.DONE)
+    ArchiveService.archive_closed_tasks(db, older_than_days=0)
+
+    response = client.get('/tasks/', headers=auth_headers,
+                          params={'fields': 'title', 'sort': 'deadline', 'limit': 2, 'include_archived': True})
+    assert response.status_code == 200
+    # The sort key rides along so the cursor can be built
+    assert [row.keys() for row in response.json()] == [{'id', 'title', 'deadline'}] * 2
+    assert [row['title'] for row in response.json()] == ['two', 'one']
+
+    response = client.get('/tasks/', headers=auth_headers, params={
+        'fields': 'title', 'sort': 'deadline', 'limit': 2, 'include_archived': True,
+        'cursor': response.headers['X-Next-Cursor'],
+    })
+    assert [row['title'] for row in response.json()] == ['done']
+    assert 'X-Next-Cursor' not in response.headers
+
+
+def test_movie_and_habit_projections(client, db, user, auth_headers):
+    db.add(Movie(title='Alien', rating=9, comment='in space', user_id=user.id))
+    db.commit()
+    create_habit(client, auth_headers, description='daily pages')
+
+    movies = client.get('/movies/', headers=auth_headers, params={'fields': ['title', 'rating']}).json()
+    assert movies == [{'id': movies[0]['id'], 'title': 'Alien', 'rating': 9}]
+    habits = client.get('/habits/', headers=auth_headers, params={'fields': 'name'}).json()
+    assert [habit.keys() for habit in habits] == [{'id', 'name'}]
+
+
+@pytest.mark.parametrize('path', ['/tasks/', '/movies/', '/habits/'])
+def test_unknown_fields_are_rejected(client, auth_headers, path):
+    response = client.get(path, headers=auth_headers, params={'fields': 'user_id,password_hash'})
+    assert response.status_code == 422
+    assert 'password_hash' in response.json()['detail']
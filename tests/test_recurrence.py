@@ -0,0 +1,95 @@
+from datetime import datetime
+
+import pytest
+
+from app import scheduler
+from app.models import Task, TaskOccurrence, User
+from app.services.recurrence_service import InvalidRecurrenceError, RecurrenceService
+
+MONTHLY = 'FREQ=MONTHLY;BYMONTHDAY=1'
+
+
+@pytest.mark.parametrize('rule,expected', [
+    (' rrule:freq=weekly;byday=mo ', 'FREQ=WEEKLY;BYDAY=MO'),
+    ('', None),
+    (None, None),
+])
+def test_normalize_rule(rule, expected):
+    assert RecurrenceService.normalize_rule(rule) == expected
+
+
+@pytest.mark.parametrize('rule', ['BYDAY=MO', 'FREQ=MINUTELY', 'FREQ=DAILY;DTSTART=20260101T000000', 'FREQ=DAILY;BYDAY=XX'])
+def test_normalize_rule_rejects(rule):
+    with pytest.raises(InvalidRecurrenceError):
+        RecurrenceService.normalize_rule(rule)
+
+
+def test_next_occurrence_skips_completed():
+    start = datetime(2026, 1, 1, 9)
+    completed = {datetime(2026, 3, 1, 9), datetime(2026, 4, 1, 9)}
+    assert RecurrenceService.next_occurrence(MONTHLY, start, datetime(2026, 2, 15), completed) == datetime(2026, 5, 1, 9)
+    assert RecurrenceService.next_occurrence('FREQ=DAILY;COUNT=2', start, datetime(2026, 2, 1)) is None
+
+
+def test_occurrences_expand_the_window_only():
+    start = datetime(2026, 1, 1, 9)
+    assert RecurrenceService.occurrences(MONTHLY, start, datetime(2026, 3, 1, 9), datetime(2026, 5, 1, 9)) == [
+        datetime(2026, 3, 1, 9), datetime(2026, 4, 1, 9),
+    ]
+    assert RecurrenceService.is_occurrence(MONTHLY, start, datetime(2026, 4, 1, 9))
+    assert not RecurrenceService.is_occurrence(MONTHLY, start, datetime(2026, 4, 2, 9))
+
+
+@pytest.fixture
+def rent(client, auth_headers):
+    response = client.post('/tasks/', headers=auth_headers, json={
+        'title': 'rent', 'recurrence': MONTHLY.lower(), 'notify_at_date': '2100-01-01', 'notify_at_time': '09:00',
+    })
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_creating_a_recurring_task_caches_its_next_occurrence(rent):
+    assert rent['recurrence'] == MONTHLY
+    assert rent['next_occurrence'] == '2100-01-01T09:00:00'
+
+
+def test_completing_an_occurrence_advances_the_series(client, auth_headers, rent):
+    url = f"/tasks/{rent['id']}/occurrences/complete"
+    response = client.post(url, headers=auth_headers, json={'occurrence': '2100-01-01T09:00:00'})
+    assert response.status_code == 200
+    assert response.json()['next_occurrence'] == '2100-02-01T09:00:00'
+    # Completing it twice is a no-op
+    assert client.post(url, headers=auth_headers, json={'occurrence': '2100-01-01T09:00:00'}).status_code == 200
+
+    assert client.post(url, headers=auth_headers, json={'occurrence': '2100-01-02T09:00:00'}).status_code == 422
+
+    response = client.get('/tasks/occurrences', headers=auth_headers,
+                          params={'start': '2100-01-01T00:00:00', 'end': '2100-03-01T00:00:00'})
+    assert [(item['occurrence'], item['done']) for item in response.json()] == [
+        ('2100-01-01T09:00:00', True), ('2100-02-01T09:00:00', False),
+    ]
+
+
+def test_only_recurring_tasks_have_occurrences(client, auth_headers, make_task):
+    task = make_task('once')
+    response = client.post(f'/tasks/{task.id}/occurrences/complete', headers=auth_headers,
+                           json={'occurrence': '2100-01-01T09:00:00'})
+    assert response.status_code == 422
+
+
+def test_scheduler_reminds_and_advances_due_series(db, user, make_task, monkeypatch):
+    enqueued = []
+    monkeypatch.setattr(scheduler.q, 'enqueue', lambda *args: enqueued.append(args))
+    db.get(User, user.id).telegram_chat_id = '42'
+    task = make_task('water plants', recurrence='FREQ=DAILY', recurrence_start=datetime(2026, 1, 1, 9),
+                     next_occurrence=datetime(2026, 1, 1, 9))
+    db.add(TaskOccurrence(task_id=task.id, occurrence=datetime(2026, 1, 2, 9)))
+    db.commit()
+
+    scheduler.check_tasks()
+    db.expire_all()
+    assert [args[1] for args in enqueued] == ['42']
+    next_occurrence = db.get(Task, task.id).next_occurrence
+    assert next_occurrence > datetime.utcnow()
+    assert next_occurrence.time() == datetime(2026, 1, 1, 9).time()
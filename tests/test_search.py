@@ -0,0 +1,82 @@
+import pytest
+
+from app.models import Movie, Task, TaskArchive, TaskStatus
+from app.services.archive_service import ArchiveService
+from app.services.search_service import SQLiteFTSBackend, SearchService, search_terms
+
+
+def search(client, headers, q, path='/tasks/search', **params):
+    response = client.get(path, headers=headers, params=dict(params, q=q))
+    assert response.status_code == 200, response.text
+    return [item['title'] for item in response.json()]
+
+
+@pytest.mark.parametrize('query,terms', [
+    ('quarterly report', ['quarterly', 'report']),
+    ('"report" OR -draft*', ['report', 'OR', 'draft']),
+    ('  ', []),
+])
+def test_search_terms_drop_operators(query, terms):
+    assert search_terms(query) == terms
+
+
+def test_last_term_is_a_prefix():
+    assert SQLiteFTSBackend.match_expression(['quarterly', 'rep']) == '"quarterly" "rep"*'
+
+
+def test_title_matches_rank_above_details(client, auth_headers, make_task):
+    make_task('call the bank', details='about the report')
+    make_task('quarterly report')
+    make_task('unrelated')
+    assert search(client, auth_headers, 'repo') == ['quarterly report', 'call the bank']
+    assert search(client, auth_headers, 'report bank') == ['call the bank']
+    assert search(client, auth_headers, '"') == []
+
+
+def test_index_follows_updates_and_deletes(client, db, auth_headers, make_task):
+    task = make_task('draft report')
+    task.title = 'final summary'
+    db.commit()
+    assert search(client, auth_headers, 'draft') == []
+    assert search(client, auth_headers, 'summary') == ['final summary']
+
+    db.delete(task)
+    db.commit()
+    assert search(client, auth_headers, 'summary') == []
+
+
+def test_search_covers_archived_tasks(client, db, user, auth_headers, make_task):
+    make_task('report one')
+    make_task('report two', status=TaskStatus.DONE)
+    ArchiveService.archive_closed_tasks(db, older_than_days=0)
+    assert search(client, auth_headers, 'report') == ['report one', 'report two']
+    assert search(client, auth_headers, 'report', include_archived=False) == ['report one']
+    # The Telegram bot searches through the sync session
+    hits = SearchService.search(db, [Task, TaskArchive], user.id, 'report')
+    assert [(type(hit), hit.title) for hit in hits] == [(Task, 'report one'), (TaskArchive, 'report two')]
+
+
+def test_search_is_scoped_to_the_user(client, make_user, make_task):
+    _, bob = make_user('bob')
+    make_task('report')
+    assert search(client, bob, 'report') == []
+
+
+def test_movie_search(client, db, user, auth_headers):
+    db.add_all([
+        Movie(title='Heat', comment='best bank heist', user_id=user.id),
+        Movie(title='The Bank Job', user_id=user.id),
+    ])
+    db.commit()
+    assert search(client, auth_headers, 'bank', path='/movies/search') == ['The Bank Job', 'Heat']
+    assert search(client, auth_headers, 'heist', path='/movies/search', limit=1) == ['Heat']
+
+
+def test_hits_from_separate_indexes_are_interleaved_by_rank():
+    # Raw scores from different FTS tables are not comparable; only each table's order counts
+    hot = [('hot 1', 0.5), ('hot 2', 0.4), ('hot 3', 0.3)]
+    archived = [('archived 1', 9.0)]
+    merged = SearchService._merge([hot, archived], limit=3)
+    assert merged == ['hot 1', 'archived 1', 'hot 2']
+    assert SearchService._merge([[], archived], limit=10) == ['archived 1']
+    assert SearchService._merge([], limit=10) == []
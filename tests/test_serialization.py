@@ -0,0 +1,64 @@
+from datetime import datetime
+
+import pytest
+
+from app.models import Movie, TaskType, UserRole
+from app.schemas import MOVIE_LIST_ADAPTER, TASK_LIST_ADAPTER, MovieSchema, TaskSchema
+
+
+@pytest.fixture
+def validations(monkeypatch):
+    """Counts explicit per-row model_validate calls on the list schemas."""
+    calls = []
+    for schema in (TaskSchema, MovieSchema):
+        validate = schema.model_validate
+
+        def counting(obj, *args, _validate=validate, **kwargs):
+            calls.append(obj)
+            return _validate(obj, *args, **kwargs)
+        monkeypatch.setattr(schema, 'model_validate', counting)
+    return calls
+
+
+def test_task_list_is_validated_once(client, auth_headers, make_task, validations):
+    make_task('one', type=TaskType.CURRENT, deadline=datetime(2026, 3, 1, 9, 30))
+    make_task('two')
+    response = client.get('/tasks/', headers=auth_headers)
+    assert response.status_code == 200
+    assert validations == []
+
+    tasks = TASK_LIST_ADAPTER.validate_json(response.content)
+    assert [(task.title, task.type, task.deadline) for task in tasks] == [
+        ('one', TaskType.CURRENT, datetime(2026, 3, 1, 9, 30)), ('two', TaskType.INBOX, None),
+    ]
+    assert response.json()[0]['deadline'] == '2026-03-01T09:30:00'
+
+    # Single-task reads still build the schema explicitly
+    client.get(f'/tasks/{tasks[0].id}', headers=auth_headers)
+    assert len(validations) == 1
+
+
+def test_movie_list_is_validated_once(client, db, user, auth_headers, validations):
+    db.add(Movie(title='Alien', rating=9, user_id=user.id))
+    db.commit()
+    response = client.get('/movies/', headers=auth_headers)
+    assert validations == []
+    [movie] = MOVIE_LIST_ADAPTER.validate_json(response.content)
+    assert (movie.title, movie.rating, movie.user_id) == ('Alien', 9, user.id)
+
+
+def test_list_pages_render_from_the_adapters(flask_client, login, db, make_task):
+    user, _ = login('carol')
+    make_task('file taxes', user=user, type=TaskType.CURRENT)
+    db.add(Movie(title='Heat', user_id=user.id))
+    db.commit()
+
+    assert 'file taxes' in flask_client.get('/tasks').get_data(as_text=True)
+    assert 'Heat' in flask_client.get('/movies').get_data(as_text=True)
+
+
+def test_admin_users_page(flask_client, login, make_user):
+    make_user('bob')
+    login('root', role=UserRole.ADMIN)
+    body = flask_client.get('/admin/users').get_data(as_text=True)
+    assert 'bob' in body and 'root' in body
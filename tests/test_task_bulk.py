@@ -0,0 +1,67 @@
+from datetime import datetime
+
+from app.models import Task, TaskOccurrence, TaskStatus, TaskType
+
+
+def bulk(client, headers, **body):
+    return client.patch('/tasks/bulk', headers=headers, json=body)
+
+
+def test_bulk_update_changes_only_sent_fields(client, db, auth_headers, make_task):
+    first = make_task('one', type=TaskType.INBOX, deadline=datetime(2026, 3, 1))
+    second = make_task('two', type=TaskType.SOMEDAY)
+    response = bulk(client, auth_headers, ids=[first.id, second.id, first.id], changes={'type': 'CURRENT'})
+    assert response.status_code == 200
+    assert response.json() == {'results': {str(first.id): 'updated', str(second.id): 'updated'}}
+
+    db.expire_all()
+    assert [task.type for task in (first, second)] == [TaskType.CURRENT, TaskType.CURRENT]
+    assert first.deadline == datetime(2026, 3, 1)
+
+
+def test_bulk_archive_by_status(client, db, auth_headers, make_task):
+    task = make_task('one')
+    assert bulk(client, auth_headers, ids=[task.id], changes={'status': 'ARCHIVED'}).status_code == 200
+    db.expire_all()
+    assert task.status == TaskStatus.ARCHIVED
+
+
+def test_bulk_skips_other_users_tasks(client, db, make_user, make_task):
+    _, bob = make_user('bob')
+    task = make_task('alice task')
+    response = bulk(client, bob, ids=[task.id, task.id + 100], changes={'status': 'DONE'})
+    assert response.json() == {'results': {str(task.id): 'not_found', str(task.id + 100): 'not_found'}}
+    db.expire_all()
+    assert task.status == TaskStatus.OPEN
+
+    response = bulk(client, bob, ids=[task.id], action='delete')
+    assert response.json() == {'results': {str(task.id): 'not_found'}}
+
+
+def test_bulk_delete_removes_tasks_and_occurrences(client, db, auth_headers, make_task):
+    task = make_task('rent', recurrence='FREQ=MONTHLY', recurrence_start=datetime(2026, 1, 1))
+    keep = make_task('keep')
+    db.add(TaskOccurrence(task_id=task.id, occurrence=datetime(2026, 1, 1)))
+    db.commit()
+
+    response = bulk(client, auth_headers, ids=[task.id], action='delete')
+    assert response.json() == {'results': {str(task.id): 'deleted'}}
+    db.expire_all()
+    assert db.query(Task).all() == [keep]
+    assert db.query(TaskOccurrence).count() == 0
+
+
+def test_bulk_rescheduling_refreshes_next_occurrence(client, db, auth_headers):
+    created = client.post('/tasks/', headers=auth_headers, json={
+        'title': 'standup', 'recurrence': 'FREQ=DAILY', 'planned_start': '2026-03-01T09:00:00',
+    }).json()
+    response = bulk(client, auth_headers, ids=[created['id']], changes={'planned_start': '2100-01-01T10:00:00'})
+    assert response.status_code == 200
+    assert db.get(Task, created['id']).next_occurrence == datetime(2100, 1, 1, 10)
+
+
+def test_bulk_rejects_empty_or_null_changes(client, auth_headers, make_task):
+    task = make_task()
+    assert bulk(client, auth_headers, ids=[task.id]).status_code == 422
+    assert bulk(client, auth_headers, ids=[task.id], changes={'status': None}).status_code == 422
+    assert bulk(client, auth_headers, ids=[], changes={'status': 'DONE'}).status_code == 422
@@ -0,0 +1,90 @@
+import base64
+import json
+from datetime import datetime
+
+import pytest
+
+from app.models import TaskStatus, TaskType
+
+DAY_1, DAY_2 = datetime(2026, 3, 1, 9), datetime(2026, 3, 2, 9)
+
+
+def list_all(client, headers, limit=2, **params):
+    """Follows X-Next-Cursor through every page; returns the ids and the number of pages."""
+    ids, pages, cursor = [], 0, None
+    while True:
+        response = client.get('/tasks/', headers=headers, params=dict(params, limit=limit, **({'cursor': cursor} if cursor else {})))
+        assert response.status_code == 200, response.text
+        pages += 1
+        ids += [task['id'] for task in response.json()]
+        cursor = response.headers.get('X-Next-Cursor')
+        if not cursor:
+            return ids, pages
+
+
+@pytest.fixture
+def tasks(make_task):
+    # Duplicate deadlines and NULL deadlines, inserted out of deadline order
+    return [
+        make_task('a', deadline=DAY_2),
+        make_task('b'),
+        make_task('c', deadline=DAY_1),
+        make_task('d', deadline=DAY_2),
+        make_task('e'),
+        make_task('f', deadline=DAY_1),
+    ]
+
+
+@pytest.mark.parametrize('sort', ['id', 'deadline', 'planned_start'])
+def test_cursor_round_trip_visits_every_task_once(client, auth_headers, tasks, sort):
+    ids, pages = list_all(client, auth_headers, sort=sort)
+    key = {
+        'id': lambda task: task.id,
+        'deadline': lambda task: (task.deadline is None, task.deadline or DAY_1, task.id),
+        # No task is planned, so the id tie-breaker decides the whole order
+        'planned_start': lambda task: task.id,
+    }[sort]
+    assert ids == [task.id for task in sorted(tasks, key=key)]
+    assert pages == 3
+
+
+def test_last_page_has_no_next_cursor(client, auth_headers, tasks):
+    response = client.get('/tasks/', headers=auth_headers, params={'limit': len(tasks)})
+    assert len(response.json()) == len(tasks)
+    assert 'X-Next-Cursor' not in response.headers
+
+
+def encode(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+
+@pytest.mark.parametrize('sort,cursor', [
+    ('id', 'not a cursor'),
+    ('id', encode({'sort': 'id'})),
+    ('id', encode(['id', None, 'seven'])),
+    ('deadline', encode(['deadline', 'yesterday', 1])),
+    ('id', encode(['deadline', None, 1])),
+], ids=['garbage', 'not-a-list', 'bad-id', 'bad-value', 'other-sort'])
+def test_invalid_cursor_is_rejected(client, auth_headers, tasks, sort, cursor):
+    response = client.get('/tasks/', headers=auth_headers, params={'cursor': cursor, 'sort': sort})
+    assert response.status_code == 400
+
+
+def test_filters(client, auth_headers, make_task):
+    current = make_task('current', type=TaskType.CURRENT, deadline=DAY_1, notify_at=DAY_1)
+    make_task('done', type=TaskType.CURRENT, status=TaskStatus.DONE, deadline=DAY_2)
+    make_task('inbox', type=TaskType.INBOX)
+
+    def ids(**params):
+        return list_all(client, auth_headers, **params)[0]
+
+    assert ids(type='CURRENT', status='OPEN') == [current.id]
+    assert ids(deadline_from=DAY_1.isoformat(), deadline_to=DAY_1.isoformat()) == [current.id]
+    assert ids(has_notification=True) == [current.id]
+    assert client.get('/tasks/', headers=auth_headers, params={'type': 'NOPE'}).status_code == 422
+
+
+def test_pages_are_scoped_to_the_user(client, make_user, make_task):
+    bob, bob_headers = make_user('bob')
+    make_task('alice task')
+    assert list_all(client, bob_headers) == ([], 1)
@@ -5,6 +5,7 @@ import logging
 import traceback
 from app.telegram_utils import send_telegram_message, run_async_in_new_loop
 from app.queue import q
+from app.database import report_database_profile
 
 # Setup logging
 logging.basicConfig(
@@ -48,6 +49,7 @@ def run_worker():
     worker = Worker([q], connection=redis_connection, exception_handlers=[rq_exception_handler])
     
     logger.info("Starting RQ worker...")
+    report_database_profile()
     worker.work(with_scheduler=True)
 
 if __name__ == '__main__':